@@ -0,0 +1,171 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from data_model import Flight, Conflict
+from trajectory import CompiledFlight, compile_flight
+from broad_phase import SegmentGrid
+from collision_check import pack_segments, closest_approach_batch
+
+class Airspace:
+    """
+    Persistent set of approved flights kept in compiled, indexed form.
+
+    Flights are added and removed incrementally; checking a candidate only
+    touches its own segments and the indexed segments near them in space-time.
+    All times are measured in wall-clock seconds, so flights with different
+    mission start times are compared correctly.
+    """
+
+    def __init__(self,
+                 cell_size: float = 100.0,
+                 time_slice: float = 60.0):
+        """
+        :param cell_size: edge length of the spatial grid cells in meters
+        :param time_slice: length of the grid time buckets in seconds
+        """
+        self._grid = SegmentGrid(cell_size, time_slice)
+        self._flights: Dict[str, Tuple[CompiledFlight, np.ndarray]] = {}
+        self._origin: Optional[float] = None
+        self._added = 0
+
+        # Segment geometry by grid slot
+        self._owner = np.empty(0, dtype=object)
+        self._rank = np.empty(0, dtype=np.int64)
+        self._index = np.empty(0, dtype=np.int64)
+        self._t0 = np.empty(0)
+        self._t1 = np.empty(0)
+        self._p0 = np.empty((0, 3))
+        self._v = np.empty((0, 3))
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, flight_id: str) -> bool:
+        return flight_id in self._flights
+
+    def flights(self) -> List[CompiledFlight]:
+        """Returns the approved flights in the order they were added."""
+        return [compiled for compiled, _ in self._flights.values()]
+
+    # Function to pack segments on the airspace's time axis
+    def _segments(self, flight: Flight) -> Tuple[np.ndarray, ...]:
+        compiled = compile_flight(flight)
+        if self._origin is None:
+            self._origin = compiled.start_epoch
+        return pack_segments([compiled], self._origin, boxes=True)
+
+    def add(self, flight: Flight):
+        """
+        Add an approved flight to the airspace.
+
+        :param flight: Flight object (or compiled flight)
+        """
+        if flight.flight_id in self._flights:
+            raise ValueError(f"Flight {flight.flight_id} is already in the airspace")
+
+        _, index, t0, t1, p0, v, lo, hi = self._segments(flight)
+        slots = self._grid.insert(t0, t1, lo, hi)
+
+        # Grow the per-slot geometry arrays to cover the new slots
+        needed = int(slots.max()) + 1 if len(slots) else 0
+        if needed > len(self._t0):
+            grow = max(needed, 2 * len(self._t0)) - len(self._t0)
+            self._owner = np.concatenate((self._owner, np.empty(grow, dtype=object)))
+            self._rank = np.concatenate((self._rank, np.zeros(grow, dtype=np.int64)))
+            self._index = np.concatenate((self._index, np.zeros(grow, dtype=np.int64)))
+            self._t0 = np.concatenate((self._t0, np.zeros(grow)))
+            self._t1 = np.concatenate((self._t1, np.zeros(grow)))
+            self._p0 = np.concatenate((self._p0, np.zeros((grow, 3))))
+            self._v = np.concatenate((self._v, np.zeros((grow, 3))))
+        self._owner[slots] = flight.flight_id
+        self._rank[slots] = self._added
+        self._index[slots] = index
+        self._t0[slots] = t0
+        self._t1[slots] = t1
+        self._p0[slots] = p0
+        self._v[slots] = v
+
+        self._flights[flight.flight_id] = (compile_flight(flight), slots)
+        self._added += 1
+
+    def remove(self, flight_id: str):
+        """
+        Remove a flight from the airspace.
+
+        :param flight_id: ID of a previously added flight
+        """
+        _, slots = self._flights.pop(flight_id)
+        self._grid.remove(slots)
+
+    def check(self,
+              candidate: Flight,
+              buffer: float,
+              stats: Optional[Dict[str, int]] = None) -> Tuple[str, List[Conflict]]:
+        """
+        Check a submitted flight against all approved flights.
+        The candidate is not added to the airspace.
+
+        :param candidate: flight to be checked
+        :param buffer: minimum separation distance in meters
+        :param stats: optional dict updated with broad-phase pair counts
+        :return: tuple (status, list of conflicts), as returned by check_mission
+        """
+        return self.check_batch([candidate], buffer, stats)[0]
+
+    def check_batch(self,
+                    candidates: List[Flight],
+                    buffer: Union[float, Sequence[float]],
+                    stats: Optional[Dict[str, int]] = None) -> List[Tuple[str, List[Conflict]]]:
+        """
+        Check several submitted flights against all approved flights in one
+        index query and one batched closest-approach pass. Candidates are not
+        checked against each other and none is added to the airspace.
+
+        :param candidates: flights to be checked
+        :param buffer: minimum separation distance in meters, or one per candidate
+        :param stats: optional dict updated with broad-phase pair counts
+        :return: one (status, list of conflicts) tuple per candidate, as check returns
+        """
+
+        if not candidates:
+            return []
+        buffers = np.broadcast_to(np.asarray(buffer, dtype=float), (len(candidates),))
+        compiled = [compile_flight(c) for c in candidates]
+        if self._origin is None:
+            self._origin = compiled[0].start_epoch
+
+        i_own, i_idx, i_t0, i_t1, i_p0, i_v, i_lo, i_hi = pack_segments(compiled, self._origin, boxes=True)
+        pi, pj = self._grid.query(i_t0, i_t1, i_lo, i_hi, margin=float(buffers.max()))
+        if stats is not None:
+            stats.update(self._grid.stats)
+
+        # Exact closest approach on the candidate pairs that overlap in time
+        dt_start = np.maximum(i_t0[pi], self._t0[pj])
+        dt_end = np.minimum(i_t1[pi], self._t1[pj])
+        overlap = dt_start < dt_end
+        pi, pj, dt_start, dt_end = pi[overlap], pj[overlap], dt_start[overlap], dt_end[overlap]
+        dist, t_closest = closest_approach_batch(
+            i_p0[pi], i_v[pi], i_t0[pi],
+            self._p0[pj], self._v[pj], self._t0[pj],
+            dt_start, dt_end
+        )
+        hit = dist < buffers[i_own[pi]]
+        pi, pj, dist, t_closest = pi[hit], pj[hit], dist[hit], t_closest[hit]
+
+        # Per candidate, order by approved flight, candidate segment, then approved segment
+        order = np.lexsort((self._index[pj], i_idx[pi], self._rank[pj], i_own[pi]))
+
+        # Conflict times are reported in seconds since each candidate's start
+        locations = i_p0[pi] + i_v[pi] * (t_closest - i_t0[pi])[:, None]
+        shifts = [self._origin - c.start_epoch for c in compiled]
+        results: List[List[Conflict]] = [[] for _ in candidates]
+        for k in order:
+            owner = i_own[pi[k]]
+            results[owner].append(Conflict(
+                flight1_id=candidates[owner].flight_id,
+                flight2_id=self._owner[pj[k]],
+                conflict_time=float(t_closest[k] + shifts[owner]),
+                location=tuple(float(c) for c in locations[k]),
+                distance=float(dist[k])
+            ))
+
+        return [("SAFE" if len(conflicts) == 0 else "CONFLICT", conflicts) for conflicts in results]
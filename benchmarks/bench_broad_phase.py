@@ -0,0 +1,53 @@
+"""
+Broad-phase benchmark: check_mission with and without broad-phase pruning,
+from a dense scenario (every flight in one square kilometer at the same time)
+to sparse ones spread over a wider area and a longer period.
+
+    python benchmarks/bench_broad_phase.py --flights 5000 --waypoints 20
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from simulator import generate_fleet
+from cli_api import check_mission
+
+# (label, side of the square area in meters, spread of start times in seconds)
+SCENARIOS = [("dense", 1000, 0), ("city", 10000, 1800), ("region", 50000, 3600)]
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flights", type=int, default=5000)
+    parser.add_argument("--waypoints", type=int, default=20)
+    parser.add_argument("--buffer", type=float, default=10.0)
+    parser.add_argument("--modes", nargs="+", default=["vectorized", "sampled"])
+    args = parser.parse_args()
+
+    print(f"{'scenario':>8} {'mode':>11} {'broad phase (s)':>16} {'brute force (s)':>16} {'pruned':>8}")
+    for label, side, spread in SCENARIOS:
+        fleet = list(generate_fleet(args.flights, num_waypoints=args.waypoints, seed=0, x_range=(0, side),
+                                    y_range=(0, side), start_time=datetime(2025, 1, 1), start_spread=spread,
+                                    duration=300))
+        primary, others = fleet[0], fleet[1:]
+        for mode in args.modes:
+            stats = {}
+            check_mission(primary, others, args.buffer, mode=mode, stats=stats)
+            pruned = stats["pairs_pruned"] / max(stats["pairs_total"], 1)
+            with_index = best_of(lambda: check_mission(primary, others, args.buffer, mode=mode))
+            without = best_of(lambda: check_mission(primary, others, args.buffer, mode=mode, broad_phase=False))
+            print(f"{label:>8} {mode:>11} {with_index:>16.4f} {without:>16.4f} {pruned:>8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark suite for the deconfliction engines.
+
+Sweeps fleet size, waypoints per flight, mission duration and time step one
+factor at a time around a base scenario, for every check_mission mode, and
+reports throughput, latency percentiles and peak memory.
+
+    python benchmarks/bench_deconfliction.py                      # quick sweep
+    python benchmarks/bench_deconfliction.py --full --output results.json
+    python benchmarks/bench_deconfliction.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_deconfliction.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from simulator import generate_random_flight
+from cli_api import check_mission
+
+MODES = ["sampled", "analytic", "vectorized", "adaptive"]
+
+# Base scenario and the values each factor is swept over
+BASE = {"flights": 100, "waypoints": 10, "duration": 300.0, "time_step": 1.0}
+QUICK = {"flights": [10, 100, 500], "waypoints": [5, 20], "duration": [300.0, 1200.0], "time_step": [1.0, 0.25]}
+FULL = {"flights": [10, 100, 1000, 5000], "waypoints": [5, 20, 50], "duration": [300.0, 1800.0, 3600.0],
+        "time_step": [2.0, 1.0, 0.25]}
+
+# Modes that get too slow past these fleet sizes are skipped
+MODE_LIMITS = {"analytic": 500}
+
+def build_scenario(flights: int, waypoints: int, duration: float, seed: int = 0):
+    """Seeded fleet of random flights sharing one start time over a 1 km square."""
+    random.seed(seed)
+    start = datetime(2025, 1, 1, 12)
+    return [generate_random_flight(f"F{i}", num_waypoints=waypoints, x_range=(0, 1000), y_range=(0, 1000),
+                                   start_time=start, duration=duration)
+            for i in range(flights)]
+
+def scenarios(grid: Dict[str, list]) -> List[Dict[str, float]]:
+    """Base scenario plus one-factor-at-a-time variations of it."""
+    configs = [dict(BASE)]
+    for factor, values in grid.items():
+        for value in values:
+            config = dict(BASE, **{factor: value})
+            if config not in configs:
+                configs.append(config)
+    return configs
+
+def run_case(config: Dict[str, float], mode: str, repeats: int, buffer: float) -> Dict[str, float]:
+    flights = build_scenario(int(config["flights"]), int(config["waypoints"]), config["duration"])
+    primary, others = flights[0], flights[1:]
+    pair_checks = (len(primary.waypoints) - 1) * sum(len(f.waypoints) - 1 for f in others)
+
+    # Warm up caches (compiled flights) so runs measure the check itself
+    check_mission(primary, others, buffer, mode=mode, time_step=config["time_step"])
+    latencies = []
+    # Collector pauses land on random runs, so they are kept out of the timings as timeit does
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            t = time.perf_counter()
+            _, conflicts = check_mission(primary, others, buffer, mode=mode, time_step=config["time_step"])
+            latencies.append(time.perf_counter() - t)
+    finally:
+        gc.enable()
+
+    # Peak memory is measured in a separate run since tracing slows things down
+    tracemalloc.start()
+    check_mission(primary, others, buffer, mode=mode, time_step=config["time_step"])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return dict(config, mode=mode, conflicts=len(conflicts), pair_checks=pair_checks,
+                pair_checks_per_s=pair_checks / p50 if p50 > 0 else float("inf"),
+                min_s=min(latencies), p50_s=p50, p90_s=p90, p99_s=p99, peak_mb=peak / 2 ** 20)
+
+def case_key(result: Dict[str, float]) -> str:
+    return "{mode}/f{flights}/w{waypoints}/d{duration:g}/dt{time_step:g}".format(**result)
+
+def compare(results: List[dict],
+            baseline: List[dict],
+            threshold: float,
+            floor: float = 5e-3) -> List[Tuple[dict, float]]:
+    """
+    Cases whose fastest run grew by more than threshold relative to the
+    baseline. Slowdowns under floor seconds are ignored since millisecond
+    timings are mostly noise.
+
+    :return: list of (result, baseline seconds)
+    """
+    previous = {case_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if not old:
+            continue
+        expected = old.get("min_s", old["p50_s"])
+        if result["min_s"] > expected * threshold and result["min_s"] - expected > floor:
+            regressions.append((result, expected))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for the deconfliction engines.")
+    parser.add_argument("--full", action="store_true", help="sweep production-scale sizes")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--buffer", type=float, default=10.0)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--save-baseline", default=None, help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.5, help="slowdown of the fastest run flagged as a regression")
+    parser.add_argument("--floor", type=float, default=5e-3, help="slowdowns under this many seconds are ignored")
+    parser.add_argument("--confirm", type=int, default=3, help="reruns of a flagged case before it counts")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'case':<40} {'min ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'pairs/s':>11} {'peak MB':>8} {'conflicts':>9}")
+    for config in scenarios(FULL if args.full else QUICK):
+        for mode in args.modes:
+            if config["flights"] > MODE_LIMITS.get(mode, float("inf")):
+                continue
+            result = run_case(config, mode, args.repeats, args.buffer)
+            results.append(result)
+            print(f"{case_key(result):<40} {result['min_s'] * 1e3:>9.2f} {result['p50_s'] * 1e3:>9.2f} "
+                  f"{result['p99_s'] * 1e3:>9.2f} {result['pair_checks_per_s']:>11.3g} {result['peak_mb']:>8.1f} {result['conflicts']:>9}")
+
+    report = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+              "cpus": os.cpu_count(), "results": results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        # A flagged case is rerun and keeps its fastest time, so one slow
+        # stretch on a busy machine does not fail the gate
+        regressions = compare(results, baseline, args.threshold, args.floor)
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            for result, _ in regressions:
+                rerun = run_case(result, result["mode"], args.repeats, args.buffer)
+                result["min_s"] = min(result["min_s"], rerun["min_s"])
+            regressions = compare(results, baseline, args.threshold, args.floor)
+        regressions = [f"{case_key(r)}: {expected:.4f}s -> {r['min_s']:.4f}s" for r, expected in regressions]
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Kernel backend benchmark: NumPy against Numba for the inner conflict kernels.
+
+    python benchmarks/bench_kernels.py --pairs 1000000 --flights 2000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import kernels
+from collision_check import closest_approach_batch
+from simulator import generate_fleet
+from cli_api import check_mission
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=1_000_000, help="segment pairs for the kernel timing")
+    parser.add_argument("--flights", type=int, default=2000, help="fleet size for the check_mission timing")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    k = args.pairs
+    p1, p2 = rng.uniform(0, 1000, (k, 3)), rng.uniform(0, 1000, (k, 3))
+    v1, v2 = rng.normal(0, 10, (k, 3)), rng.normal(0, 10, (k, 3))
+    t1, t2 = rng.uniform(0, 100, k), rng.uniform(0, 100, k)
+    start = np.maximum(t1, t2)
+    end = start + rng.uniform(0, 60, k)
+    others, primary = rng.uniform(0, 1000, (args.flights, 600, 3)), rng.uniform(0, 1000, (600, 3))
+
+    fleet = list(generate_fleet(args.flights, num_waypoints=20, seed=1, x_range=(0, 5000), y_range=(0, 5000),
+                                start_time=datetime(2025, 1, 1), start_spread=3600, duration=1800))
+
+    print(f"{'backend':>8} {'closest approach (Mpairs/s)':>28} {'sample distance (Msamples/s)':>29} "
+          f"{'vectorized (s)':>15} {'sampled (s)':>12}")
+    for backend in kernels.BACKENDS:
+        with kernels.use(backend):
+            if kernels.active_backend() != backend:
+                print(f"{backend:>8} not installed")
+                continue
+            sample_distance = kernels.kernel("sample_distance") or (
+                lambda o, p: np.linalg.norm(o - p[None, :, :], axis=2))
+            # Warm up so Numba compilation is not timed
+            closest_approach_batch(p1[:10], v1[:10], t1[:10], p2[:10], v2[:10], t2[:10], start[:10], end[:10])
+            sample_distance(others[:2], primary)
+
+            ca = best_of(lambda: closest_approach_batch(p1, v1, t1, p2, v2, t2, start, end))
+            sd = best_of(lambda: sample_distance(others, primary))
+            vec = best_of(lambda: check_mission(fleet[0], fleet[1:], 20.0, mode="vectorized", broad_phase=False), 3)
+            smp = best_of(lambda: check_mission(fleet[0], fleet[1:], 20.0, mode="sampled", broad_phase=False), 3)
+        print(f"{backend:>8} {k / ca / 1e6:>28.1f} {others.shape[0] * others.shape[1] / sd / 1e6:>29.1f} "
+              f"{vec:>15.3f} {smp:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Memory per waypoint of the flight storage options.
+
+Builds the same random fleet as plain dataclass Waypoints (the data model
+before slots), slotted Waypoints and Fleet columns in float64 and float32, and
+reports the traced bytes per waypoint of each.
+
+    python benchmarks/bench_memory.py --flights 2000 --waypoints 100
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from data_model import Waypoint
+from fleet import Fleet
+from trajectory import PackedFlights
+
+@dataclass
+class PlainWaypoint:
+    """Waypoint as it was before the data model was slotted."""
+    x: float
+    y: float
+    z: Optional[float] = 0.0
+    time_offset: Optional[float] = None
+
+def traced(build):
+    """Bytes still allocated after build() returns, with the result kept alive."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per waypoint of the flight storage options.")
+    parser.add_argument("--flights", type=int, default=2000)
+    parser.add_argument("--waypoints", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    count = args.flights * args.waypoints
+    packed = PackedFlights(flight_ids=[f"F{k}" for k in range(args.flights)],
+                           start_epochs=np.full(args.flights, 1.7e9),
+                           offsets=np.arange(0, count + 1, args.waypoints),
+                           times=np.tile(np.arange(args.waypoints, dtype=float) * 10, args.flights),
+                           positions=rng.uniform(0, 1000, size=(count, 3)))
+
+    # Every case builds its own values so nothing is shared with the source arrays
+    def waypoints(cls):
+        return [cls(x, y, z, t) for (x, y, z), t in zip(packed.positions.tolist(), packed.times.tolist())]
+
+    def fleet(dtype):
+        return Fleet(packed.flight_ids, packed.start_epochs, packed.offsets,
+                     packed.times.astype(dtype), packed.positions.astype(dtype))
+
+    cases = {
+        "dataclass Waypoint": lambda: waypoints(PlainWaypoint),
+        "slotted Waypoint": lambda: waypoints(Waypoint),
+        "Fleet float64": lambda: fleet(np.float64),
+        "Fleet float32": lambda: fleet(np.float32),
+    }
+    print(f"{count} waypoints in {args.flights} flights")
+    for name, build in cases.items():
+        size, _ = traced(build)
+        print(f"{name:<20} {size / count:>8.1f} bytes/waypoint")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Scaling benchmark for the multiprocess conflict checks.
+
+    python benchmarks/bench_parallel.py --flights 20000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from simulator import generate_random_flight
+from cli_api import check_mission, check_all_pairs
+
+def build_fleet(num_flights: int, seed: int = 0):
+    """Daily schedule of local missions spread over a 50 km square."""
+    random.seed(seed)
+    start = datetime(2025, 1, 1)
+    flights = []
+    for i in range(num_flights):
+        cx, cy = random.uniform(0, 50000), random.uniform(0, 50000)
+        flights.append(generate_random_flight(
+            f"F{i}", num_waypoints=20, x_range=(cx, cx + 3000), y_range=(cy, cy + 3000),
+            start_time=start + timedelta(seconds=random.uniform(0, 86400)), duration=1800))
+    return flights
+
+def timed(fn, *args, **kwargs) -> float:
+    t = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - t
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flights", type=int, default=10000)
+    parser.add_argument("--buffer", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    flights = build_fleet(args.flights)
+    print(f"{args.flights} flights, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'mission (s)':>12} {'speedup':>8} {'all-pairs (s)':>14} {'speedup':>8}")
+    base = None
+    for workers in args.workers:
+        mission = timed(check_mission, flights[0], flights[1:], args.buffer, mode="vectorized",
+                        broad_phase=False, workers=workers)
+        fleet = timed(check_all_pairs, flights, args.buffer, workers=workers)
+        base = base or (mission, fleet)
+        print(f"{workers:>8} {mission:>12.3f} {base[0] / mission:>8.2f} {fleet:>14.3f} {base[1] / fleet:>8.2f}")
+
+if __name__ == "__main__":
+    main()
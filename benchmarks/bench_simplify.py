@@ -0,0 +1,64 @@
+"""
+Simplification benchmark: segment counts and check times for dense tracks.
+
+    python benchmarks/bench_simplify.py --flights 50 --points 3600 --tolerance 0.5 2 5
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from data_model import Flight, Waypoint, MissionWindow
+from simplification import simplify_flights
+from cli_api import check_mission
+
+def dense_track(flight_id: str, rng: np.random.Generator, points: int) -> Flight:
+    # GPS-like log: a smooth random curve sampled every second with 0.1 m of noise
+    t = np.arange(points, dtype=float)
+    phase, center = rng.uniform(0, 2 * np.pi, 3), rng.uniform(0, 2000, 2)
+    x = center[0] + 400 * np.sin(t / 500 + phase[0]) + rng.normal(0, 0.1, points)
+    y = center[1] + 400 * np.cos(t / 350 + phase[1]) + rng.normal(0, 0.1, points)
+    z = 60 + 20 * np.sin(t / 250 + phase[2]) + rng.normal(0, 0.1, points)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return Flight(flight_id=flight_id,
+                  waypoints=[Waypoint(x=a, y=b, z=c, time_offset=s) for a, b, c, s in zip(x, y, z, t)],
+                  mission_window=MissionWindow(start=start, end=start + timedelta(seconds=points - 1)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flights", type=int, default=50)
+    parser.add_argument("--points", type=int, default=3600, help="waypoints per flight")
+    parser.add_argument("--tolerance", type=float, nargs="+", default=[0.5, 2.0, 5.0])
+    parser.add_argument("--buffer", type=float, default=20.0)
+    parser.add_argument("--mode", default="vectorized", choices=["analytic", "vectorized"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    flights = [dense_track(f"F{i}", rng, args.points) for i in range(args.flights)]
+    primary, others = flights[0], flights[1:]
+
+    t = time.perf_counter()
+    status, conflicts = check_mission(primary, others, args.buffer, mode=args.mode)
+    exact = time.perf_counter() - t
+    # check (s) includes simplifying every flight
+    print(f"{'tolerance':>9} {'segments':>9} {'simplify (s)':>13} {'check (s)':>10} {'status':>9} {'flights':>8}")
+    print(f"{0.0:>9.1f} {args.flights * (args.points - 1):>9} {0.0:>13.3f} {exact:>10.3f} {status:>9} "
+          f"{len({c.flight2_id for c in conflicts}):>8}")
+
+    for tolerance in args.tolerance:
+        t = time.perf_counter()
+        simplified, _ = simplify_flights(flights, tolerance)
+        simplify = time.perf_counter() - t
+        t = time.perf_counter()
+        status, conflicts = check_mission(primary, others, args.buffer, mode=args.mode, tolerance=tolerance)
+        check = time.perf_counter() - t
+        segments = sum(len(f.times) - 1 for f in simplified)
+        print(f"{tolerance:>9.1f} {segments:>9} {simplify:>13.3f} {check:>10.3f} {status:>9} "
+              f"{len({c.flight2_id for c in conflicts}):>8}")
+
+if __name__ == "__main__":
+    main()
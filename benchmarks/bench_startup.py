@@ -0,0 +1,42 @@
+"""
+Cold-start benchmark: wall time of fresh interpreters importing each entry point.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CASES = {
+    "python": "pass",
+    "numpy": "import numpy",
+    "cli_api": "import cli_api",
+    "deconflict": "import deconflict",
+    "main": "import main",
+    "visualize": "import visualize",
+}
+
+def cold_start(statement: str, runs: int) -> float:
+    """Best wall time over several fresh interpreters, in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entry point':>12} {'cold start (ms)':>16}")
+    for name, statement in CASES.items():
+        print(f"{name:>12} {cold_start(statement, args.runs) * 1e3:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Frame rendering benchmark for the headless animation path.
+
+    python benchmarks/bench_visualize.py --flights 10 50 200 --duration 3600
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from simulator import generate_random_flight
+from visualize import _animation_axes, _frame_updater, _sample_fleet
+
+def frames_per_second(flights, frames: int, max_points: int) -> float:
+    """Render frames spread over the mission to an off-screen canvas."""
+    positions = _sample_fleet(flights)
+    fig = Figure(figsize=(8, 6), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    update = _frame_updater(_animation_axes(fig, flights, "2d"), positions, max_points)
+    steps = range(0, positions.shape[1], max(1, positions.shape[1] // frames))
+    t = time.perf_counter()
+    for frame in steps:
+        update(frame)
+        canvas.draw()
+    return len(steps) / (time.perf_counter() - t)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flights", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--duration", type=float, default=3600.0, help="mission length in seconds (1 s frames)")
+    parser.add_argument("--frames", type=int, default=20, help="frames rendered per measurement")
+    args = parser.parse_args()
+
+    random.seed(0)
+    start = datetime(2025, 1, 1)
+    print(f"{'flights':>8} {'decimated fps':>14} {'full trail fps':>15}")
+    for n in args.flights:
+        flights = [generate_random_flight(f"F{i}", num_waypoints=20, start_time=start, duration=args.duration)
+                   for i in range(n)]
+        decimated = frames_per_second(flights, args.frames, max_points=800)
+        full = frames_per_second(flights, args.frames, max_points=int(args.duration) + 1)
+        print(f"{n:>8} {decimated:>14.1f} {full:>15.1f}")
+
+if __name__ == "__main__":
+    main()
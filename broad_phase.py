@@ -0,0 +1,250 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+# Boxes covering more grid cells than this are kept in a separate list and
+# treated as candidates for every query instead of being hashed
+MAX_CELLS_PER_BOX = 512
+
+# Large odd constants used to hash (x, y, z, t) cell coordinates into one key
+_HASH_PRIMES = np.array([73856093, 19349663, 83492791, 2654435761], dtype=np.int64)
+
+# Function to compute space-time bounding boxes of linear segments
+def segment_boxes(p_start: np.ndarray,
+                  velocity: np.ndarray,
+                  t_start: np.ndarray,
+                  t_end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Axis-aligned bounding boxes of segments moving at constant velocity.
+
+    :param p_start: (M, 3) start positions
+    :param velocity: (M, 3) velocities
+    :param t_start: (M,) start times
+    :param t_end: (M,) end times
+    :return: (lo, hi) corners, both (M, 3)
+    """
+    p_end = p_start + velocity * (t_end - t_start)[:, None]
+    return np.minimum(p_start, p_end), np.maximum(p_start, p_end)
+
+class SegmentGrid:
+    """
+    Broad-phase index over segment space-time bounding boxes.
+
+    Boxes are hashed into a uniform spatial grid bucketed by time slice. The
+    cell contents are kept as a few sorted (key, slot) runs so inserts and
+    queries are vectorized. Removals are lazy: entries of removed boxes stay
+    in the runs, are filtered out by queries, and are compacted away once
+    they outnumber the live boxes. Removed slots are only reused after that.
+    Queries inflate their boxes by a margin (the separation buffer), so the
+    same index serves any buffer.
+    """
+
+    def __init__(self, cell_size: float, time_slice: float):
+        if cell_size <= 0 or time_slice <= 0:
+            raise ValueError("cell_size and time_slice must be positive")
+        self.cell_size = float(cell_size)
+        self.time_slice = float(time_slice)
+
+        # Box storage indexed by slot
+        self._t0 = np.empty(0)
+        self._t1 = np.empty(0)
+        self._lo = np.empty((0, 3))
+        self._hi = np.empty((0, 3))
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._free: List[int] = []
+        self._removed: List[int] = []
+
+        # Sorted runs of (cell key, slot) and slots too large to hash
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._oversize = np.empty(0, dtype=np.int64)
+
+        # Pair counts of the last query
+        self.stats: Dict[str, int] = {"pairs_total": 0, "pairs_candidate": 0, "pairs_pruned": 0}
+
+    @classmethod
+    def for_boxes(cls,
+                  t0: np.ndarray,
+                  t1: np.ndarray,
+                  lo: np.ndarray,
+                  hi: np.ndarray,
+                  margin: float = 0.0) -> "SegmentGrid":
+        """
+        Create an empty grid with cell sizes suited to the given boxes.
+
+        :param t0: (M,) box start times
+        :param t1: (M,) box end times
+        :param lo: (M, 3) lower box corners
+        :param hi: (M, 3) upper box corners
+        :param margin: query margin the grid will mostly be used with
+        :return: SegmentGrid
+        """
+        extent = np.max(hi - lo, axis=1) if len(t0) else np.zeros(1)
+        duration = (t1 - t0) if len(t0) else np.zeros(1)
+        cell_size = max(float(np.median(extent)), float(margin), 1e-6)
+        time_slice = max(float(np.median(duration)), 1e-6)
+        return cls(cell_size, time_slice)
+
+    def __len__(self) -> int:
+        return int(self._alive[:self._size].sum())
+
+    # Function to list the grid cells covered by boxes
+    def _cells(self,
+               t0: np.ndarray,
+               t1: np.ndarray,
+               lo: np.ndarray,
+               hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :return: (box, key, oversize) where each (box[k], key[k]) is a covered
+                 cell and oversize lists boxes covering too many cells
+        """
+        first = np.column_stack((np.floor(lo / self.cell_size), np.floor(t0 / self.time_slice)))
+        last = np.column_stack((np.floor(hi / self.cell_size), np.floor(t1 / self.time_slice)))
+
+        # Count cells in floating point, so huge boxes cannot overflow int64 before they are set aside
+        oversize = np.nonzero(~(np.prod(last - first + 1, axis=1) <= MAX_CELLS_PER_BOX))[0]
+        first[oversize] = last[oversize] = 0
+        first, last = first.astype(np.int64), last.astype(np.int64)
+        span = last - first + 1
+        count = np.prod(span, axis=1)
+        count[oversize] = 0
+
+        # Enumerate cells of each box by decomposing a running index into 4 digits
+        box = np.repeat(np.arange(len(count)), count)
+        local = np.arange(len(box)) - np.repeat(np.cumsum(count) - count, count)
+        cell = np.empty((len(box), 4), dtype=np.int64)
+        for axis in range(4):
+            n = span[box, axis]
+            cell[:, axis] = first[box, axis] + local % n
+            local = local // n
+
+        key = np.bitwise_xor.reduce(cell * _HASH_PRIMES, axis=1)
+        return box, key, oversize
+
+    # Function to make room for more boxes
+    def _allocate(self, count: int) -> np.ndarray:
+        reused = [self._free.pop() for _ in range(min(count, len(self._free)))]
+        fresh = count - len(reused)
+        if self._size + fresh > len(self._t0):
+            capacity = max(2 * len(self._t0), self._size + fresh, 64)
+            grow = capacity - len(self._t0)
+            self._t0 = np.concatenate((self._t0, np.empty(grow)))
+            self._t1 = np.concatenate((self._t1, np.empty(grow)))
+            self._lo = np.concatenate((self._lo, np.empty((grow, 3))))
+            self._hi = np.concatenate((self._hi, np.empty((grow, 3))))
+            self._alive = np.concatenate((self._alive, np.zeros(grow, dtype=bool)))
+        slots = np.concatenate((np.array(reused, dtype=np.int64),
+                                np.arange(self._size, self._size + fresh, dtype=np.int64)))
+        self._size += fresh
+        return slots
+
+    def insert(self,
+               t0: np.ndarray,
+               t1: np.ndarray,
+               lo: np.ndarray,
+               hi: np.ndarray) -> np.ndarray:
+        """
+        Add boxes to the index.
+
+        :param t0: (M,) box start times
+        :param t1: (M,) box end times
+        :param lo: (M, 3) lower box corners
+        :param hi: (M, 3) upper box corners
+        :return: (M,) slot ids used to remove the boxes later
+        """
+        slots = self._allocate(len(t0))
+        self._t0[slots] = t0
+        self._t1[slots] = t1
+        self._lo[slots] = lo
+        self._hi[slots] = hi
+        self._alive[slots] = True
+
+        box, key, oversize = self._cells(np.asarray(t0), np.asarray(t1), np.asarray(lo), np.asarray(hi))
+        self._oversize = np.concatenate((self._oversize, slots[oversize]))
+        order = np.argsort(key, kind='stable')
+        self._runs.append((key[order], slots[box[order]]))
+
+        # Merge runs of similar size so only O(log n) runs are searched per query
+        while len(self._runs) > 1 and 2 * len(self._runs[-1][0]) >= len(self._runs[-2][0]):
+            self._merge_last_runs()
+        return slots
+
+    def _merge_last_runs(self):
+        (k1, s1), (k2, s2) = self._runs.pop(), self._runs.pop()
+        keys, slots = np.concatenate((k2, k1)), np.concatenate((s2, s1))
+        # Drop entries of removed boxes while merging
+        keep = self._alive[slots]
+        keys, slots = keys[keep], slots[keep]
+        order = np.argsort(keys, kind='stable')
+        self._runs.append((keys[order], slots[order]))
+
+    def remove(self, slots: np.ndarray):
+        """
+        Remove boxes from the index.
+
+        :param slots: slot ids returned by insert
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        self._alive[slots] = False
+        self._removed.extend(int(s) for s in slots)
+        self._oversize = self._oversize[self._alive[self._oversize]]
+        if len(self._removed) > len(self):
+            self._compact()
+
+    # Function to drop the run entries of removed boxes and free their slots
+    def _compact(self):
+        self._runs = [(keys[self._alive[slots]], slots[self._alive[slots]]) for keys, slots in self._runs]
+        self._runs = [run for run in self._runs if len(run[0])]
+        self._free.extend(self._removed)
+        self._removed = []
+
+    def query(self,
+              t0: np.ndarray,
+              t1: np.ndarray,
+              lo: np.ndarray,
+              hi: np.ndarray,
+              margin: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find indexed boxes overlapping query boxes inflated by margin in space.
+        Time intervals overlap when they share at least one instant.
+
+        :param t0: (Q,) query start times
+        :param t1: (Q,) query end times
+        :param lo: (Q, 3) lower query corners
+        :param hi: (Q, 3) upper query corners
+        :param margin: distance added around each query box
+        :return: (query, slot) arrays of candidate pairs, sorted by query then slot
+        """
+        t0, t1 = np.asarray(t0, dtype=float), np.asarray(t1, dtype=float)
+        lo = np.asarray(lo, dtype=float) - margin
+        hi = np.asarray(hi, dtype=float) + margin
+        alive = np.nonzero(self._alive[:self._size])[0]
+
+        # Collect (query, slot) pairs that share a grid cell
+        box, key, oversize = self._cells(t0, t1, lo, hi)
+        found_q, found_s = [], []
+        for run_keys, run_slots in self._runs:
+            left = np.searchsorted(run_keys, key, side='left')
+            count = np.searchsorted(run_keys, key, side='right') - left
+            found_q.append(np.repeat(box, count))
+            found_s.append(run_slots[np.repeat(left - np.cumsum(count) + count, count) + np.arange(count.sum())])
+
+        # Oversize entries on either side are compared with everything
+        found_q.append(np.repeat(np.arange(len(t0)), len(self._oversize)))
+        found_s.append(np.tile(self._oversize, len(t0)))
+        found_q.append(np.repeat(oversize, len(alive)))
+        found_s.append(np.tile(alive, len(oversize)))
+
+        q = np.concatenate(found_q).astype(np.int64)
+        s = np.concatenate(found_s).astype(np.int64)
+        pair = np.unique(q * max(self._size, 1) + s)
+        q, s = pair // max(self._size, 1), pair % max(self._size, 1)
+
+        # Exact bounding box test on the deduplicated candidates
+        hit = (self._alive[s]
+               & (self._t0[s] <= t1[q]) & (t0[q] <= self._t1[s])
+               & np.all(self._lo[s] <= hi[q], axis=1) & np.all(lo[q] <= self._hi[s], axis=1))
+        q, s = q[hit], s[hit]
+
+        total = len(t0) * len(alive)
+        self.stats = {"pairs_total": total, "pairs_candidate": len(q), "pairs_pruned": total - len(q)}
+        return q, s
@@ -1,31 +1,160 @@
-from typing import List, Tuple
-from data_model import Flight, Conflict
-from collision_check import check_conflicts_sampled, check_conflicts_analytic
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import instrumentation
+import kernels
+from data_model import Flight, Conflict, ConflictEpisode
+from collision_check import (check_conflicts_sampled, check_conflicts_analytic, check_conflicts_vectorized,
+                             check_conflicts_adaptive, check_conflicts_all_pairs, iter_conflicts_sampled,
+                             iter_conflicts_analytic, first_conflict)
+from parallel import check_mission_parallel, check_all_pairs_parallel
+from result_cache import PairCache, check_conflicts_cached
+from simplification import simplify_flight, simplify_flights
 
 # Function to check if any conflicts exist
 def check_mission(primary_flight: Flight, 
                   other_flights: List[Flight], 
                   buffer: float, 
                   mode: str = "sampled", 
-                  time_step: float = 1.0) -> Tuple[str, List[Conflict]]:
+                  time_step: float = 1.0,
+                  broad_phase: bool = True,
+                  stats: Optional[Dict[str, int]] = None,
+                  workers: Optional[int] = 1,
+                  episodes: bool = False,
+                  cache: Optional[PairCache] = None,
+                  backend: Optional[str] = None,
+                  tolerance: float = 0.0) -> Tuple[str, Union[List[Conflict], List[ConflictEpisode]]]:
     """
     Main interface to check a mission for conflicts.
     
     :param primary_flight: the flight to be executed
     :param other_flights: list of other flights in the airspace
     :param buffer: minimum separation distance in meters
-    :param mode: "sampled" or "analytic"
-    :param time_step: time step for sampled mode
-    :return: tuple (status, list of conflicts)
+    :param mode: "sampled", "analytic", "vectorized" or "adaptive"
+    :param time_step: time step for sampled mode (step inside the buffer for adaptive mode)
+    :param broad_phase: prune pairs with a space-time bounding box test before the exact checks
+    :param stats: optional dict filled with the number of pairs tested and pruned
+    :param workers: number of processes to split the other flights across (None: all CPUs)
+    :param episodes: merge conflicts into one ConflictEpisode per period of lost separation
+                     ("sampled", "analytic" and "vectorized" modes)
+    :param cache: PairCache of per-pair results; pairs already solved are not checked again
+                  ("sampled", "analytic" and "vectorized" modes, without episodes or workers)
+    :param backend: kernel backend for this check, "numpy" or "numba" (default: kernels.get_backend());
+                    "numba" runs NumPy when Numba is not installed
+    :param tolerance: simplify every flight to within this many meters first and inflate the
+                      buffer by the deviations; SAFE stays guaranteed for the original tracks,
+                      conflicts are reported on the simplified ones
+    :return: tuple (status, list of conflicts or episodes)
     """
     
     # Check conflicts using sampling or analytical method
+    instrumentation.count("mission_checks")
+    with instrumentation.phase("check_mission"), kernels.use(backend):
+        if mode not in ("sampled", "analytic", "vectorized", "adaptive"):
+            raise ValueError("Mode must be 'sampled', 'analytic', 'vectorized' or 'adaptive'")
+        elif episodes and mode == "adaptive":
+            raise ValueError("Episodes are not available in 'adaptive' mode")
+        if tolerance > 0:
+            with instrumentation.phase("simplify"):
+                primary_flight, primary_deviation = simplify_flight(primary_flight, tolerance)
+                other_flights, other_deviations = simplify_flights(other_flights, tolerance)
+            buffer += primary_deviation + float(other_deviations.max(initial=0.0))
+
+        if cache is not None:
+            if episodes or workers != 1:
+                raise ValueError("Cached checks do not support episodes or workers")
+            conflicts = check_conflicts_cached(primary_flight, other_flights, buffer, cache, mode, time_step,
+                                               broad_phase=broad_phase, stats=stats)
+        elif workers != 1:
+            conflicts = check_mission_parallel(primary_flight, other_flights, buffer, mode, time_step,
+                                               workers=workers, broad_phase=broad_phase, stats=stats,
+                                               episodes=episodes)
+        elif mode == "sampled":
+            conflicts = check_conflicts_sampled(primary_flight, other_flights, buffer, time_step,
+                                                broad_phase=broad_phase, stats=stats, episodes=episodes)
+        elif mode == "analytic":
+            conflicts = check_conflicts_analytic(primary_flight, other_flights, buffer,
+                                                 broad_phase=broad_phase, stats=stats, episodes=episodes)
+        elif mode == "adaptive":
+            conflicts = check_conflicts_adaptive(primary_flight, other_flights, buffer, time_step,
+                                                 broad_phase=broad_phase, stats=stats)
+        else:
+            conflicts = check_conflicts_vectorized(primary_flight, other_flights, buffer,
+                                                   broad_phase=broad_phase, stats=stats, episodes=episodes)
+    
+    status = "SAFE" if len(conflicts) == 0 else "CONFLICT"
+    return status, conflicts
+
+# Function to stream conflicts as they are found
+def stream_conflicts(primary_flight: Flight, 
+                     other_flights: List[Flight], 
+                     buffer: float, 
+                     mode: str = "sampled", 
+                     time_step: float = 1.0,
+                     broad_phase: bool = True) -> Iterator[Conflict]:
+    """
+    Yield the conflicts check_mission would return, in the same order, as they
+    are found. Stop iterating to skip the rest of the scan.
+    
+    The vectorized and adaptive modes solve all pairs in one batch, so they
+    yield only after the whole scan; use is_safe or first_conflict to stop early.
+    
+    :param primary_flight: the flight to be executed
+    :param other_flights: list of other flights in the airspace
+    :param buffer: minimum separation distance in meters
+    :param mode: "sampled", "analytic", "vectorized" or "adaptive"
+    :param time_step: time step for sampled mode (step inside the buffer for adaptive mode)
+    :param broad_phase: prune pairs with a space-time bounding box test before the exact checks
+    :return: iterator of conflicts
+    """
+    
     if mode == "sampled":
-        conflicts = check_conflicts_sampled(primary_flight, other_flights, buffer, time_step)
+        return iter_conflicts_sampled(primary_flight, other_flights, buffer, time_step, broad_phase=broad_phase)
     elif mode == "analytic":
-        conflicts = check_conflicts_analytic(primary_flight, other_flights, buffer)
-    else:
-        raise ValueError("Mode must be 'sampled' or 'analytic'")
+        return iter_conflicts_analytic(primary_flight, other_flights, buffer, broad_phase=broad_phase)
+    elif mode == "vectorized":
+        return iter(check_conflicts_vectorized(primary_flight, other_flights, buffer, broad_phase=broad_phase))
+    elif mode == "adaptive":
+        return iter(check_conflicts_adaptive(primary_flight, other_flights, buffer, time_step,
+                                             broad_phase=broad_phase))
+    raise ValueError("Mode must be 'sampled', 'analytic', 'vectorized' or 'adaptive'")
+
+# Function to give a go/no-go answer without a full scan
+def is_safe(primary_flight: Flight, 
+            other_flights: List[Flight], 
+            buffer: float, 
+            mode: str = "sampled", 
+            time_step: float = 1.0,
+            broad_phase: bool = True) -> bool:
+    """
+    Fast path for approvals: True exactly when check_mission would return
+    "SAFE", but stops at the first violation, searching nearest flights first.
+    Use first_conflict to get the violation itself.
     
+    :param primary_flight: the flight to be executed
+    :param other_flights: list of other flights in the airspace
+    :param buffer: minimum separation distance in meters
+    :param mode: "sampled", "analytic", "vectorized" or "adaptive"
+    :param time_step: time step for sampled mode (step inside the buffer for adaptive mode)
+    :param broad_phase: prune pairs with a space-time bounding box test before the exact checks
+    :return: True if no conflict exists
+    """
+    return first_conflict(primary_flight, other_flights, buffer, mode, time_step, broad_phase) is None
+
+# Function to check a whole schedule for conflicts
+def check_all_pairs(flights: List[Flight], 
+                    buffer: float,
+                    workers: Optional[int] = 1) -> Tuple[str, Dict[Tuple[str, str], List[Conflict]]]:
+    """
+    Fleet-wide interface: check every pair of flights once.
+    
+    :param flights: all flights in the schedule
+    :param buffer: minimum separation distance in meters
+    :param workers: number of processes to split the time axis across (None: all CPUs)
+    :return: tuple (status, conflicts grouped by (flight1_id, flight2_id))
+    """
+    
+    if workers != 1:
+        conflicts = check_all_pairs_parallel(flights, buffer, workers)
+    else:
+        conflicts = check_conflicts_all_pairs(flights, buffer)
     status = "SAFE" if len(conflicts) == 0 else "CONFLICT"
     return status, conflicts
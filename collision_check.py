@@ -1,8 +1,12 @@
-from typing import List, Optional, Tuple
+import math
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
-from data_model import Flight, Conflict
-from trajectory import get_position_at
+import instrumentation
+import kernels
+from data_model import Flight, Conflict, ConflictEpisode
+from broad_phase import segment_boxes
+from trajectory import get_position_at, get_positions_batch, compile_flight, mission_duration, sample_offsets
 
 # Function to calculate distance between 2 points
 def euclidean_distance(p1, p2) -> float:
@@ -14,7 +18,11 @@ def euclidean_distance(p1, p2) -> float:
 def check_conflicts_sampled(primary: Flight, 
                             others: List[Flight], 
                             buffer: float, 
-                            time_step: float = 1.0) -> List[Conflict]:
+                            time_step: float = 1.0,
+                            chunk_size: int = 4_000_000,
+                            broad_phase: bool = True,
+                            stats: Optional[Dict[str, int]] = None,
+                            episodes: bool = False) -> Union[List[Conflict], List[ConflictEpisode]]:
     """
     Detect conflicts using sampled positions at discrete time steps.
     
@@ -22,47 +30,167 @@ def check_conflicts_sampled(primary: Flight,
     :param others: list of other flights
     :param buffer: minimum allowed separation distance
     :param time_step: seconds between sampled positions
-    :return: list of Conflict objects
+    :param chunk_size: maximum number of (flight, time) samples held in memory at once
+    :param broad_phase: skip flights whose segments never come within buffer of the primary's
+    :param stats: optional dict updated with broad-phase pair counts
+    :param episodes: return one ConflictEpisode per detected conflict period instead
+                     of one Conflict per time step
+    :return: list of Conflict (or ConflictEpisode) objects
+    """
+
+    if episodes:
+        # Keep the analytic episodes that at least one sample fell into
+        samples = check_conflicts_sampled(primary, others, buffer, time_step, chunk_size, broad_phase, stats)
+        hit_times: Dict[str, List[float]] = {}
+        for c in samples:
+            hit_times.setdefault(c.flight2_id, []).append(c.conflict_time)
+        origin = compile_flight(primary).start_epoch
+        return [e for e in check_conflict_episodes(primary, others, buffer, origin, broad_phase)
+                if any(e.entry_time - 1e-6 <= t <= e.exit_time + 1e-6 for t in hit_times.get(e.flight2_id, ()))]
+
+    return list(iter_conflicts_sampled(primary, others, buffer, time_step, chunk_size, broad_phase, stats))
+
+def iter_conflicts_sampled(primary: Flight, 
+                           others: List[Flight], 
+                           buffer: float, 
+                           time_step: float = 1.0,
+                           chunk_size: int = 4_000_000,
+                           broad_phase: bool = True,
+                           stats: Optional[Dict[str, int]] = None) -> Iterator[Conflict]:
+    """
+    Generator version of check_conflicts_sampled: yields the same conflicts in
+    the same order, one time chunk at a time, so callers can stop early.
+    Parameters are as for check_conflicts_sampled.
     """
+
+    # Only sample flights that pass the broad phase
+    if broad_phase:
+        others = [others[k] for k in _candidate_flights(primary, others, buffer, stats)]
     
-    # List to store conflicts, if any
-    conflicts = []
+    # Sample times over the entire duration of the primary flight
+    offsets = sample_offsets(mission_duration(primary), time_step)
+    primary_c = compile_flight(primary)
+    if len(offsets) == 0 or len(others) == 0:
+        return
     
-    # Compute total duration of flight
-    total_duration = primary.mission_window.duration()
-    t = 0.0
-    
-    # Go through entire time duration to check conflicts
-    while t <= total_duration:
-        current_time = primary.mission_window.start + timedelta(seconds=t)
-        # Get position of primary flight
-        primary_pos = get_position_at(primary, current_time)
-        if not primary_pos:
-            t += time_step
-            continue
+    # Go through the time axis in chunks so the position array stays bounded
+    steps_per_chunk = max(1, chunk_size // len(others))
+    for lo in range(0, len(offsets), steps_per_chunk):
+        t = offsets[lo:lo + steps_per_chunk]
 
-        # Iterate through all other flights
-        for other in others:
-            # Get position of other flights
-            other_pos = get_position_at(other, current_time)
-            if not other_pos:
-                continue
+        # Positions of the primary flight and of all other flights at these times
+        with instrumentation.phase("interpolation"):
+            primary_pos = primary_c.positions_at(t)
+            other_pos = get_positions_batch(others, t, origin=primary_c.start_epoch)
 
-            # Compute distance between primary flight and other flights
-            distance = euclidean_distance(primary_pos, other_pos)
-            # If distance is less than buffer, consider it as a conflict
-            if distance < buffer:
-                conflicts.append(Conflict(
-                    flight1_id=primary.flight_id,
-                    flight2_id=other.flight_id,
-                    conflict_time=t,
-                    location=primary_pos,
-                    distance=distance
-                ))
-        
-        # Increase time step
-        t += time_step
-        
+        # Compute distance between primary flight and other flights, NaN where either is absent
+        with instrumentation.phase("distance"):
+            compiled = kernels.kernel("sample_distance")
+            if compiled is not None:
+                distance = compiled(other_pos, primary_pos)
+            else:
+                distance = np.linalg.norm(other_pos - primary_pos[None, :, :], axis=2)
+            # If distance is less than buffer, consider it as a conflict (ordered by time, then flight)
+            steps, flights = np.nonzero((distance < buffer).T)
+        instrumentation.count("sample_pairs_tested", distance.size)
+
+        with instrumentation.phase("conflict_construction"):
+            chunk = [Conflict(
+                flight1_id=primary.flight_id,
+                flight2_id=others[f].flight_id,
+                conflict_time=float(t[k]),
+                location=tuple(float(c) for c in primary_pos[k]),
+                distance=float(distance[f, k])
+            ) for k, f in zip(steps, flights)]
+        instrumentation.count("conflicts_emitted", len(chunk))
+        yield from chunk
+
+
+# Function to pick the flights that may come within buffer of the primary
+def _candidate_flights(primary: Flight, 
+                       others: List[Flight], 
+                       buffer: float,
+                       stats: Optional[Dict[str, int]] = None) -> List[int]:
+    """
+    Broad phase at flight level, in wall-clock time.
+    
+    :return: positions in others of flights with at least one candidate segment pair
+    """
+    
+    origin = compile_flight(primary).start_epoch
+    primary_seg = pack_segments([primary], origin, boxes=True)
+    other_seg = pack_segments(others, origin, boxes=True)
+    _, pj = _candidate_pairs(primary_seg, other_seg, buffer, stats)
+    # Flights without any segment are kept as they cannot be indexed
+    segmented = set(other_seg[0].tolist())
+    keep = set(other_seg[0][pj].tolist())
+    return [k for k in range(len(others)) if k in keep or k not in segmented]
+
+def check_conflicts_adaptive(primary: Flight, 
+                             others: List[Flight], 
+                             buffer: float, 
+                             time_step: float = 1.0,
+                             min_step: float = 1e-3,
+                             broad_phase: bool = True,
+                             stats: Optional[Dict[str, int]] = None) -> List[Conflict]:
+    """
+    Detect conflicts by sampling each pair only while it is within buffer.
+    
+    The periods each pair spends within buffer are solved per segment pair
+    from the quadratic in buffer_crossing_batch (the conflict episodes), so
+    time outside the buffer costs nothing however close the flights stay, and
+    crossings shorter than time_step are not missed. Inside the buffer the pair
+    is sampled every time_step from just after it enters, like the sampled mode.
+    
+    :param primary: primary flight to check
+    :param others: list of other flights
+    :param buffer: minimum allowed separation distance
+    :param time_step: seconds between samples while two flights are within buffer
+    :param min_step: seconds after entering the buffer of the first sample; periods
+                     shorter than this get one sample at their midpoint
+    :param broad_phase: skip flights whose segments never come within buffer of the primary's
+    :param stats: optional dict updated with broad-phase pair counts
+    :return: list of Conflict objects, ordered by time then by flight
+    """
+    
+    primary_c = compile_flight(primary)
+    duration = mission_duration(primary)
+    episodes = check_conflict_episodes(primary, others, buffer, broad_phase=broad_phase, stats=stats, emit=False)
+    rows = {}
+    for k, other in enumerate(others):
+        rows.setdefault(other.flight_id, k)
+    
+    found, tested = [], 0
+    with instrumentation.phase("narrow_phase"):
+        for episode in episodes:
+            # Samples from just after entry, within the primary's mission window
+            entry, exit = max(episode.entry_time, 0.0), min(episode.exit_time, duration)
+            if exit < entry:
+                continue
+            t = np.arange(entry + min_step, exit, time_step) if exit - entry > min_step else np.empty(0)
+            if len(t) == 0:
+                t = np.array([(entry + exit) / 2])
+            tested += len(t)
+            k = rows[episode.flight2_id]
+            other_c = compile_flight(others[k])
+            primary_pos = primary_c.positions_at(t)
+            distance = np.linalg.norm(other_c.positions_at(t + primary_c.start_epoch - other_c.start_epoch)
+                                      - primary_pos, axis=1)
+            for n in np.nonzero(distance < buffer)[0]:
+                found.append((float(t[n]), k, tuple(float(c) for c in primary_pos[n]), float(distance[n])))
+    instrumentation.count("sample_pairs_tested", tested)
+    
+    # Order by time, then by flight, as the sampled mode does
+    found.sort(key=lambda item: (item[0], item[1]))
+    with instrumentation.phase("conflict_construction"):
+        conflicts = [Conflict(
+            flight1_id=primary.flight_id,
+            flight2_id=others[k].flight_id,
+            conflict_time=t,
+            location=pos,
+            distance=distance
+        ) for t, k, pos, distance in found]
+    instrumentation.count("conflicts_emitted", len(conflicts))
     return conflicts
 
 
@@ -117,54 +245,789 @@ def closest_approach_linear(p1_start: Tuple[float, float, float],
 
 def check_conflicts_analytic(primary: Flight, 
                              others: List[Flight], 
-                             buffer: float) -> List[Conflict]:
+                             buffer: float,
+                             broad_phase: bool = True,
+                             stats: Optional[Dict[str, int]] = None,
+                             episodes: bool = False) -> Union[List[Conflict], List[ConflictEpisode]]:
     """
     Detect conflicts analytically for linear segments between waypoints.
     Works for 2D or 3D flights based on available attributes (x, y[, z]).
+    Flights are aligned on wall-clock time, so their mission windows may
+    start at different times.
+
+    With broad_phase, only segment pairs whose buffer-inflated space-time
+    bounding boxes overlap are passed to the exact closest-approach test.
+    With episodes, conflicts are merged into one ConflictEpisode per period.
+    """
+
+    if episodes:
+        return check_conflict_episodes(primary, others, buffer, None, broad_phase, stats)
+    return list(iter_conflicts_analytic(primary, others, buffer, broad_phase, stats))
+
+def iter_conflicts_analytic(primary: Flight, 
+                            others: List[Flight], 
+                            buffer: float,
+                            broad_phase: bool = True,
+                            stats: Optional[Dict[str, int]] = None) -> Iterator[Conflict]:
+    """
+    Generator version of check_conflicts_analytic: yields the same conflicts in
+    the same order, one other flight at a time, so callers can stop early.
+    Parameters are as for check_conflicts_analytic.
     """
     
-    conflicts = []
+    # Precomputed segment records of every flight on the primary's timeline
+    origin = compile_flight(primary).start_epoch
+    _, i_idx, i_t0, i_t1, i_p0, i_v, *_ = primary_seg = pack_segments([primary], origin, boxes=True)
+    j_own, j_idx, j_t0, j_t1, j_p0, j_v, *_ = other_seg = pack_segments(others, origin, boxes=True)
+
+    # Candidate segment pairs, ordered by other flight, primary segment, other segment
+    if broad_phase:
+        pi, pj = _candidate_pairs(primary_seg, other_seg, buffer, stats)
+    else:
+        pi = np.repeat(np.arange(len(i_t0)), len(j_t0))
+        pj = np.tile(np.arange(len(j_t0)), len(i_t0))
+    order = np.lexsort((j_idx[pj], i_idx[pi], j_own[pj]))
+    pi, pj, owner = pi[order].tolist(), pj[order].tolist(), j_own[pj[order]]
+    instrumentation.count("segment_pairs_tested", len(pi))
+
+    # Plain floats are fastest when pairs are solved one at a time
+    primary_rows = list(zip(i_t0.tolist(), i_t1.tolist(), i_p0.tolist(), i_v.tolist()))
+    other_rows = list(zip(j_t0.tolist(), j_t1.tolist(), j_p0.tolist(), j_v.tolist()))
+
+    # Pairs of each other flight are solved together, then yielded
+    bounds = np.flatnonzero(np.diff(owner)) + 1
+    for lo, hi in zip(np.concatenate(([0], bounds)).tolist(), np.concatenate((bounds, [len(pi)])).tolist()):
+        found = []
+        with instrumentation.phase("narrow_phase"):
+            for a, b in zip(pi[lo:hi], pj[lo:hi]):
+                hit = _closest_approach_records(primary_rows[a], other_rows[b])
+                if hit is not None and hit[0] < buffer:
+                    found.append((a, hit))
+        instrumentation.count("conflicts_emitted", len(found))
+
+        for a, (dist, t_closest) in found:
+            # Position of the primary on its own segment at the time of closest approach
+            t0, _, p0, v = primary_rows[a]
+            yield Conflict(
+                flight1_id=primary.flight_id,
+                flight2_id=others[owner[lo]].flight_id,
+                conflict_time=t_closest,
+                location=tuple(p + u * (t_closest - t0) for p, u in zip(p0, v)),
+                distance=dist
+            )
+
+# Function to solve closest approach for one pair of segment records
+def _closest_approach_records(first: tuple, 
+                              second: tuple) -> Optional[Tuple[float, float]]:
+    """
+    Scalar counterpart of closest_approach_batch on (t0, t1, p0, velocity) records.
+
+    :return: (closest_distance, time_at_closest), or None if the segments never overlap in time
+    """
     
-    # Extract waypoints and times for primary flight
-    primary_wp = primary.waypoints
-    primary_times = [wp.time_offset if wp.time_offset is not None else idx for idx, wp in enumerate(primary_wp)]
-    
-    for other in others:
-        other_wp = other.waypoints
-        other_times = [wp.time_offset if wp.time_offset is not None else idx for idx, wp in enumerate(other_wp)]
-        
-        # Compare each segment of primary with each segment of the other flight
-        for i in range(len(primary_wp) - 1):
-            for j in range(len(other_wp) - 1):
-
-                # Extract coordinates
-                def get_coords(wp):
-                    if hasattr(wp, 'z'):
-                        return np.array([wp.x, wp.y, wp.z], dtype=float)
-                    else:
-                        return np.array([wp.x, wp.y], dtype=float)
-
-                p1_start = get_coords(primary_wp[i])
-                p1_end   = get_coords(primary_wp[i+1])
-                p2_start = get_coords(other_wp[j])
-                p2_end   = get_coords(other_wp[j+1])
-
-                # Call analytic closest-approach
-                dist, t_closest = closest_approach_linear(
-                    p1_start, p1_end, primary_times[i], primary_times[i+1],
-                    p2_start, p2_end, other_times[j], other_times[j+1]
-                )
+    t1_start, t1_end, p1, v1 = first
+    t2_start, t2_end, p2, v2 = second
+    dt_start = max(t1_start, t2_start)
+    dt_end = min(t1_end, t2_end)
+    if dt_start >= dt_end:
+        return None
+
+    # Relative position at the start of the common window and relative velocity
+    p_rel = [(a + u * (dt_start - t1_start)) - (b + w * (dt_start - t2_start)) for a, u, b, w in zip(p1, v1, p2, v2)]
+    v_rel = [u - w for u, w in zip(v1, v2)]
+
+    # Minimize || p_rel + v_rel * t ||^2 and clip to the common window
+    vv = v_rel[0] * v_rel[0] + v_rel[1] * v_rel[1] + v_rel[2] * v_rel[2]
+    pv = p_rel[0] * v_rel[0] + p_rel[1] * v_rel[1] + p_rel[2] * v_rel[2]
+    t = min(max(-pv / vv, 0.0), dt_end - dt_start) if vv > 0 else 0.0
+
+    distance = math.sqrt(sum((p + u * t) ** 2 for p, u in zip(p_rel, v_rel)))
+    return distance, dt_start + t
+
+# Function to pack flight segments into contiguous arrays
+def pack_segments(flights: List[Flight], 
+                  origin: Optional[float] = None,
+                  boxes: bool = False) -> Tuple[np.ndarray, ...]:
+    """
+    Pack the precomputed segment records of several flights (see
+    CompiledFlight.segments) into contiguous arrays on a common timeline.
+    Segments with zero duration are dropped since they can never overlap in time.
+
+    :param flights: list of Flight objects
+    :param origin: epoch seconds to measure times from; None keeps each
+                   flight's time offsets as they are
+    :param boxes: also return the segments' spatial bounding boxes
+    :return: (owner, index, t_start, t_end, p_start, velocity) where owner is the
+             position of the flight in the input list, index is the segment number
+             within that flight, times are (M,) and positions/velocities are (M, 3);
+             with boxes, followed by the (M, 3) lo and hi box corners
+    """
+
+    records, owners, shifts = [], [], []
+    for k, flight in enumerate(flights):
+        compiled = compile_flight(flight)
+        segments = compiled.segments()
+        if len(segments[0]):
+            records.append(segments)
+            owners.append(k)
+            shifts.append(0.0 if origin is None else compiled.start_epoch - origin)
+
+    if not records:
+        empty = np.empty(0)
+        packed = (empty.astype(int), empty.astype(int), empty, empty) + (np.empty((0, 3)),) * 4
+        return packed if boxes else packed[:6]
+
+    # One concatenation per column; owners and time shifts are expanded per segment
+    counts = [len(segments[0]) for segments in records]
+    index, t0, t1, p0, velocity, lo, hi = (np.concatenate(column) for column in zip(*records))
+    shift = np.repeat(shifts, counts)
+    packed = (np.repeat(owners, counts), index, t0 + shift, t1 + shift, p0, velocity, lo, hi)
+
+    # Shifting onto the common timeline can round a very short segment to nothing
+    keep = packed[3] > packed[2]
+    if not keep.all():
+        packed = tuple(column[keep] for column in packed)
+    return packed if boxes else packed[:6]
+
+# Function to find segment pairs that may come within buffer of each other
+def _candidate_pairs(primary_seg: Tuple[np.ndarray, ...], 
+                     other_seg: Tuple[np.ndarray, ...], 
+                     buffer: float,
+                     stats: Optional[Dict[str, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Broad phase for one primary flight: pair every other segment with the
+    primary segments it shares an instant with, then keep the pairs whose
+    bounding boxes come within buffer. A flight's segments follow each other
+    in time, so the overlapping ones are a contiguous run found by binary
+    search and no index has to be built per call.
+
+    :param primary_seg: packed primary segments from pack_segments, with or without boxes
+    :param other_seg: packed other segments from pack_segments, with or without boxes
+    :param buffer: minimum allowed separation distance
+    :param stats: optional dict updated with the pair counts
+    :return: (pi, pj) indices into the packed primary and other segments, sorted by pi then pj
+    """
+
+    _, _, i_t0, i_t1, i_p0, i_v, *i_box = primary_seg
+    _, _, j_t0, j_t1, j_p0, j_v, *j_box = other_seg
+    with instrumentation.phase("broad_phase"):
+        # Use the precomputed boxes when the segments were packed with them
+        j_lo, j_hi = j_box or segment_boxes(j_p0, j_v, j_t0, j_t1)
+        i_lo, i_hi = i_box or segment_boxes(i_p0, i_v, i_t0, i_t1)
+
+        # Other segments outside the primary's whole space-time box pair with nothing
+        if len(i_t0):
+            near = ((j_t0 <= i_t1.max()) & (j_t1 >= i_t0.min())
+                    & np.all(j_lo <= i_hi.max(axis=0) + buffer, axis=1)
+                    & np.all(j_hi >= i_lo.min(axis=0) - buffer, axis=1))
+        else:
+            near = np.zeros(len(j_t0), dtype=bool)
+        j_near = np.flatnonzero(near)
+
+        if np.all(i_t0[1:] >= i_t0[:-1]) and np.all(i_t1[1:] >= i_t1[:-1]):
+            # Primary segments i with i_t1 >= j_t0 and i_t0 <= j_t1 form the run [first, last)
+            first = np.searchsorted(i_t1, j_t0[j_near], side='left')
+            count = np.maximum(np.searchsorted(i_t0, j_t1[j_near], side='right') - first, 0)
+            pj = np.repeat(j_near, count)
+            pi = np.repeat(first - np.cumsum(count) + count, count) + np.arange(count.sum())
+        else:
+            # Unordered waypoint times: test time overlap against every primary segment
+            pi = np.repeat(np.arange(len(i_t0)), len(j_near))
+            pj = np.tile(j_near, len(i_t0))
+            overlap = (j_t0[pj] <= i_t1[pi]) & (i_t0[pi] <= j_t1[pj])
+            pi, pj = pi[overlap], pj[overlap]
+
+        # Bounding box test one axis at a time, dropping pairs as they fail
+        i_lo, i_hi = i_lo - buffer, i_hi + buffer
+        for k in range(3):
+            hit = (j_lo[:, k][pj] <= i_hi[pi, k]) & (i_lo[pi, k] <= j_hi[:, k][pj])
+            pi, pj = pi[hit], pj[hit]
+        order = np.argsort(pi, kind='stable')
+        pi, pj = pi[order], pj[order]
+
+    total = len(i_t0) * len(j_t0)
+    instrumentation.count("segment_pairs_total", total)
+    instrumentation.count("segment_pairs_pruned", total - len(pi))
+    if stats is not None:
+        stats.update({"pairs_total": total, "pairs_candidate": len(pi), "pairs_pruned": total - len(pi)})
+    return pi, pj
+
+# Function to compute closest approach for many segment pairs at once
+def closest_approach_batch(p1_start: np.ndarray,
+                           v1: np.ndarray,
+                           t1_start: np.ndarray,
+                           p2_start: np.ndarray,
+                           v2: np.ndarray,
+                           t2_start: np.ndarray,
+                           dt_start: np.ndarray,
+                           dt_end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized version of closest_approach_linear for K segment pairs that are
+    already known to overlap in time on [dt_start, dt_end].
+
+    :param p1_start: (K, 3) start positions of the first segments
+    :param v1: (K, 3) velocities of the first segments
+    :param t1_start: (K,) start times of the first segments
+    :param p2_start: (K, 3) start positions of the second segments
+    :param v2: (K, 3) velocities of the second segments
+    :param t2_start: (K,) start times of the second segments
+    :param dt_start: (K,) start of the common time window
+    :param dt_end: (K,) end of the common time window
+    :return: (closest_distance, time_at_closest), both (K,)
+    """
+
+    compiled = kernels.kernel("closest_approach")
+    if compiled is not None:
+        return compiled(p1_start, v1, t1_start, p2_start, v2, t2_start, dt_start, dt_end)
+
+    # Relative position at the start of the common window and relative velocity
+    v_rel = v1 - v2
+    p_rel = (p1_start + v1 * (dt_start - t1_start)[:, None]) - (p2_start + v2 * (dt_start - t2_start)[:, None])
+
+    # Minimize || p_rel + v_rel * t ||^2 and clip to the common window
+    vv = np.einsum('ij,ij->i', v_rel, v_rel)
+    pv = np.einsum('ij,ij->i', p_rel, v_rel)
+    moving = vv > 0
+    t_closest = np.zeros_like(vv)
+    t_closest[moving] = -pv[moving] / vv[moving]
+    t_closest = np.clip(t_closest, 0, dt_end - dt_start)
+
+    distance = np.linalg.norm(p_rel + v_rel * t_closest[:, None], axis=1)
+    return distance, dt_start + t_closest
+
+# Function to solve closest approach for every candidate segment pair
+def closest_approach_pairs(primary: Flight,
+                           others: List[Flight],
+                           buffer: float,
+                           chunk_size: int = 1_000_000,
+                           broad_phase: bool = True,
+                           stats: Optional[Dict[str, int]] = None) -> Tuple[tuple, tuple, np.ndarray, np.ndarray,
+                                                                            np.ndarray, np.ndarray]:
+    """
+    Closest approach of every primary/other segment pair that comes within
+    buffer, on the primary's wall-clock timeline.
+
+    :param primary: primary flight to check
+    :param others: list of other flights
+    :param buffer: keep pairs closer than this; np.inf keeps every pair that overlaps in time
+                   (broad_phase must then be False)
+    :param chunk_size: maximum number of segment pairs held in memory at once
+    :param broad_phase: only solve segment pairs that pass the broad phase
+    :param stats: optional dict updated with broad-phase pair counts
+    :return: (primary_seg, other_seg, pi, pj, distance, time) where primary_seg and
+             other_seg are packed with boxes and pi, pj index into them
+    """
+
+    # Precomputed segment records of every flight on the primary's timeline
+    origin = compile_flight(primary).start_epoch
+    primary_seg = pack_segments([primary], origin, boxes=True)
+    other_seg = pack_segments(others, origin, boxes=True)
+    return (primary_seg, other_seg) + solve_segment_pairs(primary_seg, other_seg, buffer, chunk_size,
+                                                          broad_phase, stats)
+
+# Function to solve closest approach between two sets of packed segments
+def solve_segment_pairs(primary_seg: tuple,
+                        other_seg: tuple,
+                        buffer: float,
+                        chunk_size: int = 1_000_000,
+                        broad_phase: bool = True,
+                        stats: Optional[Dict[str, int]] = None) -> Tuple[np.ndarray, np.ndarray,
+                                                                         np.ndarray, np.ndarray]:
+    """
+    Closest approach of every pair of packed segments that overlap in time and
+    come within buffer.
+
+    :param primary_seg: packed primary segments from pack_segments, with boxes
+    :param other_seg: packed other segments from pack_segments on the same timeline, with boxes
+    :param buffer: keep pairs closer than this
+    :param chunk_size: maximum number of segment pairs held in memory at once
+    :param broad_phase: only solve segment pairs that pass the broad phase
+    :param stats: optional dict updated with broad-phase pair counts
+    :return: (pi, pj, distance, time) with pi, pj indices into primary_seg and other_seg
+    """
+
+    _, i_idx, i_t0, i_t1, i_p0, i_v, *_ = primary_seg
+    _, j_idx, j_t0, j_t1, j_p0, j_v, *_ = other_seg
+    if len(i_idx) == 0 or len(j_idx) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0), np.empty(0)
+
+    if broad_phase:
+        # Candidate pairs come straight from the index
+        pi, pj = _candidate_pairs(primary_seg, other_seg, buffer, stats)
+        blocks = [(pi[lo:lo + chunk_size], pj[lo:lo + chunk_size]) for lo in range(0, len(pi), chunk_size)]
+    else:
+        # Every primary segment against every other segment, a block of rows at a time
+        rows_per_chunk = max(1, chunk_size // len(j_idx))
+        blocks = ((np.repeat(rows, len(j_idx)), np.tile(np.arange(len(j_idx)), len(rows)))
+                  for rows in np.array_split(np.arange(len(i_idx)), range(rows_per_chunk, len(i_idx), rows_per_chunk)))
+
+    hits_i, hits_j, hits_d, hits_t = [], [], [], []
+    for pi, pj in blocks:
+        # Common time window of every (primary, other) segment pair
+        dt_start = np.maximum(i_t0[pi], j_t0[pj])
+        dt_end = np.minimum(i_t1[pi], j_t1[pj])
+        overlap = dt_start < dt_end
+        pi, pj, dt_start, dt_end = pi[overlap], pj[overlap], dt_start[overlap], dt_end[overlap]
+        instrumentation.count("segment_pairs_tested", len(pi))
+
+        with instrumentation.phase("narrow_phase"):
+            dist, t_closest = closest_approach_batch(
+                i_p0[pi], i_v[pi], i_t0[pi],
+                j_p0[pj], j_v[pj], j_t0[pj],
+                dt_start, dt_end
+            )
+        conflict = dist < buffer
+        hits_i.append(pi[conflict])
+        hits_j.append(pj[conflict])
+        hits_d.append(dist[conflict])
+        hits_t.append(t_closest[conflict])
+
+    if not hits_i:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0), np.empty(0)
+    return np.concatenate(hits_i), np.concatenate(hits_j), np.concatenate(hits_d), np.concatenate(hits_t)
+
+def check_conflicts_vectorized(primary: Flight,
+                               others: List[Flight],
+                               buffer: float,
+                               chunk_size: int = 1_000_000,
+                               broad_phase: bool = True,
+                               stats: Optional[Dict[str, int]] = None,
+                               episodes: bool = False) -> Union[List[Conflict], List[ConflictEpisode]]:
+    """
+    Detect conflicts analytically like check_conflicts_analytic, but solve all
+    segment pairs in batched NumPy passes instead of one Python call per pair.
+    Returns the same conflicts in the same order.
+
+    :param primary: primary flight to check
+    :param others: list of other flights
+    :param buffer: minimum allowed separation distance
+    :param chunk_size: maximum number of segment pairs held in memory at once
+    :param broad_phase: only solve segment pairs that pass the broad phase
+    :param stats: optional dict updated with broad-phase pair counts
+    :param episodes: return one ConflictEpisode per conflict period instead
+    :return: list of Conflict (or ConflictEpisode) objects
+    """
+
+    if episodes:
+        return check_conflict_episodes(primary, others, buffer, None, broad_phase, stats)
+
+    primary_seg, other_seg, hits_i, hits_j, hits_d, hits_t = closest_approach_pairs(
+        primary, others, buffer, chunk_size, broad_phase, stats)
+    return approach_conflicts(primary, others, primary_seg, other_seg, hits_i, hits_j, hits_d, hits_t)
+
+# Function to turn closest-approach pairs into Conflict objects
+def approach_conflicts(primary: Flight,
+                       others: List[Flight],
+                       primary_seg: tuple,
+                       other_seg: tuple,
+                       hits_i: np.ndarray,
+                       hits_j: np.ndarray,
+                       hits_d: np.ndarray,
+                       hits_t: np.ndarray) -> List[Conflict]:
+    """
+    Build conflicts from the output of closest_approach_pairs, ordered like the
+    scalar engine: other flight, primary segment, other segment.
+
+    :return: list of Conflict objects
+    """
+    _, i_idx, i_t0, _, i_p0, i_v, *_ = primary_seg
+    j_own, j_idx, *_ = other_seg
+
+    order = np.lexsort((j_idx[hits_j], i_idx[hits_i], j_own[hits_j]))
+
+    # Position of the primary on its own segment at the time of closest approach
+    locations = i_p0[hits_i] + i_v[hits_i] * (hits_t - i_t0[hits_i])[:, None]
+
+    conflicts = []
+    with instrumentation.phase("conflict_construction"):
+        for k in order:
+            conflicts.append(Conflict(
+                flight1_id=primary.flight_id,
+                flight2_id=others[j_own[hits_j[k]]].flight_id,
+                conflict_time=float(hits_t[k]),
+                location=tuple(float(c) for c in locations[k]),
+                distance=float(hits_d[k])
+            ))
+    instrumentation.count("conflicts_emitted", len(conflicts))
 
-                # Check if this segment pair creates a conflict
-                if dist is not None and dist < buffer:
-                    conflict_time = primary.mission_window.start + timedelta(seconds=t_closest)
-                    conflicts.append(Conflict(
-                        flight1_id=primary.flight_id,
-                        flight2_id=other.flight_id,
-                        conflict_time=t_closest,
-                        location=get_position_at(primary, conflict_time),
-                        distance=dist
-                    ))
-                    
     return conflicts
 
+# Function to rank candidate segment pairs by how close they may get
+def _ranked_pairs(primary: Flight,
+                  others: List[Flight],
+                  buffer: float,
+                  origin: float,
+                  broad_phase: bool,
+                  stats: Optional[Dict[str, int]] = None) -> Tuple[tuple, tuple, np.ndarray, np.ndarray]:
+    """
+    Candidate segment pairs ordered by the gap between their bounding boxes,
+    a lower bound on their distance, so the likeliest conflicts come first.
+
+    :return: (primary_seg, other_seg, pi, pj) with pi, pj in ranked order
+    """
+
+    primary_seg = pack_segments([primary], origin, boxes=True)
+    other_seg = pack_segments(others, origin, boxes=True)
+    _, _, i_t0, _, _, _, i_lo, i_hi = primary_seg
+    _, _, j_t0, _, _, _, j_lo, j_hi = other_seg
+    if broad_phase:
+        pi, pj = _candidate_pairs(primary_seg, other_seg, buffer, stats)
+    else:
+        pi = np.repeat(np.arange(len(i_t0)), len(j_t0))
+        pj = np.tile(np.arange(len(j_t0)), len(i_t0))
+
+    gap = np.linalg.norm(np.maximum(0.0, np.maximum(j_lo[pj] - i_hi[pi], i_lo[pi] - j_hi[pj])), axis=1)
+    order = np.argsort(gap, kind='stable')
+    return primary_seg, other_seg, pi[order], pj[order]
+
+# Function to order flights by how close their bounding boxes come to the primary's
+def _ranked_flights(primary: Flight, others: List[Flight]) -> List[int]:
+    """
+    A cheap ordering for whole-flight scans: one box per flight, no segment
+    pairs, so ranking costs far less than the scan it orders.
+
+    :return: indices into others, nearest box first
+    """
+
+    primary_c = compile_flight(primary)
+    if len(primary_c.positions) == 0:
+        return list(range(len(others)))
+    lo, hi = primary_c.positions.min(axis=0), primary_c.positions.max(axis=0)
+    other_lo = np.full((len(others), 3), np.inf)
+    other_hi = np.full((len(others), 3), np.inf)
+    for k, flight in enumerate(others):
+        positions = compile_flight(flight).positions
+        if len(positions):
+            other_lo[k], other_hi[k] = positions.min(axis=0), positions.max(axis=0)
+    gap = np.linalg.norm(np.maximum(0.0, np.maximum(other_lo - hi, lo - other_hi)), axis=1)
+    return np.argsort(gap, kind='stable').tolist()
+
+def first_conflict(primary: Flight,
+                   others: List[Flight],
+                   buffer: float,
+                   mode: str = "sampled",
+                   time_step: float = 1.0,
+                   broad_phase: bool = True,
+                   block_size: int = 256) -> Optional[Conflict]:
+    """
+    Find one conflict as fast as possible, or None if the mission is safe.
+
+    Candidates are searched nearest in space first and the search stops at the
+    first violation, so a rejection usually costs a fraction of a full check.
+    The conflict found is one that the full check of the same mode reports,
+    but not necessarily its first.
+
+    :param primary: primary flight to check
+    :param others: list of other flights
+    :param buffer: minimum allowed separation distance
+    :param mode: "sampled", "analytic", "vectorized" or "adaptive"
+    :param time_step: time step for sampled mode (step inside the buffer for adaptive mode)
+    :param broad_phase: only search candidate pairs that pass the broad phase
+    :param block_size: segment pairs solved per batch in analytic and vectorized modes
+    :return: a Conflict or None
+    """
+
+    # All modes compare flights in wall-clock time, measured from the primary's start
+    origin = compile_flight(primary).start_epoch
+
+    if mode in ("analytic", "vectorized"):
+        # Solve ranked segment pairs a block at a time
+        primary_seg, other_seg, pi_all, pj_all = _ranked_pairs(primary, others, buffer, origin, broad_phase)
+        _, _, i_t0, i_t1, i_p0, i_v, *_ = primary_seg
+        j_own, _, j_t0, j_t1, j_p0, j_v, *_ = other_seg
+        for lo in range(0, len(pi_all), block_size):
+            pi, pj = pi_all[lo:lo + block_size], pj_all[lo:lo + block_size]
+            dt_start = np.maximum(i_t0[pi], j_t0[pj])
+            dt_end = np.minimum(i_t1[pi], j_t1[pj])
+            overlap = dt_start < dt_end
+            pi, pj, dt_start, dt_end = pi[overlap], pj[overlap], dt_start[overlap], dt_end[overlap]
+            dist, t_closest = closest_approach_batch(i_p0[pi], i_v[pi], i_t0[pi], j_p0[pj], j_v[pj], j_t0[pj],
+                                                     dt_start, dt_end)
+            hit = np.nonzero(dist < buffer)[0]
+            if len(hit):
+                k = hit[0]
+                location = i_p0[pi[k]] + i_v[pi[k]] * (t_closest[k] - i_t0[pi[k]])
+                return Conflict(
+                    flight1_id=primary.flight_id,
+                    flight2_id=others[j_own[pj[k]]].flight_id,
+                    conflict_time=float(t_closest[k]),
+                    location=tuple(float(c) for c in location),
+                    distance=float(dist[k])
+                )
+        return None
+
+    if mode not in ("sampled", "adaptive"):
+        raise ValueError("Mode must be 'sampled', 'analytic', 'vectorized' or 'adaptive'")
+
+    # Check whole flights in the order of the gap between their bounding box and
+    # the primary's; flights without waypoints go last
+    ranked = _ranked_flights(primary, others)
+
+    # Batched scans over chunks that double in size, so a near conflict is found
+    # after a small scan and a safe mission costs about two full checks at most
+    lo, size = 0, 8
+    while lo < len(ranked):
+        chunk = [others[k] for k in ranked[lo:lo + size]]
+        if mode == "sampled":
+            found = next(iter_conflicts_sampled(primary, chunk, buffer, time_step, broad_phase=broad_phase), None)
+        else:
+            found = next(iter(check_conflicts_adaptive(primary, chunk, buffer, time_step,
+                                                       broad_phase=broad_phase)), None)
+        if found is not None:
+            return found
+        lo, size = lo + size, size * 2
+    return None
+
+# Function to find when pairs of linear motions are within buffer
+def buffer_crossing_batch(p_rel: np.ndarray,
+                          v_rel: np.ndarray,
+                          duration: np.ndarray,
+                          buffer: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve |p_rel + v_rel * t|^2 = buffer^2 for K relative motions on [0, duration].
+
+    :param p_rel: (K, 3) relative positions at t = 0
+    :param v_rel: (K, 3) relative velocities
+    :param duration: (K,) length of each time window
+    :param buffer: separation distance
+    :return: (entry, exit) times within each window, NaN where the pair never
+             gets closer than buffer
+    """
+
+    a = np.einsum('ij,ij->i', v_rel, v_rel)
+    b = 2 * np.einsum('ij,ij->i', p_rel, v_rel)
+    c = np.einsum('ij,ij->i', p_rel, p_rel) - buffer ** 2
+
+    # Constant separation: inside for the whole window or never
+    entry = np.where(c < 0, 0.0, np.nan)
+    exit = np.where(c < 0, duration, np.nan)
+
+    # Moving: between the two roots of the quadratic, clipped to the window
+    moving = a > 0
+    disc = b ** 2 - 4 * a * c
+    real = moving & (disc > 0)
+    root = np.sqrt(np.where(real, disc, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_in = np.clip((-b - root) / (2 * a), 0, duration)
+        t_out = np.clip((-b + root) / (2 * a), 0, duration)
+    inside = real & (t_in < t_out)
+    entry = np.where(moving, np.where(inside, t_in, np.nan), entry)
+    exit = np.where(moving, np.where(inside, t_out, np.nan), exit)
+    return entry, exit
+
+def check_conflict_episodes(primary: Flight,
+                            others: List[Flight],
+                            buffer: float,
+                            origin: Optional[float] = None,
+                            broad_phase: bool = True,
+                            stats: Optional[Dict[str, int]] = None,
+                            tolerance: float = 1e-9,
+                            emit: bool = True) -> List[ConflictEpisode]:
+    """
+    Detect conflicts as episodes: one record per continuous period two flights
+    stay within buffer, with entry and exit solved analytically per segment
+    pair and merged across consecutive segments.
+
+    :param primary: primary flight to check
+    :param others: list of other flights
+    :param buffer: minimum allowed separation distance
+    :param origin: epoch seconds to align flights on (default: the primary's start)
+    :param broad_phase: only solve segment pairs that pass the broad phase
+    :param stats: optional dict updated with broad-phase pair counts
+    :param tolerance: gap in seconds below which consecutive intervals are merged
+    :param emit: count the episodes as emitted conflicts (off when they are an intermediate result)
+    :return: list of ConflictEpisode objects ordered by other flight, then entry
+             time, with times in seconds since the primary's start
+    """
+
+    if origin is None:
+        origin = compile_flight(primary).start_epoch
+    _, _, i_t0, i_t1, i_p0, i_v, *_ = primary_seg = pack_segments([primary], origin, boxes=True)
+    j_own, _, j_t0, j_t1, j_p0, j_v, *_ = other_seg = pack_segments(others, origin, boxes=True)
+    if len(i_t0) == 0 or len(j_t0) == 0:
+        return []
+
+    if broad_phase:
+        pi, pj = _candidate_pairs(primary_seg, other_seg, buffer, stats)
+    else:
+        pi, pj = np.repeat(np.arange(len(i_t0)), len(j_t0)), np.tile(np.arange(len(j_t0)), len(i_t0))
+
+    # Common time window of each pair and relative motion at its start
+    dt_start = np.maximum(i_t0[pi], j_t0[pj])
+    dt_end = np.minimum(i_t1[pi], j_t1[pj])
+    overlap = dt_start < dt_end
+    pi, pj, dt_start, dt_end = pi[overlap], pj[overlap], dt_start[overlap], dt_end[overlap]
+    v_rel = i_v[pi] - j_v[pj]
+    p_rel = (i_p0[pi] + i_v[pi] * (dt_start - i_t0[pi])[:, None]) - (j_p0[pj] + j_v[pj] * (dt_start - j_t0[pj])[:, None])
+
+    instrumentation.count("segment_pairs_tested", len(pi))
+    with instrumentation.phase("narrow_phase"):
+        entry, exit = buffer_crossing_batch(p_rel, v_rel, dt_end - dt_start, buffer)
+        inside = ~np.isnan(entry)
+        dist, t_closest = closest_approach_batch(i_p0[pi], i_v[pi], i_t0[pi], j_p0[pj], j_v[pj], j_t0[pj],
+                                                 dt_start, dt_end)
+    pi, pj, dist, t_closest = pi[inside], pj[inside], dist[inside], t_closest[inside]
+    entry, exit = (dt_start + entry)[inside], (dt_start + exit)[inside]
+
+    # Times are reported relative to the primary's own start
+    shift = origin - compile_flight(primary).start_epoch
+    location = i_p0[pi] + i_v[pi] * (t_closest - i_t0[pi])[:, None]
+
+    # Merge touching intervals per other flight
+    episodes: List[ConflictEpisode] = []
+    current = None
+    for k in np.lexsort((entry, j_own[pj])):
+        owner = j_own[pj[k]]
+        if current is not None and current[0] == owner and entry[k] <= current[1].exit_time - shift + tolerance:
+            episode = current[1]
+            episode.exit_time = max(episode.exit_time, float(exit[k] + shift))
+            if dist[k] < episode.min_distance:
+                episode.min_distance = float(dist[k])
+                episode.min_time = float(t_closest[k] + shift)
+                episode.location = tuple(float(c) for c in location[k])
+            continue
+        current = (owner, ConflictEpisode(
+            flight1_id=primary.flight_id,
+            flight2_id=others[owner].flight_id,
+            entry_time=float(entry[k] + shift),
+            exit_time=float(exit[k] + shift),
+            min_distance=float(dist[k]),
+            min_time=float(t_closest[k] + shift),
+            location=tuple(float(c) for c in location[k])
+        ))
+        episodes.append(current[1])
+
+    if emit:
+        instrumentation.count("conflicts_emitted", len(episodes))
+    return episodes
+
+# Function to sweep a fleet for conflicting segment pairs
+def all_pairs_hits(flights: List[Flight],
+                   buffer: float,
+                   origin: Optional[float] = None,
+                   window: Optional[Tuple[float, float]] = None,
+                   chunk_size: int = 1_000_000) -> Tuple[np.ndarray, ...]:
+    """
+    Find every conflicting segment pair of a fleet in one sweep over time.
+
+    Segments are sorted by start time and swept in blocks; each block is only
+    tested against the active set of earlier segments that are still flying,
+    after a buffer-inflated bounding box test.
+
+    :param flights: list of Flight objects
+    :param buffer: minimum allowed separation distance
+    :param origin: epoch seconds that times are measured from (default: earliest start)
+    :param window: optional [start, end) in seconds since origin; only segment pairs
+                   whose common time window starts inside it are reported
+    :param chunk_size: maximum number of segment pairs held in memory at once
+    :return: (owner_a, owner_b, index_a, index_b, time, distance, location) arrays,
+             with owner_a < owner_b positions in flights, segment indices, time of
+             closest approach since origin and location of flight a at that time
+    """
+
+    compiled = [compile_flight(f) for f in flights]
+    if origin is None:
+        origin = min((c.start_epoch for c in compiled), default=0.0)
+    owner, index, t0, t1, p0, v = pack_segments(compiled, origin)
+
+    # Sweep order is by segment start time
+    order = np.argsort(t0, kind='stable')
+    owner, index, t0, t1, p0, v = owner[order], index[order], t0[order], t1[order], p0[order], v[order]
+    lo, hi = segment_boxes(p0, v, t0, t1)
+
+    hits_a, hits_b, hits_d, hits_t = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0)], [np.empty(0)]
+    active = np.empty(0, dtype=np.int64)
+    start = 0
+    while start < len(t0):
+        # Drop segments that ended before this block starts
+        active = active[t1[active] > t0[start]]
+
+        # Size the block so the (block, active + block) pair matrix stays bounded
+        block_len = max(1, int((np.sqrt(len(active) ** 2 + 4 * chunk_size) - len(active)) / 2))
+        rows = np.arange(start, min(start + block_len, len(t0)))
+        active = np.concatenate((active, rows))
+        start = rows[-1] + 1
+
+        # Pairs of a block segment with an earlier active segment of another flight
+        mask = (active[None, :] < rows[:, None]) & (t0[rows][:, None] < t1[active][None, :])
+        if window is not None:
+            mask &= ((t0[rows] >= window[0]) & (t0[rows] < window[1]))[:, None]
+        for axis in range(3):
+            mask &= lo[rows, axis][:, None] <= hi[active, axis][None, :] + buffer
+            mask &= lo[active, axis][None, :] <= hi[rows, axis][:, None] + buffer
+        r, c = np.nonzero(mask)
+        keep = owner[rows[r]] != owner[active[c]]
+        r, c = r[keep], c[keep]
+
+        # Flight earlier in the input list is reported first
+        i, j = rows[r], active[c]
+        swap = owner[i] > owner[j]
+        a, b = np.where(swap, j, i), np.where(swap, i, j)
+
+        dt_start = np.maximum(t0[a], t0[b])
+        dt_end = np.minimum(t1[a], t1[b])
+        instrumentation.count("segment_pairs_tested", len(a))
+        with instrumentation.phase("narrow_phase"):
+            dist, t_closest = closest_approach_batch(p0[a], v[a], t0[a], p0[b], v[b], t0[b], dt_start, dt_end)
+        conflict = dist < buffer
+        hits_a.append(a[conflict])
+        hits_b.append(b[conflict])
+        hits_d.append(dist[conflict])
+        hits_t.append(t_closest[conflict])
+
+    a, b = np.concatenate(hits_a), np.concatenate(hits_b)
+    distance, time = np.concatenate(hits_d), np.concatenate(hits_t)
+    location = p0[a] + v[a] * (time - t0[a])[:, None]
+    return owner[a], owner[b], index[a], index[b], time, distance, location
+
+# Function to group conflicting segment pairs per flight pair
+def group_pair_hits(flights: List[Flight],
+                    hits: Tuple[np.ndarray, ...],
+                    origin: float) -> Dict[Tuple[str, str], List[Conflict]]:
+    """
+    Build Conflict lists per flight pair from all_pairs_hits output.
+
+    :param flights: list of Flight objects the owners refer to
+    :param hits: arrays returned by all_pairs_hits
+    :param origin: epoch seconds the hit times are measured from
+    :return: dict mapping (flight1_id, flight2_id) to its conflicts
+    """
+
+    owner_a, owner_b, index_a, index_b, time, distance, location = hits
+    compiled = [compile_flight(f) for f in flights]
+
+    # Ordered by flight pair, then like check_mission within each pair
+    results: Dict[Tuple[str, str], List[Conflict]] = {}
+    with instrumentation.phase("conflict_construction"):
+        for k in np.lexsort((index_b, index_a, owner_b, owner_a)):
+            first, second = compiled[owner_a[k]], compiled[owner_b[k]]
+            results.setdefault((first.flight_id, second.flight_id), []).append(Conflict(
+                flight1_id=first.flight_id,
+                flight2_id=second.flight_id,
+                conflict_time=float(time[k] + origin - first.start_epoch),
+                location=tuple(float(c) for c in location[k]),
+                distance=float(distance[k])
+            ))
+    instrumentation.count("conflicts_emitted", len(time))
+
+    return results
+
+def check_conflicts_all_pairs(flights: List[Flight],
+                              buffer: float,
+                              chunk_size: int = 1_000_000) -> Dict[Tuple[str, str], List[Conflict]]:
+    """
+    Detect conflicts between every pair of flights in one sweep over time.
+    Times are wall-clock, so flights may have different mission start times.
+
+    :param flights: list of Flight objects
+    :param buffer: minimum allowed separation distance
+    :param chunk_size: maximum number of segment pairs held in memory at once
+    :return: dict mapping (flight1_id, flight2_id) to its conflicts, each pair
+             once with flight1 earlier in the input list
+    """
+
+    if len(flights) < 2:
+        return {}
+    origin = min(compile_flight(f).start_epoch for f in flights)
+    hits = all_pairs_hits(flights, buffer, origin, chunk_size=chunk_size)
+    return group_pair_hits(flights, hits, origin)
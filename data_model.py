@@ -2,7 +2,21 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 
-@dataclass
+# Counter bumped whenever a waypoint, waypoint list, mission window or flight is
+# edited in place. Compiled trajectories cached on a Flight remember the value
+# they were checked at, so a cache hit is O(1) while nothing has been edited.
+_edit_generation = 0
+
+def edit_generation() -> int:
+    """Returns the current edit counter."""
+    return _edit_generation
+
+# Function to record an in-place edit
+def _edited():
+    global _edit_generation
+    _edit_generation += 1
+
+@dataclass(slots=True)
 class Waypoint:
     """
     Represents a single waypoint in a drone mission.
@@ -12,7 +26,23 @@ class Waypoint:
     z: Optional[float] = 0.0
     time_offset: Optional[float] = None
 
-@dataclass
+    def __setattr__(self, name, value):
+        # Fields set for the first time are being initialised, not edited
+        if hasattr(self, name):
+            _edited()
+        object.__setattr__(self, name, value)
+
+@dataclass(frozen=True, slots=True)
+class FrozenWaypoint:
+    """
+    Read-only waypoint with every field set, as handed out by fleet views.
+    """
+    x: float
+    y: float
+    z: float = 0.0
+    time_offset: float = 0.0
+
+@dataclass(slots=True)
 class MissionWindow:
     """
     Represents the overall time window during which a flight should occur.
@@ -24,7 +54,39 @@ class MissionWindow:
         """Returns mission duration in seconds."""
         return (self.end - self.start).total_seconds()
 
-@dataclass
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            _edited()
+        object.__setattr__(self, name, value)
+
+class WaypointList(list):
+    """
+    List of waypoints that records every in-place change, so edits such as
+    append, item assignment, reverse or sort invalidate compiled trajectories.
+    """
+
+    def _edit(method):
+        def edit(self, *args, **kwargs):
+            _edited()
+            return method(self, *args, **kwargs)
+        edit.__name__ = method.__name__
+        return edit
+
+    __setitem__ = _edit(list.__setitem__)
+    __delitem__ = _edit(list.__delitem__)
+    __iadd__ = _edit(list.__iadd__)
+    __imul__ = _edit(list.__imul__)
+    append = _edit(list.append)
+    extend = _edit(list.extend)
+    insert = _edit(list.insert)
+    pop = _edit(list.pop)
+    remove = _edit(list.remove)
+    clear = _edit(list.clear)
+    sort = _edit(list.sort)
+    reverse = _edit(list.reverse)
+    del _edit
+
+@dataclass(slots=True)
 class Flight:
     """
     Represents a drone flight consisting of a series of waypoints.
@@ -32,8 +94,18 @@ class Flight:
     flight_id: str
     waypoints: List[Waypoint]
     mission_window: MissionWindow
+    # Cached compiled trajectory, see trajectory.compile_flight
+    _compiled: Optional[object] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # Waypoints are held in a WaypointList so in-place list edits are seen too
+        if name == "waypoints" and not isinstance(value, WaypointList):
+            value = WaypointList(value)
+        if name != "_compiled" and hasattr(self, name):
+            _edited()
+        object.__setattr__(self, name, value)
 
-@dataclass
+@dataclass(slots=True)
 class Conflict:
     """
     Stores information about a detected conflict between two flights.
@@ -43,3 +115,16 @@ class Conflict:
     conflict_time: datetime
     location: Tuple[float, float, Optional[float]]
     distance: float
+
+@dataclass(slots=True)
+class ConflictEpisode:
+    """
+    Stores one continuous period during which two flights are closer than the buffer.
+    """
+    flight1_id: str
+    flight2_id: str
+    entry_time: float
+    exit_time: float
+    min_distance: float
+    min_time: float
+    location: Tuple[float, float, Optional[float]]
@@ -0,0 +1,207 @@
+"""
+Headless batch deconfliction.
+
+Checks every mission in one or more mission files and writes the results as
+JSON or CSV. Missions are checked against an approved schedule (--airspace)
+or, without one, against the other missions in the input:
+
+    python -m deconflict missions.csv --airspace approved.uavf --buffer 10 -o results.json
+
+Exits 0 when every mission is SAFE and 1 when any conflict was found.
+Matplotlib is only imported for --plot and --frames.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import asdict
+from typing import List, Optional, TextIO, Tuple
+import numpy as np
+from data_model import Conflict, ConflictEpisode
+from fleet import Fleet, FlightView
+from mission_io import import_csv, import_json, load_packed
+from trajectory import compile_flight, pack_flights
+from collision_check import all_pairs_hits
+from simplification import simplify_flights
+from cli_api import check_mission
+
+CSV_COLUMNS = ["flight_id", "status", "flight2_id", "conflict_time", "x", "y", "z", "distance"]
+
+# Function to load a mission file by extension
+def load_missions(path: str) -> Fleet:
+    """
+    Load a mission file: .csv (mission_io.import_csv), .json (import_json) or
+    anything else as a binary mission file (save_flights).
+
+    :param path: mission file path
+    :return: Fleet of the file's flights
+    """
+    if path.endswith(".csv"):
+        return Fleet.from_packed(import_csv(path))
+    if path.endswith(".json"):
+        return Fleet.from_packed(import_json(path))
+    return Fleet.from_packed(load_packed(path))
+
+# Function to check every mission against every other one in a single sweep
+def _pairwise_conflicts(missions: List[FlightView], buffer: float) -> List[List[Conflict]]:
+    """
+    Per-mission conflicts, as check_mission(mode="vectorized") gives them against
+    the other missions, from one all-pairs sweep instead of one check per mission.
+
+    :return: one conflict list per mission
+    """
+    compiled = [compile_flight(m) for m in missions]
+    origin = min((c.start_epoch for c in compiled), default=0.0)
+    owner_a, owner_b, index_a, index_b, time, distance, location = all_pairs_hits(compiled, buffer, origin)
+
+    # Each hit is a conflict of both missions; flight b's location is its own position at that time
+    packed = pack_flights(compiled)
+    row = packed.offsets[owner_b] + index_b
+    t = time + origin - packed.start_epochs[owner_b]
+    ratio = ((t - packed.times[row]) / (packed.times[row + 1] - packed.times[row]))[:, None]
+    location_b = packed.positions[row] + ratio * (packed.positions[row + 1] - packed.positions[row])
+
+    mission, other = np.concatenate((owner_a, owner_b)), np.concatenate((owner_b, owner_a))
+    own_index, other_index = np.concatenate((index_a, index_b)), np.concatenate((index_b, index_a))
+    times = np.concatenate((time, time)) + origin - packed.start_epochs[mission]
+    distances, locations = np.concatenate((distance, distance)), np.concatenate((location, location_b))
+
+    # Same order as check_mission: other flight, own segment, other segment
+    results: List[List[Conflict]] = [[] for _ in missions]
+    for k in np.lexsort((other_index, own_index, other, mission)):
+        results[mission[k]].append(Conflict(flight1_id=compiled[mission[k]].flight_id,
+                                            flight2_id=compiled[other[k]].flight_id,
+                                            conflict_time=float(times[k]),
+                                            location=tuple(float(c) for c in locations[k]),
+                                            distance=float(distances[k])))
+    return results
+
+# Function to check every mission of a batch
+def check_batch(missions: List[FlightView],
+                airspace: Optional[List[FlightView]],
+                buffer: float,
+                mode: str = "vectorized",
+                time_step: float = 1.0,
+                episodes: bool = False,
+                tolerance: float = 0.0) -> List[Tuple[str, str, list]]:
+    """
+    Without an airspace, analytic and vectorized checks (without episodes) are
+    answered by one all-pairs sweep over the missions.
+
+    :param missions: flights to check
+    :param airspace: approved flights to check against; None checks each mission
+                     against the other missions
+    :param buffer: minimum separation distance in meters
+    :param mode: check_mission mode
+    :param time_step: time step for sampled and adaptive modes
+    :param episodes: report conflict episodes instead of conflicts
+    :param tolerance: simplify tracks to within this many meters, inflating the buffer to match
+    :return: one (flight_id, status, conflicts) tuple per mission
+    """
+    # Every flight is simplified once; each check adds its own deviation and the largest other one
+    mission_deviation = airspace_deviation = np.zeros(0)
+    if tolerance > 0:
+        missions, mission_deviation = simplify_flights(missions, tolerance)
+        if airspace is not None:
+            airspace, airspace_deviation = simplify_flights(airspace, tolerance)
+
+    if airspace is None and mode in ("analytic", "vectorized") and not episodes:
+        # One shared buffer, inflated by the two largest deviations of any pair
+        inflate = float(np.sum(np.sort(mission_deviation)[-2:]))
+        conflicts = _pairwise_conflicts(missions, buffer + inflate)
+        return [(m.flight_id, "SAFE" if not c else "CONFLICT", c) for m, c in zip(missions, conflicts)]
+
+    results = []
+    top = np.argsort(mission_deviation)[::-1][:2]
+    for k, mission in enumerate(missions):
+        inflate = 0.0
+        if airspace is not None:
+            others = airspace
+            if tolerance > 0:
+                inflate = mission_deviation[k] + airspace_deviation.max(initial=0.0)
+        else:
+            others = missions[:k] + missions[k + 1:]
+            if tolerance > 0:
+                # Largest deviation among the other missions
+                rest = [j for j in top if j != k][:1]
+                inflate = mission_deviation[k] + (mission_deviation[rest[0]] if rest else 0.0)
+        status, conflicts = check_mission(mission, others, buffer + float(inflate), mode=mode, time_step=time_step,
+                                          episodes=episodes)
+        results.append((mission.flight_id, status, conflicts))
+    return results
+
+# Function to write results as JSON
+def write_json(results: List[Tuple[str, str, list]], out: TextIO):
+    json.dump([{"flight_id": flight_id, "status": status, "conflicts": [asdict(c) for c in conflicts]}
+               for flight_id, status, conflicts in results], out, indent=2)
+    out.write("\n")
+
+# Function to write results as CSV, one row per conflict
+def write_csv(results: List[Tuple[str, str, list]], out: TextIO):
+    """SAFE missions get one row with empty conflict columns. Episodes are written at their closest point."""
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    for flight_id, status, conflicts in results:
+        if not conflicts:
+            writer.writerow([flight_id, status, "", "", "", "", "", ""])
+        for c in conflicts:
+            if isinstance(c, ConflictEpisode):
+                row = (c.flight2_id, c.min_time, *c.location, c.min_distance)
+            else:
+                row = (c.flight2_id, c.conflict_time, *c.location, c.distance)
+            writer.writerow([flight_id, status, *row])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch deconfliction of mission files.")
+    parser.add_argument("missions", nargs="+", help="mission files (.csv, .json or binary mission files)")
+    parser.add_argument("--airspace", default=None, help="approved flights to check against")
+    parser.add_argument("--buffer", type=float, default=10.0, help="minimum separation in meters")
+    parser.add_argument("--mode", default="vectorized", choices=["sampled", "analytic", "vectorized", "adaptive"])
+    parser.add_argument("--time-step", type=float, default=1.0)
+    parser.add_argument("--episodes", action="store_true", help="report conflict episodes")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="simplify tracks to within this many meters (buffer is inflated to stay conservative)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["json", "csv"], default=None,
+                        help="output format (default: from the output extension, else json)")
+    parser.add_argument("--plot", choices=["2d", "3d"], default=None, help="show the missions' trajectories")
+    parser.add_argument("--frames", default=None, help="render animation frames to this directory")
+    parser.add_argument("--timing", action="store_true", help="print load and check times to stderr")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    missions = [view for path in args.missions for view in load_missions(path)]
+    airspace = list(load_missions(args.airspace)) if args.airspace else None
+    loaded = time.perf_counter()
+    results = check_batch(missions, airspace, args.buffer, args.mode, args.time_step, args.episodes,
+                          args.tolerance)
+    checked = time.perf_counter()
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "json")
+    write = write_csv if fmt == "csv" else write_json
+    if args.output == "-":
+        write(results, sys.stdout)
+    else:
+        with open(args.output, "w", newline="") as out:
+            write(results, out)
+
+    if args.timing:
+        print(f"loaded {len(missions)} missions in {loaded - t:.3f} s, checked in {checked - loaded:.3f} s",
+              file=sys.stderr)
+
+    # Plotting pulls in matplotlib, so it is only imported when asked for
+    if args.plot or args.frames:
+        import visualize
+        flights = missions + (airspace or [])
+        if args.frames:
+            visualize.export_frames(flights, args.frames, dimension=args.plot or "2d", time_step=args.time_step)
+        if args.plot == "2d":
+            visualize.plot_2d_trajectories(flights)
+        elif args.plot == "3d":
+            visualize.plot_3d_trajectories(flights)
+
+    return 1 if any(status != "SAFE" for _, status, _ in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Iterator, List, Optional, Union
+import numpy as np
+from data_model import Flight, FrozenWaypoint, MissionWindow, Waypoint
+from trajectory import CompiledFlight, PackedFlights
+
+class _WaypointList(Sequence):
+    """Read-only sequence creating FrozenWaypoint objects only when accessed."""
+    __slots__ = ("_times", "_positions")
+
+    def __init__(self, times: np.ndarray, positions: np.ndarray):
+        self._times = times
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+        x, y, z = self._positions[index]
+        return FrozenWaypoint(x=float(x), y=float(y), z=float(z), time_offset=float(self._times[index]))
+
+class FlightView(CompiledFlight):
+    """
+    One flight of a Fleet. It is a compiled flight, so every checker accepts it,
+    and also has the flight_id, waypoints and mission_window of a Flight.
+    Waypoints are read-only.
+    """
+    __slots__ = ("_end_epoch",)
+
+    def __init__(self,
+                 flight_id: str,
+                 start_epoch: float,
+                 end_epoch: float,
+                 times: np.ndarray,
+                 positions: np.ndarray):
+        super().__init__(flight_id, datetime.fromtimestamp(start_epoch), times, positions, start_epoch)
+        self._end_epoch = float(end_epoch)
+
+    @property
+    def waypoints(self) -> _WaypointList:
+        return _WaypointList(self.times, self.positions)
+
+    @property
+    def mission_window(self) -> MissionWindow:
+        return MissionWindow(start=self.start, end=datetime.fromtimestamp(self._end_epoch))
+
+    def duration(self) -> float:
+        """Returns the mission window duration in seconds."""
+        return self._end_epoch - self.start_epoch
+
+    def to_flight(self) -> Flight:
+        """Returns an independent, editable Flight with the same waypoints."""
+        waypoints = [Waypoint(x=wp.x, y=wp.y, z=wp.z, time_offset=wp.time_offset) for wp in self.waypoints]
+        return Flight(flight_id=self.flight_id, waypoints=waypoints, mission_window=self.mission_window)
+
+class Fleet:
+    """
+    Many flights stored as struct-of-arrays: one times column and one (W, 3)
+    positions column for all waypoints, plus a per-flight offset table.
+    Waypoints of flight k are rows offsets[k]:offsets[k+1].
+
+    Flights are handed out as FlightView objects built on demand, so memory is
+    the columns only. Measured with tracemalloc (benchmarks/bench_memory.py):
+    a Waypoint list costs about 208 bytes per waypoint as plain dataclasses and
+    168 as slotted ones, against 33 for a float64 Fleet and 17 for float32
+    (columns plus the per-flight tables, 200k waypoints in 2000 flights).
+    float32 keeps about 7 significant digits: millimeters within 10 km, but
+    only about 8 ms of resolution for time offsets near one day.
+    """
+    __slots__ = ("flight_ids", "start_epochs", "end_epochs", "offsets", "times", "positions", "_rows")
+
+    def __init__(self,
+                 flight_ids: List[str],
+                 start_epochs: np.ndarray,
+                 offsets: np.ndarray,
+                 times: np.ndarray,
+                 positions: np.ndarray,
+                 end_epochs: Optional[np.ndarray] = None,
+                 dtype=None):
+        """
+        :param flight_ids: (F,) flight IDs
+        :param start_epochs: (F,) mission start times, epoch seconds
+        :param offsets: (F+1,) first waypoint row of each flight
+        :param times: (W,) waypoint time offsets, seconds since start
+        :param positions: (W, 3) waypoint positions
+        :param end_epochs: (F,) mission end times (default: last waypoint time)
+        :param dtype: column dtype, e.g. np.float32 (default: keep the given arrays)
+        """
+        self.flight_ids = list(flight_ids)
+        self.start_epochs = np.asarray(start_epochs, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.times = np.asarray(times, dtype=dtype)
+        self.positions = np.asarray(positions, dtype=dtype).reshape(-1, 3)
+        if end_epochs is None:
+            last = np.maximum(self.offsets[1:] - 1, self.offsets[:-1])
+            end_epochs = self.start_epochs + (self.times[last] if len(self.times) else 0.0)
+        self.end_epochs = np.asarray(end_epochs, dtype=np.float64)
+        self._rows = {flight_id: k for k, flight_id in enumerate(self.flight_ids)}
+
+    @classmethod
+    def from_flights(cls,
+                     flights: List[Flight],
+                     dtype=np.float64) -> "Fleet":
+        """
+        Build a fleet from Flight objects.
+
+        :param flights: list of Flight objects
+        :param dtype: column dtype, np.float64 or np.float32
+        :return: Fleet
+        """
+        counts = [len(f.waypoints) for f in flights]
+        total = sum(counts)
+        times = np.fromiter((wp.time_offset if wp.time_offset is not None else idx
+                             for f in flights for idx, wp in enumerate(f.waypoints)), dtype=dtype, count=total)
+        coords = np.fromiter((c for f in flights for wp in f.waypoints
+                              for c in (wp.x, wp.y, wp.z if wp.z is not None else 0.0)), dtype=dtype, count=3 * total)
+        return cls(flight_ids=[f.flight_id for f in flights],
+                   start_epochs=[f.mission_window.start.timestamp() for f in flights],
+                   offsets=np.concatenate(([0], np.cumsum(counts))),
+                   times=times,
+                   positions=coords.reshape(-1, 3),
+                   end_epochs=[f.mission_window.end.timestamp() for f in flights])
+
+    @classmethod
+    def from_packed(cls,
+                    packed: PackedFlights,
+                    dtype=None) -> "Fleet":
+        """
+        Wrap packed arrays, e.g. from mission_io.load_packed, without copying
+        unless a different dtype is asked for.
+
+        :param packed: PackedFlights
+        :param dtype: column dtype (default: keep the packed arrays)
+        :return: Fleet
+        """
+        return cls(packed.flight_ids, packed.start_epochs, packed.offsets, packed.times, packed.positions,
+                   end_epochs=packed.end_epochs, dtype=dtype)
+
+    def packed(self) -> PackedFlights:
+        """Returns the fleet columns as PackedFlights, e.g. for mission_io.save_flights."""
+        return PackedFlights(flight_ids=self.flight_ids, start_epochs=self.start_epochs, offsets=self.offsets,
+                             times=self.times, positions=self.positions, end_epochs=self.end_epochs)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the array columns."""
+        return sum(a.nbytes for a in (self.start_epochs, self.end_epochs, self.offsets, self.times, self.positions))
+
+    def __len__(self) -> int:
+        return len(self.flight_ids)
+
+    def __contains__(self, flight_id: str) -> bool:
+        return flight_id in self._rows
+
+    def __getitem__(self, key: Union[int, str]) -> FlightView:
+        """
+        :param key: flight position in the fleet or flight ID
+        :return: FlightView
+        """
+        k = self._rows[key] if isinstance(key, str) else range(len(self))[key]
+        rows = slice(self.offsets[k], self.offsets[k + 1])
+        return FlightView(self.flight_ids[k], self.start_epochs[k], self.end_epochs[k],
+                          self.times[rows], self.positions[rows])
+
+    def __iter__(self) -> Iterator[FlightView]:
+        return (self[k] for k in range(len(self)))
@@ -0,0 +1,110 @@
+"""
+Counters and phase timers for the conflict checkers.
+
+Instrumentation is off by default and then costs one global lookup per hook.
+Turn it on around the code to measure:
+
+    with instrumentation.collect() as metrics:
+        check_mission(primary, others, buffer)
+    print(metrics.to_prometheus())
+"""
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional
+
+class Metrics:
+    """
+    Named counters and per-phase wall time.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def count(self, name: str, n: int = 1):
+        """Add n to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager adding the wall time of its body to a phase."""
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def merge(self, other: "Metrics"):
+        """Add another set of metrics, e.g. from a worker process, to this one."""
+        for name, value in other.counters.items():
+            self.count(name, value)
+        for name, value in other.seconds.items():
+            self.seconds[name] = self.seconds.get(name, 0.0) + value
+            self.calls[name] = self.calls.get(name, 0) + other.calls[name]
+
+    def reset(self):
+        self.counters.clear()
+        self.seconds.clear()
+        self.calls.clear()
+
+    def as_dict(self) -> dict:
+        """Returns {"counters": {...}, "phases": {name: {"seconds", "calls"}}}."""
+        return {"counters": dict(self.counters),
+                "phases": {name: {"seconds": self.seconds[name], "calls": self.calls[name]} for name in self.seconds}}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "uav_deconfliction") -> str:
+        """
+        Prometheus text exposition format: one counter per named counter, and
+        phase seconds and calls labelled by phase.
+        """
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        if self.seconds:
+            lines.append(f"# TYPE {prefix}_phase_seconds_total counter")
+            lines += [f'{prefix}_phase_seconds_total{{phase="{name}"}} {value:.9g}'
+                      for name, value in sorted(self.seconds.items())]
+            lines.append(f"# TYPE {prefix}_phase_calls_total counter")
+            lines += [f'{prefix}_phase_calls_total{{phase="{name}"}} {value}'
+                      for name, value in sorted(self.calls.items())]
+        return "\n".join(lines) + "\n"
+
+# Metrics being collected, or None when instrumentation is off
+_active: Optional[Metrics] = None
+_disabled_phase = nullcontext()
+
+def active() -> Optional[Metrics]:
+    """Returns the metrics being collected, or None when instrumentation is off."""
+    return _active
+
+def count(name: str, n: int = 1):
+    """Add n to a counter if instrumentation is on."""
+    if _active is not None:
+        _active.count(name, n)
+
+def phase(name: str):
+    """Context manager timing a phase if instrumentation is on, else a no-op."""
+    if _active is None:
+        return _disabled_phase
+    return _active.phase(name)
+
+@contextmanager
+def collect(metrics: Optional[Metrics] = None) -> Iterator[Metrics]:
+    """
+    Turn instrumentation on for the body of a with block.
+
+    :param metrics: Metrics to add to (default: a new one), e.g. to accumulate across checks
+    :return: the Metrics being filled
+    """
+    global _active
+    previous, _active = _active, metrics if metrics is not None else Metrics()
+    try:
+        yield _active
+    finally:
+        _active = previous
@@ -0,0 +1,118 @@
+"""
+Compute backends for the inner conflict kernels.
+
+The "numpy" backend (the default) runs the vectorized NumPy expressions in
+collision_check. The "numba" backend runs fused loop kernels compiled with
+Numba instead, which make one pass over the data and allocate only their
+outputs. Numba is optional: it is imported on first use, and when it is not
+installed the "numba" backend quietly runs the NumPy path.
+
+    kernels.set_backend("numba")
+    with kernels.use("numba"):
+        check_mission(primary, others, buffer, mode="vectorized")
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+BACKENDS = ("numpy", "numba")
+
+# Selected backend and the compiled kernels, built on first use
+_backend = "numpy"
+_compiled: Optional[Dict[str, Callable]] = None
+_numba_missing = False
+
+def set_backend(name: str):
+    """
+    Select the backend used by every checker.
+
+    :param name: "numpy" or "numba"
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError("Backend must be 'numpy' or 'numba'")
+    _backend = name
+
+def get_backend() -> str:
+    """Returns the selected backend."""
+    return _backend
+
+def active_backend() -> str:
+    """Returns the backend that actually runs: "numpy" when Numba was selected but is not installed."""
+    return "numba" if _backend == "numba" and _load() is not None else "numpy"
+
+@contextmanager
+def use(name: Optional[str]) -> Iterator[None]:
+    """Context manager selecting a backend for the body of a with block (None keeps the current one)."""
+    previous = _backend
+    if name is not None:
+        set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+def kernel(name: str) -> Optional[Callable]:
+    """
+    Compiled kernel to use instead of the NumPy path, or None for NumPy.
+
+    :param name: "closest_approach" or "sample_distance"
+    :return: compiled function or None
+    """
+    if _backend == "numpy":
+        return None
+    compiled = _load()
+    return compiled[name] if compiled is not None else None
+
+# Function to import Numba and compile the kernels once
+def _load() -> Optional[Dict[str, Callable]]:
+    global _compiled, _numba_missing
+    if _compiled is None and not _numba_missing:
+        try:
+            import numba
+        except ImportError:
+            _numba_missing = True
+            return None
+        _compiled = _compile(numba)
+    return _compiled
+
+def _compile(numba) -> Dict[str, Callable]:
+    import numpy as np
+
+    @numba.njit(cache=True)
+    def closest_approach(p1_start, v1, t1_start, p2_start, v2, t2_start, dt_start, dt_end):
+        # Same steps as collision_check.closest_approach_batch, one segment pair per iteration
+        k = dt_start.shape[0]
+        distance = np.empty(k)
+        time = np.empty(k)
+        for i in range(k):
+            a = dt_start[i] - t1_start[i]
+            b = dt_start[i] - t2_start[i]
+            vx = v1[i, 0] - v2[i, 0]
+            vy = v1[i, 1] - v2[i, 1]
+            vz = v1[i, 2] - v2[i, 2]
+            px = (p1_start[i, 0] + v1[i, 0] * a) - (p2_start[i, 0] + v2[i, 0] * b)
+            py = (p1_start[i, 1] + v1[i, 1] * a) - (p2_start[i, 1] + v2[i, 1] * b)
+            pz = (p1_start[i, 2] + v1[i, 2] * a) - (p2_start[i, 2] + v2[i, 2] * b)
+            vv = vx * vx + vy * vy + vz * vz
+            pv = px * vx + py * vy + pz * vz
+            t = -pv / vv if vv > 0 else 0.0
+            t = min(max(t, 0.0), dt_end[i] - dt_start[i])
+            ex, ey, ez = px + vx * t, py + vy * t, pz + vz * t
+            distance[i] = np.sqrt(ex * ex + ey * ey + ez * ez)
+            time[i] = dt_start[i] + t
+        return distance, time
+
+    @numba.njit(cache=True)
+    def sample_distance(other_pos, primary_pos):
+        # Distance of every (flight, time) sample to the primary, NaN where either is absent
+        flights, steps = other_pos.shape[0], other_pos.shape[1]
+        distance = np.empty((flights, steps))
+        for f in range(flights):
+            for k in range(steps):
+                ex = other_pos[f, k, 0] - primary_pos[k, 0]
+                ey = other_pos[f, k, 1] - primary_pos[k, 1]
+                ez = other_pos[f, k, 2] - primary_pos[k, 2]
+                distance[f, k] = np.sqrt(ex * ex + ey * ey + ez * ez)
+        return distance
+
+    return {"closest_approach": closest_approach, "sample_distance": sample_distance}
@@ -1,7 +1,6 @@
 from datetime import datetime
 from simulator import generate_random_flight, generate_handcoded_flight
 from cli_api import check_mission
-from visualize import plot_2d_trajectories, animate_2d, plot_3d_trajectories, animate_3d
 
 def run_scenario(flights, buffer_distance=5.0, mode="analytic", title="Scenario", dimension="3d"):
     """
@@ -38,7 +37,8 @@ def run_scenario(flights, buffer_distance=5.0, mode="analytic", title="Scenario"
     else:
         print("No conflicts detected.")
 
-    # Visualization
+    # Visualization (matplotlib is imported only once plots are needed)
+    from visualize import plot_2d_trajectories, animate_2d, plot_3d_trajectories, animate_3d
     if dimension == "2d":
         animate_2d(flights)
         plot_2d_trajectories(flights)
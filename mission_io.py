@@ -0,0 +1,191 @@
+import json
+from datetime import datetime
+from typing import List, Union
+import numpy as np
+from data_model import Flight
+from fleet import Fleet, FlightView
+from trajectory import PackedFlights, pack_flights
+
+# File layout (all little-endian, every section aligned to 8 bytes):
+#   header       MAGIC, version (u4), flight count (u8), waypoint count (u8)
+#   starts       (F,) f8 mission start, epoch seconds
+#   ends         (F,) f8 mission end, epoch seconds (version 2 and later)
+#   offsets      (F+1,) u8 first waypoint row of each flight
+#   id lengths   (F,) u4 UTF-8 byte length of each flight ID
+#   ids          concatenated UTF-8 flight IDs
+#   times        (W,) f8 waypoint time offsets, seconds since start
+#   positions    (W, 3) f8 waypoint x, y, z
+MAGIC = b"UAVFLT\0\0"
+VERSION = 2
+_HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("pad", "<u4"),
+                    ("flights", "<u8"), ("waypoints", "<u8")])
+
+def _padded(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+# Function to write flights to the binary format
+def save_flights(path: str,
+                 flights: Union[List[Flight], PackedFlights]):
+    """
+    Save flights to the compact binary mission format.
+
+    :param path: output file path
+    :param flights: list of Flight/CompiledFlight objects or PackedFlights
+    """
+
+    packed = flights if isinstance(flights, PackedFlights) else pack_flights(flights)
+    ends = packed.end_epochs
+    if ends is None:
+        last = np.maximum(packed.offsets[1:] - 1, packed.offsets[:-1])
+        ends = packed.start_epochs + (packed.times[last] if len(packed.times) else 0.0)
+    ids = [flight_id.encode("utf-8") for flight_id in packed.flight_ids]
+    blob = b"".join(ids)
+
+    header = np.zeros(1, dtype=_HEADER)
+    header["magic"], header["version"] = MAGIC, VERSION
+    header["flights"], header["waypoints"] = len(ids), len(packed.times)
+
+    with open(path, "wb") as f:
+        for section in (header.tobytes(),
+                        np.asarray(packed.start_epochs, dtype="<f8").tobytes(),
+                        np.asarray(ends, dtype="<f8").tobytes(),
+                        np.asarray(packed.offsets, dtype="<u8").tobytes(),
+                        np.array([len(i) for i in ids], dtype="<u4").tobytes(),
+                        blob):
+            f.write(section + b"\0" * (_padded(len(section)) - len(section)))
+        np.asarray(packed.times, dtype="<f8").tofile(f)
+        np.asarray(packed.positions, dtype="<f8").tofile(f)
+
+# Function to map a binary mission file into memory
+def load_packed(path: str,
+                mmap: bool = True) -> PackedFlights:
+    """
+    Load a binary mission file. With mmap the waypoint arrays are read-only
+    views of the file, so only the pages that are touched get loaded.
+
+    :param path: file written by save_flights
+    :param mmap: memory-map the waypoint arrays instead of reading them
+    :return: PackedFlights
+    """
+
+    header = np.fromfile(path, dtype=_HEADER, count=1)[0]
+    if header["magic"] != MAGIC.rstrip(b"\0") or header["version"] not in (1, VERSION):
+        raise ValueError(f"{path} is not a version 1 or {VERSION} mission file")
+    num_flights, num_waypoints = int(header["flights"]), int(header["waypoints"])
+
+    # Small per-flight tables are read eagerly; version 1 files have no mission ends
+    with open(path, "rb") as f:
+        f.seek(_HEADER.itemsize)
+        starts = np.frombuffer(f.read(8 * num_flights), dtype="<f8")
+        ends = np.frombuffer(f.read(8 * num_flights), dtype="<f8") if header["version"] >= 2 else None
+        offsets = np.frombuffer(f.read(8 * (num_flights + 1)), dtype="<u8").astype(np.int64)
+        lengths = np.frombuffer(f.read(4 * num_flights), dtype="<u4").astype(np.int64)
+        f.seek(_padded(f.tell()))
+        blob = f.read(int(lengths.sum()))
+        data_start = _padded(f.tell())
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    flight_ids = [blob[a:b].decode("utf-8") for a, b in zip(bounds[:-1], bounds[1:])]
+
+    # Waypoint columns are mapped, not copied
+    if mmap and num_waypoints:
+        times = np.memmap(path, dtype="<f8", mode="r", offset=data_start, shape=(num_waypoints,))
+        positions = np.memmap(path, dtype="<f8", mode="r", offset=data_start + 8 * num_waypoints,
+                              shape=(num_waypoints, 3))
+    else:
+        data = np.fromfile(path, dtype="<f8", offset=data_start, count=4 * num_waypoints)
+        times, positions = data[:num_waypoints], data[num_waypoints:].reshape(-1, 3)
+
+    return PackedFlights(flight_ids=flight_ids, start_epochs=starts, offsets=offsets,
+                         times=times, positions=positions, end_epochs=ends)
+
+# Function to load flights ready for the conflict checkers
+def load_flights(path: str,
+                 mmap: bool = True) -> List[FlightView]:
+    """
+    Load a binary mission file as fleet views: compiled flights, which every
+    checker accepts, that also have the flights' mission windows.
+
+    :param path: file written by save_flights
+    :param mmap: memory-map the waypoint arrays instead of reading them
+    :return: list of FlightView objects
+    """
+    return list(Fleet.from_packed(load_packed(path, mmap)))
+
+# Function to parse a start time given as epoch seconds or ISO 8601
+def _epoch(value) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(str(value)).timestamp()
+
+# Function to import waypoints from CSV
+def import_csv(path: str) -> PackedFlights:
+    """
+    Bulk import a CSV with header flight_id,start,time_offset,x,y,z and one row
+    per waypoint; rows of a flight must be contiguous. start is epoch seconds
+    or an ISO 8601 datetime and only needs to be set on the flight's first row.
+
+    :param path: CSV file path
+    :return: PackedFlights
+    """
+
+    table = np.genfromtxt(path, delimiter=",", names=True, dtype=None, encoding="utf-8",
+                          usecols=("flight_id", "start", "time_offset", "x", "y", "z"), autostrip=True)
+    table = np.atleast_1d(table)
+    flight_col = table["flight_id"].astype(str)
+
+    # A new flight starts wherever the ID changes
+    first_rows = np.concatenate(([0], np.nonzero(flight_col[1:] != flight_col[:-1])[0] + 1)) if len(table) else np.empty(0, dtype=int)
+    flight_ids = [str(flight_col[k]) for k in first_rows]
+    if len(set(flight_ids)) != len(flight_ids):
+        raise ValueError("Rows of each flight must be contiguous in the CSV")
+
+    return PackedFlights(
+        flight_ids=flight_ids,
+        start_epochs=np.array([_epoch(table["start"][k]) for k in first_rows], dtype=float),
+        offsets=np.concatenate((first_rows, [len(table)])).astype(np.int64),
+        times=table["time_offset"].astype(float),
+        positions=np.column_stack((table["x"], table["y"], table["z"])).astype(float),
+    )
+
+# Function to import flights from JSON
+def import_json(path: str) -> PackedFlights:
+    """
+    Bulk import a JSON list of flights shaped like dataclasses.asdict(Flight):
+    {"flight_id", "mission_window": {"start", "end"}, "waypoints": [{"x", "y", "z", "time_offset"}]}.
+    A missing z is 0 and a missing time_offset is the waypoint's index. Without
+    an end on every flight, missions end at their last waypoint.
+
+    :param path: JSON file path
+    :return: PackedFlights
+    """
+
+    with open(path) as f:
+        return pack_records(json.load(f))
+
+# Function to pack decoded JSON flight records
+def pack_records(records: List[dict]) -> PackedFlights:
+    """
+    :param records: flights in the import_json layout
+    :return: PackedFlights
+    """
+
+    times, positions, counts = [], [], []
+    windows = [record["mission_window"] for record in records]
+    for record in records:
+        waypoints = record["waypoints"]
+        times.append(np.array([wp.get("time_offset") if wp.get("time_offset") is not None else idx
+                               for idx, wp in enumerate(waypoints)], dtype=float))
+        positions.append(np.array([(wp["x"], wp["y"], wp.get("z") or 0.0) for wp in waypoints],
+                                  dtype=float).reshape(-1, 3))
+        counts.append(len(waypoints))
+
+    return PackedFlights(
+        flight_ids=[str(record["flight_id"]) for record in records],
+        start_epochs=np.array([_epoch(window["start"]) for window in windows], dtype=float),
+        offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+        times=np.concatenate(times) if times else np.empty(0),
+        positions=np.concatenate(positions) if positions else np.empty((0, 3)),
+        end_epochs=(np.array([_epoch(window["end"]) for window in windows], dtype=float)
+                    if all(window.get("end") is not None for window in windows) else None),
+    )
@@ -0,0 +1,156 @@
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import instrumentation
+import kernels
+from data_model import Flight, Conflict
+from trajectory import PackedFlights, compile_flight, pack_flights, unpack_flights
+from collision_check import (check_conflicts_sampled, check_conflicts_analytic, check_conflicts_vectorized,
+                             check_conflicts_adaptive, all_pairs_hits, group_pair_hits)
+
+# Function to split items into contiguous shards of similar weight
+def _shard_bounds(weights: np.ndarray, shards: int) -> List[Tuple[int, int]]:
+    total = np.cumsum(weights)
+    cuts = np.searchsorted(total, total[-1] * np.arange(1, shards) / shards) if len(total) else []
+    bounds = np.unique(np.concatenate(([0], cuts, [len(weights)]))).astype(int)
+    return [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+# Worker: check the primary against one shard of other flights
+def _check_shard(primary: Flight,
+                 others: PackedFlights,
+                 buffer: float,
+                 mode: str,
+                 time_step: float,
+                 broad_phase: bool,
+                 episodes: bool,
+                 instrument: bool = False,
+                 backend: Optional[str] = None) -> Tuple[list, Dict[str, int], Optional[instrumentation.Metrics]]:
+    if instrument:
+        # Collect the shard's metrics for the parent process to merge
+        with instrumentation.collect() as metrics:
+            conflicts, stats, _ = _check_shard(primary, others, buffer, mode, time_step, broad_phase, episodes,
+                                               backend=backend)
+        return conflicts, stats, metrics
+    # Workers only share the parent's module state when forked, so the backend is passed in
+    others_c = unpack_flights(others)
+    stats: Dict[str, int] = {}
+    with kernels.use(backend):
+        if mode == "sampled":
+            conflicts = check_conflicts_sampled(primary, others_c, buffer, time_step, broad_phase=broad_phase,
+                                                stats=stats, episodes=episodes)
+        elif mode == "analytic":
+            conflicts = check_conflicts_analytic(primary, others_c, buffer, broad_phase=broad_phase, stats=stats,
+                                                 episodes=episodes)
+        elif mode == "adaptive":
+            conflicts = check_conflicts_adaptive(primary, others_c, buffer, time_step, broad_phase=broad_phase,
+                                                 stats=stats)
+        else:
+            conflicts = check_conflicts_vectorized(primary, others_c, buffer, broad_phase=broad_phase, stats=stats,
+                                                   episodes=episodes)
+    return conflicts, stats, None
+
+def check_mission_parallel(primary_flight: Flight,
+                           other_flights: List[Flight],
+                           buffer: float,
+                           mode: str = "vectorized",
+                           time_step: float = 1.0,
+                           workers: Optional[int] = None,
+                           broad_phase: bool = True,
+                           stats: Optional[Dict[str, int]] = None,
+                           episodes: bool = False) -> list:
+    """
+    Check a mission with the other flights split across worker processes.
+    Returns the same conflicts in the same order as the single-process check.
+
+    :param primary_flight: the flight to be executed
+    :param other_flights: list of other flights in the airspace
+    :param buffer: minimum separation distance in meters
+    :param mode: "sampled", "analytic", "vectorized" or "adaptive"
+    :param time_step: time step for sampled mode
+    :param workers: number of processes (default: CPU count)
+    :param broad_phase: prune pairs with a space-time bounding box test before the exact checks
+    :param stats: optional dict updated with broad-phase pair counts summed over shards
+    :param episodes: return ConflictEpisode records instead of per-sample conflicts
+    :return: list of conflicts (or episodes)
+    """
+
+    # Imported here: multiprocessing adds ~20 ms to startup and most runs stay in-process
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    weights = np.array([len(compile_flight(f).times) for f in other_flights])
+    shards = _shard_bounds(weights, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        metrics = instrumentation.active()
+        futures = [executor.submit(_check_shard, primary_flight, pack_flights(other_flights[lo:hi]),
+                                   buffer, mode, time_step, broad_phase, episodes, metrics is not None,
+                                   kernels.get_backend())
+                   for lo, hi in shards]
+        results = [future.result() for future in futures]
+
+    for _, shard_stats, shard_metrics in results:
+        if stats is not None:
+            for key, value in shard_stats.items():
+                stats[key] = stats.get(key, 0) + value
+        if shard_metrics is not None:
+            metrics.merge(shard_metrics)
+
+    # Shards are contiguous, so concatenating keeps the per-flight order
+    conflicts = [c for shard, _, _ in results for c in shard]
+    if mode in ("sampled", "adaptive") and not episodes:
+        # Sampled conflicts are ordered by time first; ties keep flight order
+        conflicts.sort(key=lambda c: c.conflict_time)
+    return conflicts
+
+# Worker: sweep one time slab of the fleet
+def _sweep_slab(packed: PackedFlights,
+                members: np.ndarray,
+                buffer: float,
+                origin: float,
+                window: Tuple[float, float],
+                backend: Optional[str] = None) -> Tuple[np.ndarray, ...]:
+    with kernels.use(backend):
+        owner_a, owner_b, *rest = all_pairs_hits(unpack_flights(packed), buffer, origin, window)
+    return (members[owner_a], members[owner_b], *rest)
+
+def check_all_pairs_parallel(flights: List[Flight],
+                             buffer: float,
+                             workers: Optional[int] = None) -> Dict[Tuple[str, str], List[Conflict]]:
+    """
+    Fleet-wide check with the time axis split into slabs across worker processes.
+
+    Each slab gets the flights airborne during it and reports only segment pairs
+    whose common time window starts inside the slab, so every pair is solved
+    exactly once. Results match check_conflicts_all_pairs.
+
+    :param flights: list of Flight objects
+    :param buffer: minimum separation distance in meters
+    :param workers: number of processes (default: CPU count)
+    :return: dict mapping (flight1_id, flight2_id) to its conflicts
+    """
+
+    if len(flights) < 2:
+        return {}
+    workers = workers or os.cpu_count() or 1
+    from concurrent.futures import ProcessPoolExecutor
+
+    compiled = [compile_flight(f) for f in flights]
+    origin = min(c.start_epoch for c in compiled)
+    first = np.array([c.start_epoch - origin + c.times[0] for c in compiled])
+    last = np.array([c.start_epoch - origin + c.times[-1] for c in compiled])
+
+    # Slab edges at quantiles of flight start times balance the work
+    edges = np.unique(np.quantile(first, np.linspace(0, 1, workers + 1)[1:-1]))
+    edges = np.concatenate(([-np.inf], edges, [np.inf]))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for lo, hi in zip(edges[:-1], edges[1:]):
+            members = np.nonzero((last >= lo) & (first < hi))[0]
+            futures.append(executor.submit(_sweep_slab, pack_flights([compiled[k] for k in members]),
+                                           members, buffer, origin, (lo, hi), kernels.get_backend()))
+        results = [future.result() for future in futures]
+
+    hits = tuple(np.concatenate(column) for column in zip(*results))
+    return group_pair_hits(compiled, hits, origin)
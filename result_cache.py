@@ -0,0 +1,189 @@
+"""
+Memoized pairwise conflict results.
+
+Results are stored per (primary, other) flight pair under a key built from
+both flights' content hashes, their mission durations, the buffer and the
+check mode, so a resubmitted or refreshed flight pair is never solved twice:
+
+    cache = PairCache(max_entries=100_000, path="pairs.sqlite")
+    status, conflicts = check_mission(primary, others, buffer=10.0, mode="analytic", cache=cache)
+    cache.stats()  # {"hits": ..., "misses": ..., "evictions": ..., ...}
+"""
+import pickle
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import instrumentation
+from data_model import Flight, Conflict
+from trajectory import compile_flight, mission_duration
+from collision_check import check_conflicts_sampled, check_conflicts_analytic, check_conflicts_vectorized
+
+# Modes whose results are a union of independent per-pair results
+CACHED_MODES = ("sampled", "analytic", "vectorized")
+
+class PairCache:
+    """
+    Size-bounded LRU of per-pair conflict results, with an optional SQLite
+    tier on disk. The disk tier is written through on every store and keeps
+    entries evicted from memory, so results survive restarts.
+    """
+
+    def __init__(self,
+                 max_entries: int = 100_000,
+                 path: Optional[str] = None):
+        """
+        :param max_entries: largest number of pair results held in memory
+        :param path: SQLite file for the disk tier (default: memory only)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, list]" = OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS pairs (key BLOB PRIMARY KEY, value BLOB)")
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[list]:
+        """Cached result for a key, or None; a hit becomes the most recently used entry."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            instrumentation.count("pair_cache_hits")
+            return value
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM pairs WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value = pickle.loads(row[0])
+                self._remember(key, value)
+                self.disk_hits += 1
+                instrumentation.count("pair_cache_disk_hits")
+                return value
+        self.misses += 1
+        instrumentation.count("pair_cache_misses")
+        return None
+
+    def put(self, key: bytes, value: list):
+        """Store a result in memory and, if configured, on disk."""
+        self._remember(key, value)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO pairs VALUES (?, ?)", (key, pickle.dumps(value)))
+
+    # Function to add an entry to the in-memory LRU
+    def _remember(self, key: bytes, value: list):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            instrumentation.count("pair_cache_evictions")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counts and the number of entries in memory."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self._entries)}
+
+    def flush(self):
+        """Commit pending disk writes."""
+        if self._db is not None:
+            self._db.commit()
+
+    def clear(self):
+        """Drop every entry, on disk too, and reset the statistics."""
+        self._entries.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM pairs")
+            self._db.commit()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def close(self):
+        """Commit and close the disk tier."""
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+# Function to build the cache key of a flight pair
+def pair_key(primary: Flight,
+             other: Flight,
+             buffer: float,
+             mode: str,
+             time_step: float = 1.0) -> bytes:
+    """
+    :param primary: primary flight
+    :param other: other flight
+    :param buffer: minimum separation distance
+    :param mode: check_mission mode
+    :param time_step: time step, part of the key in sampled mode only
+    :return: key bytes
+    """
+    step = time_step if mode == "sampled" else 0.0
+    settings = f"{mode}|{buffer!r}|{step!r}|{mission_duration(primary)!r}|{mission_duration(other)!r}"
+    return compile_flight(primary).digest() + compile_flight(other).digest() + settings.encode()
+
+# Function to check a mission, solving only the pairs missing from the cache
+def check_conflicts_cached(primary: Flight,
+                           others: List[Flight],
+                           buffer: float,
+                           cache: PairCache,
+                           mode: str = "analytic",
+                           time_step: float = 1.0,
+                           broad_phase: bool = True,
+                           stats: Optional[Dict[str, int]] = None) -> List[Conflict]:
+    """
+    Same conflicts in the same order as the uncached check of the given mode,
+    reusing the cached result of every flight pair solved before. Other flights
+    must have distinct flight IDs.
+
+    :param primary: primary flight to check
+    :param others: list of other flights
+    :param buffer: minimum allowed separation distance
+    :param cache: PairCache to read and fill
+    :param mode: "sampled", "analytic" or "vectorized"
+    :param time_step: seconds between sampled positions
+    :param broad_phase: prune pairs with a space-time bounding box test before the exact checks
+    :param stats: optional dict updated with broad-phase pair counts of the solved pairs
+    :return: list of Conflict objects
+    """
+
+    if mode not in CACHED_MODES:
+        raise ValueError("Cached checks support 'sampled', 'analytic' and 'vectorized' modes")
+
+    keys = [pair_key(primary, other, buffer, mode, time_step) for other in others]
+    results: List[Optional[list]] = [cache.get(key) for key in keys]
+    missing = [k for k, result in enumerate(results) if result is None]
+
+    if missing:
+        solve = [others[k] for k in missing]
+        if mode == "sampled":
+            conflicts = check_conflicts_sampled(primary, solve, buffer, time_step, broad_phase=broad_phase, stats=stats)
+        elif mode == "analytic":
+            conflicts = check_conflicts_analytic(primary, solve, buffer, broad_phase=broad_phase, stats=stats)
+        else:
+            conflicts = check_conflicts_vectorized(primary, solve, buffer, broad_phase=broad_phase, stats=stats)
+
+        # Split the new conflicts by pair; values are plain tuples so they pickle compactly
+        solved: Dict[str, list] = {other.flight_id: [] for other in solve}
+        for c in conflicts:
+            solved[c.flight2_id].append((c.conflict_time, c.location, c.distance))
+        for k in missing:
+            results[k] = solved[others[k].flight_id]
+            cache.put(keys[k], results[k])
+        cache.flush()
+
+    merged: List[Tuple[float, int, Conflict]] = []
+    for k, (other, result) in enumerate(zip(others, results)):
+        for conflict_time, location, distance in result:
+            merged.append((conflict_time, k, Conflict(flight1_id=primary.flight_id, flight2_id=other.flight_id,
+                                                      conflict_time=conflict_time, location=location,
+                                                      distance=distance)))
+    # Sampled checks report by time, then flight; the analytic ones by flight
+    if mode == "sampled":
+        merged.sort(key=lambda item: (item[0], item[1]))
+    return [conflict for _, _, conflict in merged]
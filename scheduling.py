@@ -0,0 +1,231 @@
+"""
+Departure slot search.
+
+Delaying the primary flight by s seconds moves every primary segment in time
+but not in space. For a primary segment i and another segment j, with local
+times a in [0, L_i] and b in [0, L_j] since each segment's start, the
+separation is |C + v_i a - v_j b| and the delay at which the two points meet
+is s = (t0_j + b) - (t0_i + a). The (a, b) pairs closer than the buffer are
+a convex set, so the delays that conflict form one interval. Its ends are the
+extremes of s over that set, attained at a box corner, where a box edge
+crosses the buffer quadric, or where s is tangent to it. All of these come
+from quadratics solved in closed form, for every segment pair at once.
+"""
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from data_model import Flight, MissionWindow
+from broad_phase import SegmentGrid
+from fleet import FlightView
+from trajectory import CompiledFlight, compile_flight, mission_duration
+from collision_check import pack_segments
+
+# Function to solve |p + u x|^2 = r^2 for x, one equation per row
+def _sphere_roots(p: np.ndarray, u: np.ndarray, r2: float) -> Tuple[np.ndarray, np.ndarray]:
+    a = np.einsum("ij,ij->i", u, u)
+    b = np.einsum("ij,ij->i", p, u)
+    c = np.einsum("ij,ij->i", p, p) - r2
+    disc = b * b - a * c
+    with np.errstate(invalid="ignore", divide="ignore"):
+        root = np.sqrt(disc)
+        x1, x2 = (-b - root) / a, (-b + root) / a
+    # No crossing when the line misses the sphere or does not move
+    missing = (disc < 0) | (a <= 0)
+    x1[missing] = np.nan
+    x2[missing] = np.nan
+    return x1, x2
+
+# Function to compute conflicting delay intervals of segment pairs
+def shift_intervals(p_rel: np.ndarray,
+                    v1: np.ndarray,
+                    v2: np.ndarray,
+                    length1: np.ndarray,
+                    length2: np.ndarray,
+                    lag: np.ndarray,
+                    buffer: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Delays of segment 1 at which K segment pairs come closer than buffer.
+
+    :param p_rel: (K, 3) start of segment 1 minus start of segment 2
+    :param v1: (K, 3) velocities of segment 1
+    :param v2: (K, 3) velocities of segment 2
+    :param length1: (K,) durations of segment 1
+    :param length2: (K,) durations of segment 2
+    :param lag: (K,) start time of segment 2 minus start time of segment 1
+    :param buffer: minimum allowed separation distance
+    :return: (low, high) such that delays strictly between them conflict; NaN where no delay does
+    """
+    r2 = buffer * buffer
+    zeros = np.zeros_like(length1)
+    candidates = []  # (a, b) points on the boundary of the conflict set
+
+    # Corners of the time box that are within the buffer
+    for a, b in ((zeros, zeros), (length1, zeros), (zeros, length2), (length1, length2)):
+        d = p_rel + v1 * a[:, None] - v2 * b[:, None]
+        inside = np.einsum("ij,ij->i", d, d) <= r2
+        candidates.append((np.where(inside, a, np.nan), b))
+
+    # Edges of the time box crossing the buffer
+    for a in (zeros, length1):
+        for b in _sphere_roots(p_rel + v1 * a[:, None], -v2, r2):
+            candidates.append((a, np.where((b >= 0) & (b <= length2), b, np.nan)))
+    for b in (zeros, length2):
+        for a in _sphere_roots(p_rel - v2 * b[:, None], v1, r2):
+            candidates.append((np.where((a >= 0) & (a <= length1), a, np.nan), b))
+
+    # Points where the buffer ellipse is tangent to a line of constant delay
+    q11 = np.einsum("ij,ij->i", v1, v1)
+    q22 = np.einsum("ij,ij->i", v2, v2)
+    q12 = -np.einsum("ij,ij->i", v1, v2)
+    det = q11 * q22 - q12 * q12
+    g1 = np.einsum("ij,ij->i", v1, p_rel)
+    g2 = -np.einsum("ij,ij->i", v2, p_rel)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ellipse = det > 1e-12 * q11 * q22
+        det = np.where(ellipse, det, np.nan)
+        # Centre -Q^-1 g and direction Q^-1 c for c = (-1, 1)
+        ca, cb = -(q22 * g1 - q12 * g2) / det, -(q11 * g2 - q12 * g1) / det
+        da, db = (-q22 - q12) / det, (q12 + q11) / det
+        depth = -(ca * g1 + cb * g2) - (np.einsum("ij,ij->i", p_rel, p_rel) - r2)
+        scale = np.sqrt(depth / (db - da))
+    for sign in (-1.0, 1.0):
+        a, b = ca + sign * scale * da, cb + sign * scale * db
+        inside = (a >= 0) & (a <= length1) & (b >= 0) & (b <= length2)
+        candidates.append((np.where(inside, a, np.nan), b))
+
+    delays = np.stack([lag + b - a for a, b in candidates], axis=1)
+    found = ~np.all(np.isnan(delays), axis=1)
+    low, high = np.full(len(lag), np.nan), np.full(len(lag), np.nan)
+    low[found] = np.nanmin(delays[found], axis=1)
+    high[found] = np.nanmax(delays[found], axis=1)
+    return low, high
+
+# Function to compute the conflicting delay intervals of every segment pair
+def _pair_shifts(primary: Flight,
+                 others: List[Flight],
+                 buffer: float,
+                 min_delay: float,
+                 max_delay: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    origin = compile_flight(primary).start_epoch
+    _, _, i_t0, i_t1, i_p0, i_v, i_lo, i_hi = pack_segments([primary], origin, boxes=True)
+    j_own, _, j_t0, j_t1, j_p0, j_v, j_lo, j_hi = pack_segments(others, origin, boxes=True)
+    if len(i_t0) == 0 or len(j_t0) == 0:
+        return np.empty(0, dtype=int), np.empty(0), np.empty(0)
+
+    # Space-time index query with each primary segment spread over every delay in range
+    grid = SegmentGrid.for_boxes(j_t0, j_t1, j_lo, j_hi, margin=buffer)
+    grid.insert(j_t0, j_t1, j_lo, j_hi)
+    pi, pj = grid.query(i_t0 + min_delay, i_t1 + max_delay, i_lo, i_hi, margin=buffer)
+
+    low, high = shift_intervals(i_p0[pi] - j_p0[pj], i_v[pi], j_v[pj],
+                                i_t1[pi] - i_t0[pi], j_t1[pj] - j_t0[pj], j_t0[pj] - i_t0[pi], buffer)
+    keep = (high > low) & (high > min_delay) & (low < max_delay)
+    return j_own[pj][keep], low[keep], high[keep]
+
+# Function to merge open intervals
+def _merge(low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Union of open intervals (low, high) as sorted disjoint intervals. Intervals
+    that only touch stay apart, since their shared end point is not covered.
+    """
+    order = np.argsort(low, kind="stable")
+    low, high = low[order], high[order]
+    reach = np.maximum.accumulate(high)
+    start = np.ones(len(low), dtype=bool)
+    start[1:] = low[1:] >= reach[:-1]
+    first = np.flatnonzero(start)
+    return low[first], reach[np.append(first[1:] - 1, len(low) - 1)] if len(low) else reach
+
+# Function to find conflicting delays against each other flight
+def conflict_shifts(primary: Flight,
+                    others: List[Flight],
+                    buffer: float,
+                    min_delay: float = 0.0,
+                    max_delay: float = 3600.0) -> Dict[str, List[Tuple[float, float]]]:
+    """
+    Delays of the primary's departure that conflict with each other flight.
+
+    :param primary: candidate flight at its requested departure
+    :param others: list of other flights
+    :param buffer: minimum separation distance in meters
+    :param min_delay: earliest delay considered, in seconds (negative departs early)
+    :param max_delay: latest delay considered, in seconds
+    :return: dict mapping flight IDs to sorted, merged open intervals (low, high) of
+             conflicting delays, for flights that conflict at some delay in range
+    """
+    owner, low, high = _pair_shifts(primary, others, buffer, min_delay, max_delay)
+    if len(owner) == 0:
+        return {}
+    order = np.argsort(owner, kind="stable")
+    owner, low, high = owner[order], low[order], high[order]
+    bounds = np.flatnonzero(np.diff(owner)) + 1
+
+    shifts = {}
+    for k, lo, hi in zip(owner[np.concatenate(([0], bounds))], np.split(low, bounds), np.split(high, bounds)):
+        shifts[others[k].flight_id] = list(zip(*(v.tolist() for v in _merge(lo, hi))))
+    return shifts
+
+# Function to find every conflict-free departure window
+def safe_departure_windows(primary: Flight,
+                           others: List[Flight],
+                           buffer: float,
+                           min_delay: float = 0.0,
+                           max_delay: float = 3600.0,
+                           margin: float = 1e-6) -> List[Tuple[float, float]]:
+    """
+    Delays at which the primary flight is conflict-free against every other flight.
+
+    :param primary: candidate flight at its requested departure
+    :param others: list of other flights
+    :param buffer: minimum separation distance in meters
+    :param min_delay: earliest delay considered, in seconds
+    :param max_delay: latest delay considered, in seconds
+    :param margin: seconds kept clear of each conflicting interval, so a window's ends
+                   stay safe after rounding
+    :return: sorted closed windows (first, last) of safe delays, in seconds
+    """
+    _, low, high = _pair_shifts(primary, others, buffer, min_delay - margin, max_delay + margin)
+    low, high = _merge(low - margin, high + margin)
+
+    # Safe windows are the gaps between the conflicting intervals, clipped to the range
+    starts = np.concatenate(([min_delay], high))
+    ends = np.concatenate((low, [max_delay]))
+    starts, ends = np.maximum(starts, min_delay), np.minimum(ends, max_delay)
+    keep = (ends > starts) | ((ends == starts) & (min_delay == max_delay))
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+# Function to find the earliest conflict-free departure
+def earliest_departure(primary: Flight,
+                       others: List[Flight],
+                       buffer: float,
+                       min_delay: float = 0.0,
+                       max_delay: float = 3600.0) -> Optional[float]:
+    """
+    Smallest delay in [min_delay, max_delay] at which the primary is conflict-free.
+
+    :param primary: candidate flight at its requested departure
+    :param others: list of other flights
+    :param buffer: minimum separation distance in meters
+    :param min_delay: earliest delay considered, in seconds
+    :param max_delay: latest delay considered, in seconds
+    :return: delay in seconds, or None if every delay in range conflicts
+    """
+    windows = safe_departure_windows(primary, others, buffer, min_delay, max_delay)
+    return windows[0][0] if windows else None
+
+# Function to move a flight's departure
+def delay_flight(flight: Union[Flight, CompiledFlight], delay: float) -> Union[Flight, FlightView]:
+    """
+    Copy of a flight departing delay seconds later; waypoint time offsets are unchanged.
+
+    :param flight: Flight object (or a compiled flight or fleet view)
+    :param delay: seconds to add to the mission window
+    :return: Flight object, or a fleet view when given a compiled flight
+    """
+    if isinstance(flight, CompiledFlight):
+        # Views keep their arrays; only the mission window moves
+        return FlightView(flight.flight_id, flight.start_epoch + delay,
+                          flight.start_epoch + mission_duration(flight) + delay, flight.times, flight.positions)
+    shift = timedelta(seconds=delay)
+    window = MissionWindow(start=flight.mission_window.start + shift, end=flight.mission_window.end + shift)
+    return Flight(flight_id=flight.flight_id, waypoints=list(flight.waypoints), mission_window=window)
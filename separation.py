@@ -0,0 +1,242 @@
+"""
+Separation profiles: answer conflict queries for many buffers from one pass.
+
+The closest approach of every primary/other segment pair is solved once and
+kept sorted by distance. The conflicts at any buffer are then the prefix of
+that order closer than the buffer, found by binary search:
+
+    profile = SeparationProfile(primary, others)
+    profile.report([5, 10, 25, 50])
+    status, conflicts = profile.check(25.0)
+
+Amending the primary flight re-solves only the segments that changed:
+
+    profile, new_conflicts, resolved = recheck_amendment(old, new, others, buffer, profile)
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from data_model import Flight, Conflict
+from trajectory import CompiledFlight, compile_flight
+from collision_check import closest_approach_pairs, approach_conflicts, pack_segments, solve_segment_pairs
+
+# Function to key segments by their wall-clock endpoints
+def _segment_keys(compiled: CompiledFlight, index: np.ndarray) -> List[tuple]:
+    """
+    One hashable key per packed segment, equal for segments of two versions of
+    a flight that cover the same wall-clock interval between the same points.
+    """
+    times = compiled.start_epoch + compiled.times
+    return [(times[k], times[k + 1], *compiled.positions[k], *compiled.positions[k + 1]) for k in index.tolist()]
+
+class SeparationProfile:
+    """
+    Closest approach of every segment pair between a primary flight and the
+    other flights, sorted by distance.
+
+    check(buffer) gives the same conflicts as check_mission(mode="vectorized")
+    for every buffer up to max_buffer.
+    """
+
+    def __init__(self,
+                 primary: Flight,
+                 others: List[Flight],
+                 max_buffer: Optional[float] = None,
+                 chunk_size: int = 1_000_000):
+        """
+        :param primary: primary flight to check
+        :param others: list of other flights
+        :param max_buffer: largest buffer that will be queried; pairs never closer than this
+                           are pruned with the broad phase (default: keep every pair)
+        :param chunk_size: maximum number of segment pairs held in memory at once
+        """
+        self.primary = primary
+        self.others = others
+        self.max_buffer = np.inf if max_buffer is None else float(max_buffer)
+        self.chunk_size = chunk_size
+        compiled = compile_flight(primary)
+        primary_seg, other_seg, pi, pj, dist, t = closest_approach_pairs(
+            primary, others, self.max_buffer, chunk_size, broad_phase=max_buffer is not None)
+        self._store(compiled, primary_seg, other_seg, pi, pj, dist, t)
+
+    # Function to sort the solved pairs and index them for queries
+    def _store(self, compiled, primary_seg, other_seg, pi, pj, dist, t):
+        self._origin = compiled.start_epoch
+        self._primary_seg, self._other_seg = primary_seg, other_seg
+        self._keys = _segment_keys(compiled, primary_seg[1])
+
+        order = np.argsort(dist, kind="stable")
+        self.distances = dist[order]
+        self._pi, self._pj, self._t = pi[order], pj[order], t[order]
+
+        # Closest approach to each other flight, and the same values sorted for flight counts
+        owners = other_seg[0][self._pj]
+        self._flight_minimum = np.full(len(self.others), np.inf)
+        np.minimum.at(self._flight_minimum, owners, self.distances)
+        self._flight_sorted = np.sort(self._flight_minimum[np.isfinite(self._flight_minimum)])
+
+    def __len__(self) -> int:
+        return len(self.distances)
+
+    def _limit(self, buffer: float) -> int:
+        # Number of pairs closer than buffer
+        if buffer > self.max_buffer:
+            raise ValueError(f"Buffer {buffer} exceeds the profile's max_buffer {self.max_buffer}")
+        return int(np.searchsorted(self.distances, buffer, side="left"))
+
+    def conflicts(self, buffer: float) -> List[Conflict]:
+        """
+        Conflicts at a buffer, in the order check_conflicts_vectorized returns them.
+
+        :param buffer: minimum allowed separation distance
+        :return: list of Conflict objects
+        """
+        k = self._limit(buffer)
+        return approach_conflicts(self.primary, self.others, self._primary_seg, self._other_seg,
+                                  self._pi[:k], self._pj[:k], self.distances[:k], self._t[:k])
+
+    def check(self, buffer: float) -> Tuple[str, List[Conflict]]:
+        """Same as check_mission at this buffer: tuple (status, list of conflicts)."""
+        conflicts = self.conflicts(buffer)
+        return ("SAFE" if len(conflicts) == 0 else "CONFLICT"), conflicts
+
+    def count(self, buffers: Sequence[float]) -> np.ndarray:
+        """Number of conflicting segment pairs at each buffer."""
+        buffers = np.asarray(buffers, dtype=float)
+        if np.any(buffers > self.max_buffer):
+            raise ValueError(f"Buffers exceed the profile's max_buffer {self.max_buffer}")
+        return np.searchsorted(self.distances, buffers, side="left")
+
+    def flights_in_conflict(self, buffer: float) -> List[str]:
+        """IDs of the other flights that come closer than buffer, closest first."""
+        self._limit(buffer)
+        close = np.flatnonzero(self._flight_minimum < buffer)
+        return [self.others[j].flight_id for j in close[np.argsort(self._flight_minimum[close], kind="stable")]]
+
+    def minimum_separation(self) -> Dict[str, float]:
+        """Closest approach to each other flight that overlaps the primary in time (and is within max_buffer)."""
+        return {self.others[j].flight_id: float(d) for j, d in enumerate(self._flight_minimum) if np.isfinite(d)}
+
+    def histogram(self, bins=10, range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of segment-pair closest approaches, as numpy.histogram returns it.
+
+        :param bins: number of bins or bin edges
+        :param range: (low, high) of the bins (default: the range of the distances)
+        :return: tuple (counts, bin edges)
+        """
+        return np.histogram(self.distances, bins=bins, range=range)
+
+    def report(self, buffers: Sequence[float]) -> List[dict]:
+        """
+        Conflict summary at several buffers.
+
+        :param buffers: buffers to report on
+        :return: one dict per buffer with the buffer, status, number of conflicting
+                 segment pairs and number of conflicting flights
+        """
+        pairs = self.count(buffers)
+        flights = np.searchsorted(self._flight_sorted, np.asarray(buffers, dtype=float), side="left")
+        return [{"buffer": float(b), "status": "SAFE" if n == 0 else "CONFLICT",
+                 "conflicts": int(n), "flights": int(f)}
+                for b, n, f in zip(buffers, pairs, flights)]
+
+    def amend(self, flight: Flight) -> "SeparationProfile":
+        """
+        Profile of an amended version of the primary flight against the same
+        other flights. Segments whose wall-clock interval and endpoints are
+        unchanged keep their solved pairs; only the changed segments are solved,
+        and only against other segments in their time range.
+
+        :param flight: amended primary flight
+        :return: new SeparationProfile; this one is left unchanged
+        """
+        compiled = compile_flight(flight)
+        shift = self._origin - compiled.start_epoch
+        primary_seg = pack_segments([compiled], compiled.start_epoch, boxes=True)
+        other_seg = self._other_seg
+        if shift:
+            # Move the other segments onto the amended flight's timeline
+            other_seg = other_seg[:2] + (other_seg[2] + shift, other_seg[3] + shift) + other_seg[4:]
+
+        # Map unchanged segments to their rows in the amended flight
+        old_rows = {key: row for row, key in enumerate(self._keys)}
+        moved = np.full(len(self._keys), -1)
+        changed = []
+        for row, key in enumerate(_segment_keys(compiled, primary_seg[1])):
+            old = old_rows.get(key)
+            if old is None:
+                changed.append(row)
+            else:
+                moved[old] = row
+        changed = np.array(changed, dtype=int)
+
+        keep = moved[self._pi] >= 0
+        pi, pj = [moved[self._pi[keep]]], [self._pj[keep]]
+        dist, t = [self.distances[keep]], [self._t[keep] + shift]
+        if len(changed):
+            rows = tuple(column[changed] for column in primary_seg)
+            window = np.flatnonzero((other_seg[2] < rows[3].max()) & (other_seg[3] > rows[2].min()))
+            qi, qj, qd, qt = solve_segment_pairs(rows, tuple(column[window] for column in other_seg),
+                                                 self.max_buffer, self.chunk_size,
+                                                 broad_phase=bool(np.isfinite(self.max_buffer)))
+            pi.append(changed[qi])
+            pj.append(window[qj])
+            dist.append(qd)
+            t.append(qt)
+
+        profile = SeparationProfile.__new__(SeparationProfile)
+        profile.primary, profile.others = flight, self.others
+        profile.max_buffer, profile.chunk_size = self.max_buffer, self.chunk_size
+        profile._store(compiled, primary_seg, other_seg, np.concatenate(pi), np.concatenate(pj),
+                       np.concatenate(dist), np.concatenate(t))
+        return profile
+
+    def diff(self, amended: "SeparationProfile", buffer: float) -> Tuple[List[Conflict], List[Conflict]]:
+        """
+        Conflicts gained and lost at a buffer going from this profile to an amended one.
+
+        :param amended: profile returned by amend
+        :param buffer: minimum allowed separation distance
+        :return: tuple (new conflicts of the amended flight, conflicts of this flight that are resolved)
+        """
+        # A conflict is the same when it is with the same other segment, at the same
+        # wall-clock time and distance, even if it now comes from a different primary segment
+        def pairs(profile):
+            k = profile._limit(buffer)
+            times = np.round(profile._t[:k] + (profile._origin - self._origin), 6).tolist()
+            return list(zip(profile._pj[:k].tolist(), times, np.round(profile.distances[:k], 6).tolist()))
+
+        before, after = pairs(self), pairs(amended)
+        before_set, after_set = set(before), set(after)
+        gained = [k for k, p in enumerate(after) if p not in before_set]
+        lost = [k for k, p in enumerate(before) if p not in after_set]
+        return amended._subset(np.array(gained, dtype=int)), self._subset(np.array(lost, dtype=int))
+
+    # Function to build the conflicts of some of the sorted pairs
+    def _subset(self, rows: np.ndarray) -> List[Conflict]:
+        return approach_conflicts(self.primary, self.others, self._primary_seg, self._other_seg,
+                                  self._pi[rows], self._pj[rows], self.distances[rows], self._t[rows])
+
+# Function to re-check an amended mission
+def recheck_amendment(old: Flight,
+                      new: Flight,
+                      others: List[Flight],
+                      buffer: float,
+                      profile: Optional[SeparationProfile] = None) -> Tuple[SeparationProfile, List[Conflict],
+                                                                             List[Conflict]]:
+    """
+    Re-check a mission after an amendment, solving only the segments that changed.
+
+    :param old: flight as previously checked
+    :param new: amended flight
+    :param others: list of other flights
+    :param buffer: minimum separation distance in meters
+    :param profile: profile of old against others from a previous check (built here if None);
+                    keep the returned profile for the next amendment
+    :return: tuple (profile of new, conflicts introduced by the amendment, conflicts it resolved)
+    """
+    if profile is None:
+        profile = SeparationProfile(old, others, max_buffer=buffer)
+    amended = profile.amend(new)
+    added, resolved = profile.diff(amended, buffer)
+    return amended, added, resolved
@@ -0,0 +1,263 @@
+"""
+Local deconfliction service.
+
+Serves newline-delimited JSON over TCP. Each request is one line and gets one
+response line, echoing the request's "id" if it has one:
+
+    {"op": "check", "flight": {...}, "buffer": 10.0}  -> {"status": "SAFE", "conflicts": [...]}
+    {"op": "add", "flight": {...}}                    -> {"ok": true}
+    {"op": "remove", "flight_id": "F1"}               -> {"ok": true}
+    {"op": "stats"}                                   -> {"requests": ..., "p99_ms": ...}
+
+Flights use the mission_io.import_json layout. Run with
+
+    python service.py --port 8765 --load schedule.uavf
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from data_model import Flight, Conflict
+from airspace import Airspace
+from mission_io import pack_records, load_flights
+from trajectory import CompiledFlight, unpack_flights
+
+class DeconflictionService:
+    """
+    Asyncio front end to a shared Airspace.
+
+    Check requests arriving within batch_window seconds of each other are
+    coalesced into one Airspace.check_batch call. Adds and removes are applied
+    in arrival order between the checks. All airspace work runs on a
+    single-thread executor, so the event loop stays responsive and the
+    airspace is only touched by one thread.
+    """
+
+    def __init__(self,
+                 airspace: Optional[Airspace] = None,
+                 batch_window: float = 0.005,
+                 max_batch: int = 256,
+                 executor: Optional[Executor] = None,
+                 history: int = 10_000):
+        """
+        :param airspace: shared approved-flight state (default: empty Airspace)
+        :param batch_window: seconds to wait for more requests after the first of a batch
+        :param max_batch: largest number of requests handled in one batch
+        :param executor: executor for airspace work (default: one worker thread)
+        :param history: number of recent request latencies kept for percentiles
+        """
+        self.airspace = airspace if airspace is not None else Airspace()
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._executor = executor or ThreadPoolExecutor(max_workers=1)
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._latencies = deque(maxlen=history)
+        self.requests = 0
+        self.batches = 0
+
+    async def start(self):
+        """Start the batching worker on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching worker; requests still queued are cancelled."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()[2].cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def check(self, flight: Flight, buffer: float) -> Tuple[str, List[Conflict]]:
+        """
+        Check a flight against the approved flights.
+
+        :param flight: flight to be checked
+        :param buffer: minimum separation distance in meters
+        :return: tuple (status, list of conflicts), as Airspace.check returns
+        """
+        return await self._submit("check", flight, buffer)
+
+    async def add(self, flight: Flight):
+        """Approve a flight, adding it to the shared airspace."""
+        await self._submit("add", flight)
+
+    async def remove(self, flight_id: str):
+        """Withdraw a previously approved flight."""
+        await self._submit("remove", flight_id)
+
+    def latency_stats(self) -> Dict[str, float]:
+        """Request counts and latency percentiles in milliseconds over recent requests."""
+        stats = {"requests": self.requests, "batches": self.batches}
+        if self._latencies:
+            p50, p90, p99 = np.percentile(np.array(self._latencies) * 1e3, [50, 90, 99])
+            stats.update(p50_ms=float(p50), p90_ms=float(p90), p99_ms=float(p99))
+        return stats
+
+    async def _submit(self, op: str, *args):
+        if self._queue is None:
+            raise RuntimeError("Service is not started")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, args, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent submissions a moment to join the batch
+            await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            results = await loop.run_in_executor(self._executor, self._process, batch)
+
+            done = time.perf_counter()
+            self.batches += 1
+            for (_, _, future, submitted), result in zip(batch, results):
+                self.requests += 1
+                self._latencies.append(done - submitted)
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    # Function run on the executor: apply one batch to the airspace
+    def _process(self, batch: list) -> list:
+        results: list = [None] * len(batch)
+        pending: List[int] = []
+
+        def flush():
+            # Consecutive checks go to the airspace as one batched query
+            if not pending:
+                return
+            try:
+                outcomes = self.airspace.check_batch([batch[k][1][0] for k in pending],
+                                                     [batch[k][1][1] for k in pending])
+            except Exception as error:
+                outcomes = [error] * len(pending)
+            for k, outcome in zip(pending, outcomes):
+                results[k] = outcome
+            pending.clear()
+
+        for k, (op, args, _, _) in enumerate(batch):
+            if op == "check":
+                pending.append(k)
+                continue
+            flush()
+            try:
+                results[k] = getattr(self.airspace, op)(*args)
+            except Exception as error:
+                results[k] = error
+        flush()
+        return results
+
+# Function to decode a flight from a request
+def _decode_flight(record: dict) -> CompiledFlight:
+    return unpack_flights(pack_records([record]))[0]
+
+# Function to answer one request line
+async def _respond(service: DeconflictionService, line: bytes) -> dict:
+    try:
+        request = json.loads(line)
+    except ValueError as error:
+        return {"error": f"invalid JSON: {error}"}
+    if not isinstance(request, dict):
+        return {"error": "request must be a JSON object"}
+    response: dict
+    try:
+        op = request.get("op")
+        if op == "check":
+            status, conflicts = await service.check(_decode_flight(request["flight"]), float(request["buffer"]))
+            response = {"status": status, "conflicts": [asdict(c) for c in conflicts]}
+        elif op == "add":
+            await service.add(_decode_flight(request["flight"]))
+            response = {"ok": True}
+        elif op == "remove":
+            await service.remove(request["flight_id"])
+            response = {"ok": True}
+        elif op == "stats":
+            response = service.latency_stats()
+        else:
+            response = {"error": f"unknown op {op!r}"}
+    except KeyError as error:
+        response = {"error": f"missing or unknown key {error}"}
+    except (ValueError, TypeError) as error:
+        response = {"error": str(error)}
+    except Exception as error:
+        # Every line gets a reply, whatever went wrong decoding or answering it
+        response = {"error": f"{type(error).__name__}: {error}"}
+    if "id" in request:
+        response["id"] = request["id"]
+    return response
+
+async def _handle_connection(service: DeconflictionService,
+                             reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+    # Requests on one connection are answered concurrently, in completion order
+    async def answer(line: bytes):
+        writer.write(json.dumps(await _respond(service, line)).encode() + b"\n")
+
+    tasks = set()
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(service: DeconflictionService,
+                host: str = "127.0.0.1",
+                port: int = 8765) -> asyncio.AbstractServer:
+    """
+    Start the service and listen for requests.
+
+    :param service: DeconflictionService to answer requests with
+    :param host: interface to bind
+    :param port: TCP port (0 picks a free one)
+    :return: the asyncio server; close it and stop the service to shut down
+    """
+    await service.start()
+    return await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), host, port)
+
+async def _main(args):
+    airspace = Airspace()
+    if args.load:
+        for flight in load_flights(args.load):
+            airspace.add(flight)
+    service = DeconflictionService(airspace, batch_window=args.batch_window / 1e3)
+    server = await serve(service, args.host, args.port)
+    print(f"Serving {len(airspace)} approved flights on {args.host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local deconfliction service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--load", default=None, help="mission file of approved flights (mission_io format)")
+    parser.add_argument("--batch-window", type=float, default=5.0, help="request coalescing window in ms")
+    asyncio.run(_main(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
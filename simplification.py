@@ -0,0 +1,147 @@
+"""
+Error-bounded trajectory simplification.
+
+Dense tracks (GPS logs, planner output) are reduced with Douglas-Peucker over
+(x, y, z, t): a waypoint is dropped when the simplified track passes within
+the tolerance of it at the same time. Both tracks are linear between the
+original waypoints, so the simplified track is never further than the
+tolerance from the original one at any time, not only at the waypoints.
+
+Separation between simplified tracks can then be off by at most the sum of
+the two flights' deviations, so checking them with the buffer inflated by
+that sum is conservative: a SAFE result holds for the original tracks.
+
+    status, conflicts = check_mission(primary, others, buffer=10.0, mode="vectorized", tolerance=2.0)
+"""
+from typing import List, Tuple, Union
+import numpy as np
+from data_model import Flight
+from fleet import FlightView
+from trajectory import CompiledFlight, compile_flight, mission_duration
+
+# Function to run Douglas-Peucker over space and time on several tracks at once
+def _douglas_peucker(times: np.ndarray,
+                     positions: np.ndarray,
+                     keep: np.ndarray,
+                     tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Every range between two kept waypoints is split at its worst waypoint
+    until all are within the tolerance. All open ranges are handled in one
+    pass per level, so the cost is a few array passes per level instead of
+    per split. Marks kept waypoints in keep.
+
+    :return: tuple (first waypoint of each final range, its largest deviation)
+    """
+    anchors = np.flatnonzero(keep)
+    low, high = anchors[:-1], anchors[1:]
+    done_low, done_deviation = [low[high - low == 1]], [np.zeros(np.count_nonzero(high - low == 1))]
+    low, high = low[high - low > 1], high[high - low > 1]
+
+    while len(low):
+        # Interior waypoints of every open range; per-range values are expanded with repeat
+        lengths = high - low - 1
+        first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        k = np.arange(lengths.sum()) + np.repeat(low + 1 - first, lengths)
+
+        # Squared distance to the chord at the same time (synchronized Euclidean distance)
+        start, delta = positions[low], positions[high] - positions[low]
+        ratio = (times[k] - np.repeat(times[low], lengths)) / np.repeat(times[high] - times[low], lengths)
+        error = positions[k] - np.repeat(start, lengths, axis=0) - ratio[:, None] * np.repeat(delta, lengths, axis=0)
+        distance = np.einsum("ij,ij->i", error, error)
+
+        worst = np.maximum.reduceat(distance, first)
+        split = worst > tolerance * tolerance
+        done_low.append(low[~split])
+        done_deviation.append(np.sqrt(worst[~split]))
+
+        # First waypoint reaching the maximum of each range that is split
+        at_max = np.flatnonzero((distance == np.repeat(worst, lengths)) & np.repeat(split, lengths))
+        owner = np.searchsorted(first, at_max, side="right") - 1
+        ranges, index = np.unique(owner, return_index=True)
+        middle = k[at_max[index]]
+        keep[middle] = True
+        low = np.concatenate((low[ranges], middle))
+        high = np.concatenate((middle, high[ranges]))
+        order = np.argsort(low)
+        low, high = low[order], high[order]
+        low, high = low[high - low > 1], high[high - low > 1]
+    return np.concatenate(done_low), np.concatenate(done_deviation)
+
+# Function to mark the waypoints every simplification keeps
+def _anchors(times: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    # First and last waypoint of each track, and both ends of every zero-duration segment
+    keep = np.zeros(len(times), dtype=bool)
+    nonempty = np.flatnonzero(np.diff(offsets) > 0)
+    keep[offsets[nonempty]] = keep[offsets[nonempty + 1] - 1] = True
+    jumps = np.flatnonzero(times[1:] == times[:-1])
+    keep[jumps] = keep[jumps + 1] = True
+    return keep
+
+# Function to pick the waypoints kept by Douglas-Peucker over space and time
+def simplify_path(times: np.ndarray,
+                  positions: np.ndarray,
+                  tolerance: float) -> Tuple[np.ndarray, float]:
+    """
+    Douglas-Peucker with the deviation measured at equal times (synchronized
+    Euclidean distance). The first and last waypoints and both ends of every
+    zero-duration segment are always kept.
+
+    :param times: (N,) non-decreasing waypoint times
+    :param positions: (N, 3) waypoint positions
+    :param tolerance: largest allowed deviation from the original track
+    :return: tuple (sorted indices of the kept waypoints, largest deviation of the simplified track)
+    """
+    if tolerance < 0:
+        raise ValueError("Tolerance must be non-negative")
+    if len(times) == 0:
+        return np.arange(0), 0.0
+    keep = _anchors(times, np.array([0, len(times)]))
+    _, deviation = _douglas_peucker(times, positions, keep, tolerance)
+    return np.flatnonzero(keep), float(deviation.max(initial=0.0))
+
+# Function to simplify one flight
+def simplify_flight(flight: Union[Flight, CompiledFlight],
+                    tolerance: float) -> Tuple[FlightView, float]:
+    """
+    :param flight: Flight object (or a compiled flight or fleet view)
+    :param tolerance: largest allowed position deviation in meters
+    :return: tuple (simplified flight with the same ID and mission window, its largest deviation)
+    """
+    simplified, deviations = simplify_flights([flight], tolerance)
+    return simplified[0], float(deviations[0])
+
+# Function to simplify many flights
+def simplify_flights(flights: List[Union[Flight, CompiledFlight]],
+                     tolerance: float) -> Tuple[List[FlightView], np.ndarray]:
+    """
+    Simplify several flights together, in one pass per split level.
+
+    :param flights: list of Flight objects
+    :param tolerance: largest allowed position deviation in meters
+    :return: tuple (simplified flights, (F,) largest deviation of each)
+    """
+    if tolerance < 0:
+        raise ValueError("Tolerance must be non-negative")
+    compiled = [compile_flight(f) for f in flights]
+    counts = [len(c.times) for c in compiled]
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    deviations = np.zeros(len(flights))
+    if offsets[-1] == 0:
+        return [_view(f, c, c.times, c.positions) for f, c in zip(flights, compiled)], deviations
+
+    times = np.concatenate([c.times for c in compiled])
+    positions = np.concatenate([c.positions for c in compiled])
+    keep = _anchors(times, offsets)
+    low, deviation = _douglas_peucker(times, positions, keep, tolerance)
+    np.maximum.at(deviations, np.searchsorted(offsets, low, side="right") - 1, deviation)
+
+    simplified = []
+    for k, (flight, c) in enumerate(zip(flights, compiled)):
+        kept = np.flatnonzero(keep[offsets[k]:offsets[k + 1]])
+        simplified.append(_view(flight, c, c.times[kept], c.positions[kept]))
+    return simplified, deviations
+
+# Function to wrap simplified waypoints as a fleet view with the flight's mission window
+def _view(flight, compiled: CompiledFlight, times: np.ndarray, positions: np.ndarray) -> FlightView:
+    return FlightView(compiled.flight_id, compiled.start_epoch, compiled.start_epoch + mission_duration(flight),
+                      times, positions)
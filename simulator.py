@@ -1,7 +1,9 @@
 import random
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
 from data_model import Flight, Waypoint, MissionWindow
+from fleet import Fleet
 
 # Function to generate random flight
 def generate_random_flight(flight_id: str,
@@ -11,7 +13,8 @@ def generate_random_flight(flight_id: str,
                            z_range=(0, 20),
                            start_time: datetime = None,
                            duration: float = 300,
-                           mode: str = "3d") -> Flight:
+                           mode: str = "3d",
+                           rng: Optional[random.Random] = None) -> Flight:
     """
     Generate a random flight in 2D or 3D.
     
@@ -23,9 +26,12 @@ def generate_random_flight(flight_id: str,
     :param start_time: mission start datetime
     :param duration: total mission duration in seconds
     :param mode: "2d" for 2D flight (z=0), "3d" for 3D flight
+    :param rng: random.Random to draw from, for reproducible flights (default: the random module)
     :return: Flight object
     """
     
+    rng = rng or random
+
     # Initialize start time
     if start_time is None:
         start_time = datetime.now()
@@ -37,9 +43,9 @@ def generate_random_flight(flight_id: str,
     # Store waypoints details based on dimension
     waypoints = []
     for i in range(num_waypoints):
-        x = random.uniform(*x_range)
-        y = random.uniform(*y_range)
-        z = 0 if mode == "2d" else random.uniform(*z_range)
+        x = rng.uniform(*x_range)
+        y = rng.uniform(*y_range)
+        z = 0 if mode == "2d" else rng.uniform(*z_range)
         # Calculate time for each waypoint
         time_offset = i * (duration / (num_waypoints - 1))
         waypoints.append(Waypoint(x=x, y=y, z=z, time_offset=time_offset))
@@ -78,20 +84,151 @@ def generate_handcoded_flight(flight_id: str,
 
 # Function to generate a flight scenario
 def generate_flight_scenario(num_flights: int = 3, 
-                             start_time: datetime = None) -> List[Flight]:
+                             start_time: datetime = None,
+                             seed: Optional[int] = None) -> List[Flight]:
     """
     Generate a scenario with multiple flights for testing.
     
     :param num_flights: number of flights to generate
     :param start_time: common start time
+    :param seed: seed for a reproducible scenario (default: the random module's state)
     :return: list of Flight objects
     """
     
+    rng = random.Random(seed) if seed is not None else None
+
     # List to store info of all flights
     flights = []
     for i in range(num_flights):
         # Generate random flight and store info
-        flight = generate_random_flight(f"Flight_{i+1}", start_time=start_time)
+        flight = generate_random_flight(f"Flight_{i+1}", start_time=start_time, rng=rng)
         flights.append(flight)
     
-    return flights
\ No newline at end of file
+    return flights
+
+# Function to generate waypoints along random corridors
+def _corridor_waypoints(rng: np.random.Generator, num_flights: int, num_waypoints: int,
+                        x_range, y_range, corridors: int, corridor_width: float) -> np.ndarray:
+    # Each corridor joins two random points; flights fly it either way with lateral scatter
+    ends = rng.uniform((x_range[0], y_range[0]), (x_range[1], y_range[1]), size=(corridors, 2, 2))
+    lane = rng.integers(corridors, size=num_flights)
+    a, b = ends[lane, 0], ends[lane, 1]
+    reverse = rng.random(num_flights) < 0.5
+    a[reverse], b[reverse] = b[reverse], a[reverse].copy()
+    along = b - a
+    normal = np.stack((-along[:, 1], along[:, 0]), axis=1) / np.maximum(np.linalg.norm(along, axis=1), 1e-9)[:, None]
+    progress = np.linspace(0.0, 1.0, num_waypoints)
+    scatter = rng.uniform(-corridor_width / 2, corridor_width / 2, size=(num_flights, 1))
+    return a[:, None] + progress[None, :, None] * along[:, None] + scatter[:, :, None] * normal[:, None]
+
+# Function to generate out-and-back waypoints from depots
+def _hub_waypoints(rng: np.random.Generator, num_flights: int, num_waypoints: int,
+                   x_range, y_range, hubs: int, hub_radius: float) -> np.ndarray:
+    # Flights leave a depot, visit points within hub_radius and return to the same depot
+    depots = rng.uniform((x_range[0], y_range[0]), (x_range[1], y_range[1]), size=(hubs, 2))
+    home = depots[rng.integers(hubs, size=num_flights)]
+    angle = rng.uniform(0, 2 * np.pi, size=(num_flights, num_waypoints))
+    radius = hub_radius * np.sqrt(rng.random((num_flights, num_waypoints)))
+    xy = home[:, None] + radius[..., None] * np.stack((np.cos(angle), np.sin(angle)), axis=-1)
+    xy[:, 0] = xy[:, -1] = home
+    return xy
+
+# Function to generate a large seeded scenario as a Fleet
+def generate_fleet(num_flights: int,
+                   num_waypoints: int = 5,
+                   seed: Union[int, np.random.Generator, None] = None,
+                   pattern: str = "uniform",
+                   x_range: Tuple[float, float] = (0, 100),
+                   y_range: Tuple[float, float] = (0, 100),
+                   z_range: Tuple[float, float] = (0, 20),
+                   altitude_layers: Optional[Sequence[float]] = None,
+                   start_time: datetime = None,
+                   start_spread: float = 0.0,
+                   duration: Union[float, Tuple[float, float]] = 300,
+                   corridors: int = 4,
+                   corridor_width: float = 20.0,
+                   hubs: int = 3,
+                   hub_radius: float = 30.0,
+                   conflict_rate: float = 0.0,
+                   flight_prefix: str = "F",
+                   dtype=np.float64) -> Fleet:
+    """
+    Generate a reproducible scenario of many flights directly as a Fleet,
+    drawing every waypoint in a few vectorized numpy.random.Generator calls.
+    
+    :param num_flights: number of flights to generate
+    :param num_waypoints: waypoints per flight (at least 2), evenly spaced in time
+    :param seed: integer seed or numpy Generator; the same seed gives the same fleet
+    :param pattern: "uniform" (waypoints anywhere in the area), "corridor" (along shared
+                    straight corridors, either direction) or "hub" (out and back from depots)
+    :param x_range: min/max X coordinates of the area
+    :param y_range: min/max Y coordinates of the area
+    :param z_range: min/max altitude when no altitude layers are given
+    :param altitude_layers: flight levels; each flight cruises at one of them
+    :param start_time: earliest mission start datetime
+    :param start_spread: starts are staggered uniformly over this many seconds
+    :param duration: mission duration in seconds, or (min, max) to draw per flight
+    :param corridors: number of corridors for the "corridor" pattern
+    :param corridor_width: lateral spread of flights in a corridor, in meters
+    :param hubs: number of depots for the "hub" pattern
+    :param hub_radius: distance from its depot a "hub" flight ranges, in meters
+    :param conflict_rate: fraction of flights moved so that one waypoint meets another
+                          flight's position at the same time; raises conflict density
+    :param flight_prefix: flight IDs are the prefix followed by the flight number
+    :param dtype: column dtype of the Fleet
+    :return: Fleet
+    """
+
+    if num_waypoints < 2:
+        raise ValueError("Flights need at least 2 waypoints")
+    rng = np.random.default_rng(seed)
+    if start_time is None:
+        start_time = datetime.now()
+    n, w = num_flights, num_waypoints
+
+    # Horizontal route
+    if pattern == "uniform":
+        xy = rng.uniform((x_range[0], y_range[0]), (x_range[1], y_range[1]), size=(n, w, 2))
+    elif pattern == "corridor":
+        xy = _corridor_waypoints(rng, n, w, x_range, y_range, corridors, corridor_width)
+    elif pattern == "hub":
+        xy = _hub_waypoints(rng, n, w, x_range, y_range, hubs, hub_radius)
+    else:
+        raise ValueError("Pattern must be 'uniform', 'corridor' or 'hub'")
+
+    # Altitude: one layer per flight, or drawn per waypoint
+    if altitude_layers is not None:
+        z = np.repeat(rng.choice(np.asarray(altitude_layers, dtype=float), size=n)[:, None], w, axis=1)
+    else:
+        z = rng.uniform(*z_range, size=(n, w))
+    positions = np.concatenate((xy, z[..., None]), axis=2)
+
+    # Timing
+    durations = (rng.uniform(*duration, size=n) if isinstance(duration, tuple)
+                 else np.full(n, float(duration)))
+    times = durations[:, None] * np.linspace(0.0, 1.0, w)[None, :]
+    starts = start_time.timestamp() + rng.uniform(0.0, start_spread, size=n)
+
+    # Encounters: re-time a flight so one of its waypoints meets another flight's position
+    moving = rng.random(n) < conflict_rate
+    movers, fixed = np.flatnonzero(moving), np.flatnonzero(~moving)
+    if len(movers) and len(fixed):
+        # Partners are flights that keep their own timing, so every encounter holds
+        partners = fixed[rng.integers(len(fixed), size=len(movers))]
+        waypoint = rng.integers(w, size=len(movers))
+        tau = rng.random(len(movers)) * durations[partners]
+        # Partner position at tau, interpolated on its evenly spaced waypoints
+        where = tau / durations[partners] * (w - 1)
+        seg = np.minimum(where.astype(int), w - 2)
+        frac = (where - seg)[:, None]
+        meet = (1 - frac) * positions[partners, seg] + frac * positions[partners, seg + 1]
+        starts[movers] = starts[partners] + tau - times[movers, waypoint]
+        positions[movers, waypoint] = meet
+
+    return Fleet(flight_ids=[f"{flight_prefix}{i}" for i in range(n)],
+                 start_epochs=starts,
+                 offsets=np.arange(n + 1) * w,
+                 times=times.ravel(),
+                 positions=positions.reshape(-1, 3),
+                 end_epochs=starts + durations,
+                 dtype=dtype)
@@ -0,0 +1,51 @@
+# tests/test_airspace.py
+import random
+import pytest
+from datetime import datetime, timedelta
+from airspace import Airspace
+from simulator import generate_handcoded_flight, generate_random_flight
+from cli_api import check_mission
+
+def test_airspace_add_check_remove():
+    """Approved flights are checked incrementally and can be withdrawn."""
+    start = datetime.now()
+    airspace = Airspace(cell_size=20.0, time_slice=5.0)
+    airspace.add(generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10))
+    airspace.add(generate_handcoded_flight("F3", [(100,100,0), (110,100,0)], start, 10))
+    candidate = generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10)
+
+    stats = {}
+    status, conflicts = airspace.check(candidate, buffer=2.0, stats=stats)
+    assert status == "CONFLICT"
+    assert [c.flight2_id for c in conflicts] == ["F2"]
+    assert conflicts[0].conflict_time == pytest.approx(5.0)
+    assert stats["pairs_pruned"] == 1
+
+    airspace.remove("F2")
+    assert "F2" not in airspace and len(airspace) == 1
+    status, conflicts = airspace.check(candidate, buffer=2.0)
+    assert status == "SAFE"
+
+def test_airspace_uses_wall_clock_time():
+    """Flights at the same place but different times do not conflict."""
+    start = datetime.now()
+    airspace = Airspace()
+    airspace.add(generate_handcoded_flight("F2", [(0,0,0), (10,0,0)], start + timedelta(seconds=20), 10))
+    candidate = generate_handcoded_flight("F1", [(0,0,0), (10,0,0)], start, 10)
+    assert airspace.check(candidate, buffer=5.0)[0] == "SAFE"
+    with pytest.raises(ValueError):
+        airspace.add(generate_handcoded_flight("F2", [(0,0,0), (10,0,0)], start, 10))
+
+def test_airspace_matches_check_mission():
+    """With a common start time the airspace agrees with the vectorized engine."""
+    random.seed(11)
+    start = datetime.now()
+    flights = [generate_random_flight(f"F{i}", num_waypoints=6, start_time=start) for i in range(30)]
+    airspace = Airspace(cell_size=25.0, time_slice=30.0)
+    for flight in flights[1:]:
+        airspace.add(flight)
+    _, expected = check_mission(flights[0], flights[1:], buffer=10.0, mode="vectorized")
+    _, actual = airspace.check(flights[0], buffer=10.0)
+    assert len(expected) > 0
+    assert [(c.flight2_id, c.conflict_time, c.distance) for c in actual] == pytest.approx(
+        [(c.flight2_id, c.conflict_time, c.distance) for c in expected])
@@ -0,0 +1,95 @@
+# tests/test_broad_phase.py
+import numpy as np
+from datetime import datetime, timedelta
+from broad_phase import SegmentGrid
+from simulator import generate_handcoded_flight
+from cli_api import check_mission
+
+def test_grid_query_matches_brute_force():
+    """Grid candidates are exactly the pairs whose inflated boxes overlap."""
+    rng = np.random.default_rng(0)
+    lo = rng.uniform(0, 1000, (400, 3))
+    hi = lo + rng.uniform(0, 50, (400, 3))
+    t0 = rng.uniform(0, 600, 400)
+    t1 = t0 + rng.uniform(1, 60, 400)
+    grid = SegmentGrid(cell_size=40.0, time_slice=30.0)
+    grid.insert(t0[:300], t1[:300], lo[:300], hi[:300])
+
+    q, s = grid.query(t0[300:], t1[300:], lo[300:], hi[300:], margin=10.0)
+    expected = [(a, b) for a in range(100) for b in range(300)
+                if t0[b] <= t1[300 + a] and t0[300 + a] <= t1[b]
+                and np.all(lo[b] <= hi[300 + a] + 10) and np.all(lo[300 + a] - 10 <= hi[b])]
+    assert list(zip(q.tolist(), s.tolist())) == expected
+    assert grid.stats["pairs_pruned"] == 100 * 300 - len(expected)
+
+def test_grid_remove():
+    """Removed boxes are no longer returned."""
+    grid = SegmentGrid(cell_size=10.0, time_slice=10.0)
+    slots = grid.insert(np.array([0.0, 0.0]), np.array([5.0, 5.0]),
+                        np.zeros((2, 3)), np.ones((2, 3)))
+    grid.remove(slots[:1])
+    q, s = grid.query(np.array([0.0]), np.array([5.0]), np.zeros((1, 3)), np.ones((1, 3)))
+    assert s.tolist() == [slots[1]]
+    assert len(grid) == 1
+
+    # Once removed entries outnumber live boxes they are compacted and their slots reused
+    grid.remove(slots[1:])
+    assert sum(len(keys) for keys, _ in grid._runs) == 0
+    again = grid.insert(np.array([0.0]), np.array([5.0]), np.zeros((1, 3)), np.ones((1, 3)))
+    assert again[0] in slots.tolist()
+    assert grid.query(np.array([0.0]), np.array([5.0]), np.zeros((1, 3)), np.ones((1, 3)))[1].tolist() == [again[0]]
+
+def test_grid_huge_boxes_are_oversize():
+    """Boxes whose cell count overflows int64 fall back to the oversize list."""
+    grid = SegmentGrid(cell_size=1e-3, time_slice=1e-6)
+    slots = grid.insert(np.array([0.0, 0.0]), np.array([1e6, 1.0]),
+                        np.array([[-1e9] * 3, [0.0] * 3]), np.array([[1e9] * 3, [0.0] * 3]))
+    q, s = grid.query(np.array([0.5]), np.array([0.5]), np.zeros((1, 3)), np.zeros((1, 3)))
+    assert sorted(s.tolist()) == sorted(slots.tolist())
+
+def test_broad_phase_reports_pruned_pairs():
+    """Far-away flights are pruned without changing the result."""
+    start = datetime.now()
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10)
+    flight2 = generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10)
+    flight3 = generate_handcoded_flight("F3", [(500,500,0), (510,500,0)], start, 10)
+    for mode in ("sampled", "analytic", "vectorized"):
+        stats = {}
+        status, conflicts = check_mission(flight1, [flight2, flight3], buffer=2.0, mode=mode, stats=stats)
+        assert status == "CONFLICT"
+        assert {c.flight2_id for c in conflicts} == {"F2"}
+        assert stats == {"pairs_total": 2, "pairs_candidate": 1, "pairs_pruned": 1}
+
+    # The index covers wall-clock time, so a later flight is pruned too
+    flight4 = generate_handcoded_flight("F4", [(0,0,0), (10,10,0)], start + timedelta(hours=2), 10)
+    for mode in ("sampled", "analytic", "vectorized"):
+        stats = {}
+        status, _ = check_mission(flight1, [flight4], buffer=2.0, mode=mode, stats=stats)
+        assert status == "SAFE"
+        assert stats["pairs_pruned"] == 1
+
+def test_candidate_pairs_match_brute_force():
+    """The per-primary broad phase keeps exactly the pairs whose inflated boxes share an instant."""
+    import random
+    from simulator import generate_random_flight
+    from collision_check import _candidate_pairs, pack_segments
+    random.seed(4)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    flights = [generate_random_flight(f"F{i}", num_waypoints=8, x_range=(0, 400), y_range=(0, 400),
+                                      start_time=start + timedelta(seconds=random.uniform(0, 60)), duration=120)
+               for i in range(60)]
+    # Waypoint times 0, 100, 20, 60 give a primary whose segments are out of time order
+    shuffled = generate_handcoded_flight("S", [(0,0,0), (200,200,0), (400,0,0), (300,300,0)], start, 120)
+    for waypoint, t in zip(shuffled.waypoints, (0.0, 100.0, 20.0, 60.0)):
+        waypoint.time_offset = t
+    for primary in (flights[0], shuffled):
+        primary_seg = pack_segments([primary], 0.0, boxes=True)
+        other_seg = pack_segments(flights[1:], 0.0, boxes=True)
+        _, _, i_t0, i_t1, _, _, i_lo, i_hi = primary_seg
+        _, _, j_t0, j_t1, _, _, j_lo, j_hi = other_seg
+        expected = [(i, j) for i in range(len(i_t0)) for j in range(len(j_t0))
+                    if j_t0[j] <= i_t1[i] and i_t0[i] <= j_t1[j]
+                    and np.all(j_lo[j] <= i_hi[i] + 15.0) and np.all(i_lo[i] - 15.0 <= j_hi[j])]
+        pi, pj = _candidate_pairs(primary_seg, other_seg, 15.0)
+        assert len(expected) > 0
+        assert list(zip(pi.tolist(), pj.tolist())) == expected
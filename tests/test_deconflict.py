@@ -0,0 +1,68 @@
+# tests/test_deconflict.py
+import csv
+import json
+import subprocess
+import sys
+import pytest
+from datetime import datetime
+from simulator import generate_handcoded_flight, generate_fleet
+from mission_io import save_flights
+from cli_api import check_mission
+import deconflict
+
+def _write_missions(tmp_path):
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    flights = [generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10),
+               generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10),
+               generate_handcoded_flight("F3", [(100,100,0), (110,100,0)], start, 10)]
+    save_flights(str(tmp_path / "approved.uavf"), flights[1:2])
+    save_flights(str(tmp_path / "missions.uavf"), flights[:1] + flights[2:])
+    return flights
+
+def test_batch_check_writes_json_and_csv(tmp_path):
+    """Missions are checked against the airspace file and written as JSON or CSV."""
+    flights = _write_missions(tmp_path)
+    args = [str(tmp_path / "missions.uavf"), "--airspace", str(tmp_path / "approved.uavf"), "--buffer", "2"]
+    assert deconflict.main(args + ["-o", str(tmp_path / "out.json")]) == 1
+
+    results = json.loads((tmp_path / "out.json").read_text())
+    _, expected = check_mission(flights[0], flights[1:2], 2.0, mode="vectorized")
+    assert [r["status"] for r in results] == ["CONFLICT", "SAFE"]
+    assert [c["conflict_time"] for c in results[0]["conflicts"]] == [c.conflict_time for c in expected]
+
+    assert deconflict.main(args + ["-o", str(tmp_path / "out.csv"), "--episodes"]) == 1
+    with open(tmp_path / "out.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["flight_id"], r["flight2_id"]) for r in rows] == [("F1", "F2"), ("F3", "")]
+
+    assert deconflict.main([str(tmp_path / "approved.uavf"), "-o", str(tmp_path / "safe.json")]) == 0
+
+@pytest.mark.parametrize("tolerance", [0.0, 2.0])
+def test_batch_without_airspace_matches_per_mission_checks(tolerance):
+    """The all-pairs sweep gives each mission the conflicts check_mission finds against the others."""
+    missions = list(generate_fleet(40, num_waypoints=6, seed=2, x_range=(0, 1000), y_range=(0, 1000),
+                                   start_time=datetime(2025, 1, 1), start_spread=300, conflict_rate=0.3))
+    results = deconflict.check_batch(missions, None, 10.0, tolerance=tolerance)
+    assert any(status == "CONFLICT" for _, status, _ in results)
+    for k, (flight_id, status, conflicts) in enumerate(results):
+        assert flight_id == missions[k].flight_id
+        if tolerance:
+            # Simplified tracks never hide a conflict of the original ones
+            found = {c.flight2_id for c in check_mission(missions[k], missions[:k] + missions[k + 1:], 10.0,
+                                                         mode="vectorized")[1]}
+            assert found <= {c.flight2_id for c in conflicts}
+            continue
+        _, expected = check_mission(missions[k], missions[:k] + missions[k + 1:], 10.0, mode="vectorized")
+        assert [c.flight2_id for c in conflicts] == [c.flight2_id for c in expected]
+        assert [c.conflict_time for c in conflicts] == pytest.approx([c.conflict_time for c in expected], abs=1e-6)
+        assert [c.distance for c in conflicts] == pytest.approx([c.distance for c in expected])
+        for c, e in zip(conflicts, expected):
+            assert c.location == pytest.approx(e.location, abs=1e-4)
+
+def test_headless_run_does_not_import_matplotlib(tmp_path):
+    """A batch run without plotting never loads matplotlib."""
+    _write_missions(tmp_path)
+    code = ("import sys, deconflict; "
+            f"deconflict.main([{str(tmp_path / 'missions.uavf')!r}, '-o', {str(tmp_path / 'out.json')!r}]); "
+            "sys.exit('matplotlib' in sys.modules)")
+    assert subprocess.run([sys.executable, "-c", code], cwd=deconflict.__file__.rsplit("/", 1)[0]).returncode == 0
@@ -70,6 +70,24 @@ def test_non_overlapping_time_windows():
     assert status == "SAFE"
     assert len(conflicts) == 0
 
+def test_mixed_start_times_all_modes():
+    """Every mode aligns flights on wall-clock time, whatever their mission start."""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (10,0,0)], start, 10)
+    # Same path 20 s later never meets F1; the crossing flight starts 3 s later and meets it at (6, 0)
+    later = generate_handcoded_flight("F2", [(0,0,0), (10,0,0)], start + timedelta(seconds=20), 10)
+    crossing = generate_handcoded_flight("F3", [(6,-3,0), (6,7,0)], start + timedelta(seconds=3), 10)
+    for mode in ("sampled", "analytic", "vectorized", "adaptive"):
+        assert check_mission(flight1, [later], buffer=5.0, mode=mode)[0] == "SAFE"
+        status, conflicts = check_mission(flight1, [crossing], buffer=0.5, mode=mode)
+        assert status == "CONFLICT"
+        # Adaptive samples are only guaranteed to land inside the 0.5 m buffer
+        tolerance = 0.5 if mode == "adaptive" else 1e-6
+        assert min(conflicts, key=lambda c: c.distance).conflict_time == pytest.approx(6.0, abs=tolerance)
+    for mode in ("analytic", "vectorized"):
+        episode, = check_mission(flight1, [crossing], buffer=0.5, mode=mode, episodes=True)[1]
+        assert episode.min_time == pytest.approx(6.0) and episode.min_distance == pytest.approx(0.0, abs=1e-9)
+
 def test_missing_time_offsets():
     """Waypoints without explicit time offsets are handled correctly."""
     start = datetime.now()
@@ -99,4 +117,168 @@ def test_altitude_only_conflict():
     flight2 = generate_handcoded_flight("F2", [(0,0,1), (10,0,1)], start, 10)
     status, conflicts = check_mission(flight1, [flight2], buffer=2.0, mode="sampled")
     assert status == "CONFLICT"
-    assert len(conflicts) > 0
\ No newline at end of file
+    assert len(conflicts) > 0
+
+# ------------------- VECTORIZED ENGINE -------------------
+
+def test_vectorized_matches_analytic():
+    """The batched analytic engine returns the same conflicts as the scalar one."""
+    import random
+    from simulator import generate_random_flight
+    random.seed(7)
+    start = datetime.now()
+    flights = [generate_random_flight(f"F{i}", num_waypoints=6, start_time=start) for i in range(12)]
+    _, expected = check_mission(flights[0], flights[1:], buffer=15.0, mode="analytic")
+    _, actual = check_mission(flights[0], flights[1:], buffer=15.0, mode="vectorized")
+    assert len(expected) > 0
+    assert [c.flight2_id for c in actual] == [c.flight2_id for c in expected]
+    for a, e in zip(actual, expected):
+        assert a.flight2_id == e.flight2_id
+        assert a.conflict_time == pytest.approx(e.conflict_time)
+        assert a.distance == pytest.approx(e.distance)
+        assert a.location == pytest.approx(e.location, abs=1e-4)
+
+def test_vectorized_conflict_and_safe():
+    """Crossing flights conflict and parallel distant flights are SAFE."""
+    start = datetime.now()
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10)
+    flight2 = generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10)
+    flight3 = generate_handcoded_flight("F3", [(100,100,0), (110,100,0)], start, 10)
+    status, conflicts = check_mission(flight1, [flight2, flight3], buffer=2.0, mode="vectorized")
+    assert status == "CONFLICT"
+    assert [c.flight2_id for c in conflicts] == ["F2"]
+    assert conflicts[0].distance == pytest.approx(0.0, abs=1e-9)
+    assert conflicts[0].conflict_time == pytest.approx(5.0)
+
+
+# ------------------- FLEET-WIDE CHECK -------------------
+
+def test_all_pairs_reports_each_pair_once():
+    """Every conflicting pair is reported once, grouped by flight pair."""
+    from cli_api import check_all_pairs
+    start = datetime.now()
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10)
+    flight2 = generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10)
+    flight3 = generate_handcoded_flight("F3", [(5,0,0), (5,10,0)], start, 10)
+    flight4 = generate_handcoded_flight("F4", [(100,100,0), (110,100,0)], start, 10)
+    status, grouped = check_all_pairs([flight1, flight2, flight3, flight4], buffer=2.0)
+    assert status == "CONFLICT"
+    assert sorted(grouped) == [("F1", "F2"), ("F1", "F3"), ("F2", "F3")]
+    assert grouped[("F1", "F2")][0].conflict_time == pytest.approx(5.0)
+
+def test_all_pairs_matches_airspace():
+    """The sweep finds the same conflicts as checking each flight against the rest."""
+    import random
+    from cli_api import check_all_pairs
+    from airspace import Airspace
+    from simulator import generate_random_flight
+    random.seed(5)
+    start = datetime.now()
+    flights = [generate_random_flight(f"F{i}", num_waypoints=5, duration=random.choice([100, 200]),
+                                      start_time=start + timedelta(seconds=random.uniform(0, 200)))
+               for i in range(25)]
+    _, grouped = check_all_pairs(flights, buffer=10.0)
+    for i, flight in enumerate(flights):
+        airspace = Airspace()
+        for other in flights[i + 1:]:
+            airspace.add(other)
+        _, expected = airspace.check(flight, buffer=10.0)
+        actual = [c for (f1, _), cs in grouped.items() if f1 == flight.flight_id for c in cs]
+        actual = sorted((c.flight2_id, c.conflict_time) for c in actual)
+        expected = sorted((c.flight2_id, c.conflict_time) for c in expected)
+        assert [f for f, _ in actual] == [f for f, _ in expected]
+        assert [t for _, t in actual] == pytest.approx([t for _, t in expected])
+
+
+# ------------------- ADAPTIVE SAMPLING -------------------
+
+def test_adaptive_catches_fast_crossing():
+    """A crossing shorter than one time step is missed by sampling but not by adaptive mode."""
+    start = datetime.now()
+    # Head-on at 20 m/s each; they are within 2 m for only 0.1 s around t=5.5
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (200,0,0)], start, 10)
+    flight2 = generate_handcoded_flight("F2", [(220,0,0), (20,0,0)], start, 10)
+    assert check_mission(flight1, [flight2], buffer=2.0, mode="sampled")[0] == "SAFE"
+    status, conflicts = check_mission(flight1, [flight2], buffer=2.0, mode="adaptive")
+    assert status == "CONFLICT"
+    assert 5.45 <= conflicts[0].conflict_time <= 5.55
+    assert conflicts[0].distance < 2.0
+
+def test_adaptive_agrees_with_analytic():
+    """Adaptive mode flags exactly the flights the analytic mode flags."""
+    import random
+    from simulator import generate_random_flight
+    random.seed(9)
+    start = datetime.now()
+    flights = [generate_random_flight(f"F{i}", num_waypoints=6, start_time=start) for i in range(40)]
+    _, analytic = check_mission(flights[0], flights[1:], buffer=8.0, mode="analytic")
+    _, adaptive = check_mission(flights[0], flights[1:], buffer=8.0, mode="adaptive")
+    assert len(analytic) > 0
+    assert {c.flight2_id for c in adaptive} == {c.flight2_id for c in analytic}
+
+def test_adaptive_near_miss_is_quick():
+    """A long parallel track just outside the buffer is cleared without crawling along it."""
+    import time
+    start = datetime.now()
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (36000,0,0)], start, 1800)
+    flight2 = generate_handcoded_flight("F2", [(0,5.0005,0), (36000,5.0005,0)], start, 1800)
+    began = time.perf_counter()
+    assert check_mission(flight1, [flight2], buffer=5.0, mode="adaptive")[0] == "SAFE"
+    assert time.perf_counter() - began < 1.0
+
+
+# ------------------- CONFLICT EPISODES -------------------
+
+@pytest.mark.parametrize("mode", ["sampled", "analytic", "vectorized"])
+def test_episode_entry_and_exit(mode):
+    """A crossing becomes one episode with analytic entry and exit times."""
+    start = datetime.now()
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10)
+    flight2 = generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10)
+    status, episodes = check_mission(flight1, [flight2], buffer=2.0, mode=mode, episodes=True)
+    assert status == "CONFLICT"
+    assert len(episodes) == 1
+    episode = episodes[0]
+    assert (episode.entry_time, episode.exit_time) == pytest.approx((4.0, 6.0))
+    assert episode.min_distance == pytest.approx(0.0, abs=1e-9)
+    assert episode.min_time == pytest.approx(5.0)
+    assert episode.location == pytest.approx((5.0, 5.0, 0.0))
+
+def test_formation_flight_is_one_episode():
+    """Segments flown side by side merge into a single episode."""
+    start = datetime.now()
+    path = [(10 * i, 0, 0) for i in range(61)]
+    flight1 = generate_handcoded_flight("F1", path, start, 600)
+    flight2 = generate_handcoded_flight("F2", [(x, 1, z) for x, _, z in path], start, 600)
+    _, samples = check_mission(flight1, [flight2], buffer=2.0, mode="sampled")
+    _, episodes = check_mission(flight1, [flight2], buffer=2.0, mode="sampled", episodes=True)
+    assert len(samples) == 601
+    assert len(episodes) == 1
+    assert (episodes[0].entry_time, episodes[0].exit_time) == pytest.approx((0.0, 600.0))
+    assert episodes[0].min_distance == pytest.approx(1.0)
+
+def test_stream_and_fast_path_agree_with_full_check():
+    """Streams yield the full check's conflicts and is_safe matches its status in every mode."""
+    import random
+    from itertools import islice
+    from simulator import generate_random_flight
+    from cli_api import stream_conflicts, is_safe
+    from collision_check import first_conflict
+    random.seed(7)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    for buffer in (15.0, 15.0, 1.0, 1.0):
+        flights = [generate_random_flight(f"F{i}", num_waypoints=6, x_range=(0, 300), y_range=(0, 300),
+                                          start_time=start + timedelta(seconds=random.uniform(0, 30)), duration=120)
+                   for i in range(15)]
+        primary, others = flights[0], flights[1:]
+        for mode in ("sampled", "analytic", "vectorized", "adaptive"):
+            _, expected = check_mission(primary, others, buffer, mode=mode)
+            assert list(stream_conflicts(primary, others, buffer, mode=mode)) == expected
+            assert list(islice(stream_conflicts(primary, others, buffer, mode=mode), 1)) == expected[:1]
+        for mode in ("sampled", "analytic", "vectorized", "adaptive"):
+            status, expected = check_mission(primary, others, buffer, mode=mode)
+            assert is_safe(primary, others, buffer, mode=mode) == (status == "SAFE")
+            found = first_conflict(primary, others, buffer, mode=mode)
+            if found is not None:
+                assert any(c.flight2_id == found.flight2_id and c.conflict_time == pytest.approx(found.conflict_time)
+                           for c in expected)
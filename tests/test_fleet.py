@@ -0,0 +1,72 @@
+# tests/test_fleet.py
+import numpy as np
+import pytest
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta
+from data_model import Waypoint
+from simulator import generate_handcoded_flight
+from cli_api import check_mission, check_all_pairs
+from fleet import Fleet
+from simulator import generate_fleet
+
+def _flights():
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [
+        generate_handcoded_flight("P", [(0,0,0), (10,0,0)], start, 10),
+        generate_handcoded_flight("F1", [(5,-5,0), (5,5,0)], start + timedelta(seconds=2), 10),
+        generate_handcoded_flight("F2", [(0,50,0), (5,50,0), (10,50,0)], start, 20),
+    ]
+
+def test_data_model_is_slotted():
+    """Waypoints have no per-instance dict."""
+    assert not hasattr(Waypoint(x=0, y=0), "__dict__")
+
+def test_fleet_views_match_flights():
+    """Views expose the Flight API and give the same conflicts as the flights."""
+    flights = _flights()
+    fleet = Fleet.from_flights(flights)
+    assert len(fleet) == 3 and "F2" in fleet
+    assert fleet.nbytes == 7 * 32 + 3 * 16 + 4 * 8
+
+    view = fleet["F2"]
+    assert view.mission_window == flights[2].mission_window
+    assert [(wp.x, wp.y, wp.time_offset) for wp in view.waypoints] == [(0, 50, 0), (5, 50, 10), (10, 50, 20)]
+    with pytest.raises(FrozenInstanceError):
+        view.waypoints[0].x = 1.0
+
+    views = list(fleet)
+    for mode in ("sampled", "analytic", "vectorized"):
+        assert check_mission(views[0], views[1:], 2.0, mode=mode) == check_mission(flights[0], flights[1:], 2.0, mode=mode)
+
+def test_float32_fleet():
+    """float32 columns halve the memory and still find the conflict."""
+    flights = _flights()
+    fleet64, fleet32 = Fleet.from_flights(flights), Fleet.from_flights(flights, dtype=np.float32)
+    assert fleet32.positions.dtype == np.float32
+    assert fleet32.times.nbytes + fleet32.positions.nbytes == (fleet64.times.nbytes + fleet64.positions.nbytes) // 2
+    status, conflicts = check_mission(fleet32[0], list(fleet32)[1:], 2.0, mode="vectorized")
+    assert status == "CONFLICT" and conflicts[0].flight2_id == "F1"
+
+def test_generated_fleets_are_reproducible():
+    """The same seed gives the same fleet; patterns and layers shape the routes."""
+    start = datetime(2025, 1, 1)
+    a = generate_fleet(200, seed=3, pattern="corridor", start_time=start, start_spread=600)
+    b = generate_fleet(200, seed=3, pattern="corridor", start_time=start, start_spread=600)
+    assert np.array_equal(a.positions, b.positions) and np.array_equal(a.start_epochs, b.start_epochs)
+    assert not np.array_equal(a.positions, generate_fleet(200, seed=4, pattern="corridor", start_time=start).positions)
+
+    hub = generate_fleet(50, num_waypoints=6, seed=1, pattern="hub", altitude_layers=[30, 60], start_time=start)
+    for flight in hub:
+        assert np.array_equal(flight.positions[0, :2], flight.positions[-1, :2])
+        assert len(set(flight.positions[:, 2])) == 1 and flight.positions[0, 2] in (30, 60)
+    assert hub.end_epochs == pytest.approx(hub.start_epochs + 300)
+
+def test_conflict_rate_creates_encounters():
+    """Encounters planted by conflict_rate show up as conflicts."""
+    start = datetime(2025, 1, 1)
+    kwargs = dict(seed=5, x_range=(0, 20000), y_range=(0, 20000), start_time=start, start_spread=3600)
+    _, sparse = check_all_pairs(list(generate_fleet(100, **kwargs)), 5.0)
+    _, dense = check_all_pairs(list(generate_fleet(100, conflict_rate=0.3, **kwargs)), 5.0)
+    assert len(dense) >= len(sparse) + 20
+    with pytest.raises(ValueError):
+        generate_fleet(10, num_waypoints=1, conflict_rate=0.5, **kwargs)
@@ -0,0 +1,43 @@
+# tests/test_instrumentation.py
+import json
+from datetime import datetime
+import instrumentation
+from simulator import generate_handcoded_flight
+from cli_api import check_mission
+
+def _flights():
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [generate_handcoded_flight("F1", [(0,0,0), (10,10,0)], start, 10),
+            generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10),
+            generate_handcoded_flight("F3", [(100,100,0), (110,100,0)], start, 10)]
+
+def test_counters_and_phases():
+    """An instrumented check counts pairs, interpolations and conflicts and times its phases."""
+    flights = _flights()
+    with instrumentation.collect() as metrics:
+        _, conflicts = check_mission(flights[0], flights[1:], buffer=2.0, mode="sampled")
+        check_mission(flights[0], flights[1:], buffer=2.0, mode="vectorized")
+    counters = metrics.counters
+    assert counters["mission_checks"] == 2
+    assert counters["segment_pairs_total"] == 4 and counters["segment_pairs_pruned"] == 2
+    assert counters["segment_pairs_tested"] == 1
+    assert counters["interpolations"] == 2 * 11
+    assert counters["conflicts_emitted"] == len(conflicts) + 1
+    assert {"check_mission", "broad_phase", "interpolation", "distance", "narrow_phase",
+            "conflict_construction"} <= set(metrics.seconds)
+    assert metrics.calls["check_mission"] == 2
+
+    exported = json.loads(metrics.to_json())
+    assert exported["counters"] == counters
+    text = metrics.to_prometheus()
+    assert "uav_deconfliction_mission_checks_total 2" in text
+    assert 'uav_deconfliction_phase_calls_total{phase="check_mission"} 2' in text
+
+def test_disabled_by_default():
+    """Nothing is recorded outside collect()."""
+    flights = _flights()
+    with instrumentation.collect() as metrics:
+        pass
+    check_mission(flights[0], flights[1:], buffer=2.0)
+    assert instrumentation.active() is None
+    assert metrics.as_dict() == {"counters": {}, "phases": {}}
@@ -0,0 +1,84 @@
+# tests/test_kernels.py
+import random
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from simulator import generate_random_flight
+from cli_api import check_mission
+from collision_check import closest_approach_batch
+import kernels
+import parallel
+from trajectory import pack_flights
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+needs_numba = pytest.mark.skipif(numba is None, reason="Numba is not installed")
+
+def _flights():
+    random.seed(9)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [generate_random_flight(f"F{i}", num_waypoints=6, x_range=(0, 300), y_range=(0, 300),
+                                   start_time=start + timedelta(seconds=random.uniform(0, 30)), duration=120)
+            for i in range(20)]
+
+def _same(actual, expected):
+    assert [c.flight2_id for c in actual] == [e.flight2_id for e in expected]
+    values = lambda conflicts: np.array([(c.conflict_time, *c.location, c.distance) for c in conflicts])
+    np.testing.assert_allclose(values(actual), values(expected), rtol=1e-9, atol=1e-9)
+
+@needs_numba
+@pytest.mark.parametrize("mode", ["sampled", "analytic", "vectorized"])
+def test_backends_agree(mode):
+    """The Numba kernels find the same conflicts as NumPy, to rounding."""
+    flights = _flights()
+    status, expected = check_mission(flights[0], flights[1:], 25.0, mode=mode, backend="numpy")
+    assert status == "CONFLICT"
+    _same(check_mission(flights[0], flights[1:], 25.0, mode=mode, backend="numba")[1], expected)
+    assert kernels.get_backend() == "numpy"
+
+def _segments():
+    rng = np.random.default_rng(0)
+    p1, p2, v1, v2 = (rng.normal(0, 100, (500, 3)) for _ in range(4))
+    t1, t2 = rng.uniform(0, 10, 500), rng.uniform(0, 10, 500)
+    start = np.maximum(t1, t2)
+    return p1, v1, t1, p2, v2, t2, start, start + rng.uniform(0, 20, 500)
+
+@needs_numba
+def test_closest_approach_kernel():
+    """The compiled kernel matches closest_approach_batch."""
+    segments = _segments()
+    expected = closest_approach_batch(*segments)
+    with kernels.use("numba"):
+        assert kernels.active_backend() == "numba"
+        for got, want in zip(closest_approach_batch(*segments), expected):
+            np.testing.assert_allclose(got, want, rtol=1e-9, atol=1e-9)
+
+def test_missing_numba_falls_back_to_numpy(monkeypatch):
+    """Selecting Numba without it installed runs the NumPy path."""
+    segments = _segments()
+    expected = closest_approach_batch(*segments)
+    monkeypatch.setattr(kernels, "_compiled", None)
+    monkeypatch.setattr(kernels, "_numba_missing", True)
+    with kernels.use("numba"):
+        assert kernels.active_backend() == "numpy" and kernels.kernel("closest_approach") is None
+        for got, want in zip(closest_approach_batch(*segments), expected):
+            np.testing.assert_array_equal(got, want)
+    with pytest.raises(ValueError):
+        kernels.set_backend("cuda")
+
+def test_worker_shards_apply_the_backend(monkeypatch):
+    """Worker shards select the backend they are given, whatever the process start method."""
+    seen = []
+
+    def check(*args, **kwargs):
+        seen.append(kernels.get_backend())
+        return []
+
+    monkeypatch.setattr(parallel, "check_conflicts_vectorized", check)
+    flights = _flights()
+    parallel._check_shard(flights[0], pack_flights(flights[1:]), 25.0, "vectorized", 1.0, True, False,
+                          backend="numba")
+    assert seen == ["numba"] and kernels.get_backend() == "numpy"
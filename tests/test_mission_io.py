@@ -0,0 +1,61 @@
+# tests/test_mission_io.py
+import json
+import numpy as np
+import pytest
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from simulator import generate_handcoded_flight
+from cli_api import check_mission
+from mission_io import save_flights, load_packed, load_flights, import_csv, import_json
+
+def _fleet():
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    primary = generate_handcoded_flight("P", [(0,0,0), (10,0,0)], start, 10)
+    crossing = generate_handcoded_flight("Ü-1", [(5,-5,0), (5,5,0)], start, 10)
+    parallel = generate_handcoded_flight("F2", [(0,50,0), (5,50,0), (10,50,0)], start, 10)
+    return [primary, crossing, parallel]
+
+def test_binary_roundtrip_memmap(tmp_path):
+    """Saved flights load back as memory-mapped arrays with identical conflicts."""
+    flights = _fleet()
+    flights[2].mission_window.end += timedelta(seconds=5)  # ends after its last waypoint
+    path = str(tmp_path / "fleet.uavf")
+    save_flights(path, flights)
+
+    packed = load_packed(path)
+    assert packed.flight_ids == ["P", "Ü-1", "F2"]
+    assert isinstance(packed.positions, np.memmap)
+    assert list(packed.offsets) == [0, 2, 4, 7]
+
+    loaded = load_flights(path)
+    assert loaded[2].start_epoch == flights[2].mission_window.start.timestamp()
+    assert [f.mission_window for f in loaded] == [f.mission_window for f in flights]
+    for mode in ("sampled", "analytic", "vectorized"):
+        expected = check_mission(flights[0], flights[1:], 2.0, mode=mode)
+        assert check_mission(loaded[0], loaded[1:], 2.0, mode=mode) == expected
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        load_packed(str(path))
+
+def test_csv_and_json_import(tmp_path):
+    """CSV and JSON imports produce the same packed arrays as the flight objects."""
+    flights = _fleet()
+    csv_path = tmp_path / "fleet.csv"
+    rows = ["flight_id,start,time_offset,x,y,z"]
+    for flight in flights:
+        for wp in flight.waypoints:
+            rows.append(f"{flight.flight_id},{flight.mission_window.start.isoformat()},"
+                        f"{wp.time_offset},{wp.x},{wp.y},{wp.z}")
+    csv_path.write_text("\n".join(rows), encoding="utf-8")
+
+    json_path = tmp_path / "fleet.json"
+    json_path.write_text(json.dumps([asdict(f) for f in flights], default=str))
+
+    for packed in (import_csv(str(csv_path)), import_json(str(json_path))):
+        assert packed.flight_ids == ["P", "Ü-1", "F2"]
+        assert list(packed.offsets) == [0, 2, 4, 7]
+        assert packed.positions[5] == pytest.approx((5, 50, 0))
+        assert packed.start_epochs[0] == flights[0].mission_window.start.timestamp()
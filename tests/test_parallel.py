@@ -0,0 +1,36 @@
+# tests/test_parallel.py
+import random
+import pytest
+from datetime import datetime, timedelta
+from simulator import generate_random_flight
+from cli_api import check_mission, check_all_pairs
+
+def _fleet(seed, count, spread=0.0):
+    random.seed(seed)
+    start = datetime(2025, 1, 1, 12)
+    return [generate_random_flight(f"F{i}", num_waypoints=6, duration=200,
+                                   start_time=start + timedelta(seconds=random.uniform(0, spread)))
+            for i in range(count)]
+
+@pytest.mark.parametrize("mode", ["sampled", "analytic", "vectorized"])
+def test_parallel_mission_matches_serial(mode):
+    """Sharded checks return the same conflicts in the same order."""
+    flights = _fleet(1, 40)
+    _, expected = check_mission(flights[0], flights[1:], buffer=10.0, mode=mode)
+    serial_stats, parallel_stats = {}, {}
+    check_mission(flights[0], flights[1:], buffer=10.0, mode=mode, stats=serial_stats)
+    _, actual = check_mission(flights[0], flights[1:], buffer=10.0, mode=mode, workers=3, stats=parallel_stats)
+    assert len(expected) > 0
+    assert actual == expected
+    assert parallel_stats["pairs_candidate"] == serial_stats["pairs_candidate"]
+
+def test_parallel_all_pairs_matches_serial():
+    """Time-slab sharding solves every segment pair exactly once."""
+    flights = _fleet(2, 40, spread=400)
+    _, expected = check_all_pairs(flights, buffer=10.0)
+    _, actual = check_all_pairs(flights, buffer=10.0, workers=3)
+    assert len(expected) > 0
+    assert actual.keys() == expected.keys()
+    for pair in expected:
+        assert [(c.conflict_time, c.distance) for c in actual[pair]] == \
+            pytest.approx([(c.conflict_time, c.distance) for c in expected[pair]])
@@ -0,0 +1,49 @@
+# tests/test_result_cache.py
+import random
+import pytest
+from datetime import datetime, timedelta
+from simulator import generate_random_flight
+from cli_api import check_mission
+from result_cache import PairCache
+
+def _flights():
+    random.seed(5)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [generate_random_flight(f"F{i}", num_waypoints=6, x_range=(0, 300), y_range=(0, 300),
+                                   start_time=start + timedelta(seconds=random.uniform(0, 30)), duration=120)
+            for i in range(15)]
+
+@pytest.mark.parametrize("mode", ["sampled", "analytic", "vectorized"])
+def test_cached_check_matches_and_reuses_pairs(mode):
+    """Cached checks return the uncached conflicts and only solve new or changed pairs."""
+    flights = _flights()
+    primary, others = flights[0], flights[1:]
+    expected = check_mission(primary, others, 15.0, mode=mode)
+    assert expected[1]
+
+    cache = PairCache()
+    assert check_mission(primary, others, 15.0, mode=mode, cache=cache) == expected
+    assert check_mission(primary, others, 15.0, mode=mode, cache=cache) == expected
+    assert cache.stats() == {"hits": 14, "disk_hits": 0, "misses": 14, "evictions": 0, "entries": 14}
+
+    # Editing one flight, or changing the buffer, makes new keys
+    others[3].waypoints[2].x += 50.0
+    assert check_mission(primary, others, 15.0, mode=mode, cache=cache) == check_mission(primary, others, 15.0, mode=mode)
+    assert cache.misses == 15
+    check_mission(primary, others, 20.0, mode=mode, cache=cache)
+    assert cache.misses == 29
+
+def test_lru_eviction_and_disk_tier(tmp_path):
+    """The memory tier is bounded, and the disk tier serves evicted and restarted entries."""
+    flights = _flights()
+    path = str(tmp_path / "pairs.sqlite")
+    cache = PairCache(max_entries=5, path=path)
+    _, expected = check_mission(flights[0], flights[1:], 15.0, mode="analytic", cache=cache)
+    assert len(cache) == 5 and cache.evictions == 9
+    cache.close()
+
+    reopened = PairCache(max_entries=100, path=path)
+    assert check_mission(flights[0], flights[1:], 15.0, mode="analytic", cache=reopened)[1] == expected
+    assert reopened.stats()["disk_hits"] == 14 and reopened.misses == 0
+    with pytest.raises(ValueError):
+        check_mission(flights[0], flights[1:], 15.0, mode="adaptive", cache=reopened)
@@ -0,0 +1,51 @@
+# tests/test_scheduling.py
+import random
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from simulator import generate_random_flight, generate_handcoded_flight
+from cli_api import check_mission
+from scheduling import conflict_shifts, safe_departure_windows, earliest_departure, delay_flight
+from trajectory import compile_flight
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+def test_crossing_flight_interval():
+    """Crossing at right angles at 1 m/s, a 2 m buffer conflicts for delays within 2*sqrt(2) s."""
+    primary = generate_handcoded_flight("P", [(0,0,0), (10,0,0)], START, 10)
+    other = generate_handcoded_flight("A", [(5,-5,0), (5,5,0)], START, 10)
+    (low, high), = conflict_shifts(primary, [other], 2.0, -10, 10)["A"]
+    assert (low, high) == pytest.approx((-2 * np.sqrt(2), 2 * np.sqrt(2)))
+    assert earliest_departure(primary, [other], 2.0) == pytest.approx(2 * np.sqrt(2))
+    assert earliest_departure(primary, [other], 2.0, max_delay=2.0) is None
+
+def test_formation_flight_is_solved():
+    """Same route and speed (a degenerate quadric): the trailing delay must open a buffer-length gap."""
+    primary = generate_handcoded_flight("P", [(0,0,0), (100,0,0)], START, 100)
+    other = generate_handcoded_flight("A", [(0,0,0), (100,0,0)], START, 100)
+    assert earliest_departure(primary, [other], 5.0) == pytest.approx(5.0)
+
+def test_windows_match_repeated_checks():
+    """Delays inside the safe windows are SAFE and all others CONFLICT."""
+    random.seed(3)
+    flights = [generate_random_flight(f"F{i}", num_waypoints=6, x_range=(0, 300), y_range=(0, 300),
+                                      start_time=START + timedelta(seconds=random.uniform(0, 300)), duration=200)
+               for i in range(12)]
+    primary, others = flights[0], flights[1:]
+    windows = safe_departure_windows(primary, others, 10.0, 0, 400)
+    assert len(windows) > 1 and windows[0][0] == earliest_departure(primary, others, 10.0, 0, 400)
+    delays = np.concatenate((np.linspace(0, 400, 101), np.ravel(windows)))
+    for delay in delays:
+        status, _ = check_mission(delay_flight(primary, float(delay)), others, 10.0, mode="vectorized")
+        assert (status == "SAFE") == any(lo <= delay <= hi for lo, hi in windows)
+
+def test_delay_flight_accepts_fleet_views():
+    """Delaying a fleet view moves its mission window like delaying the Flight it came from."""
+    from fleet import Fleet
+    flight = generate_handcoded_flight("P", [(0,0,0), (10,0,0)], START, 10)
+    flight.mission_window.end += timedelta(seconds=5)
+    view, = Fleet.from_flights([flight])
+    delayed_view, delayed = delay_flight(view, 30.0), delay_flight(flight, 30.0)
+    assert delayed_view.mission_window == delayed.mission_window
+    assert delayed_view.mission_window.start == START + timedelta(seconds=30)
+    assert compile_flight(delayed_view).times.tolist() == compile_flight(delayed).times.tolist()
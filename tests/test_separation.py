@@ -0,0 +1,72 @@
+# tests/test_separation.py
+import random
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from simulator import generate_random_flight, generate_handcoded_flight
+from cli_api import check_mission
+from separation import SeparationProfile
+
+def _flights():
+    random.seed(11)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [generate_random_flight(f"F{i}", num_waypoints=6, x_range=(0, 300), y_range=(0, 300),
+                                   start_time=start + timedelta(seconds=random.uniform(0, 30)), duration=120)
+            for i in range(15)]
+
+@pytest.mark.parametrize("max_buffer", [None, 50.0])
+def test_profile_matches_check_mission(max_buffer):
+    """Every buffer query gives the conflicts of a separate vectorized check."""
+    flights = _flights()
+    profile = SeparationProfile(flights[0], flights[1:], max_buffer=max_buffer)
+    buffers = [5.0, 10.0, 25.0, 50.0]
+    for buffer, row in zip(buffers, profile.report(buffers)):
+        status, expected = check_mission(flights[0], flights[1:], buffer, mode="vectorized")
+        assert profile.check(buffer) == (status, expected)
+        assert row["status"] == status and row["conflicts"] == len(expected)
+        assert row["flights"] == len({c.flight2_id for c in expected})
+        assert set(profile.flights_in_conflict(buffer)) == {c.flight2_id for c in expected}
+    assert list(profile.count(buffers)) == [r["conflicts"] for r in profile.report(buffers)]
+    if max_buffer is not None:
+        with pytest.raises(ValueError):
+            profile.conflicts(60.0)
+
+def test_minimum_separation_and_histogram():
+    """Per-flight closest approach and the histogram cover every pair."""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    primary = generate_handcoded_flight("P", [(0,0,0), (10,0,0)], start, 10)
+    others = [generate_handcoded_flight("A", [(0,3,0), (10,3,0)], start, 10),
+              generate_handcoded_flight("B", [(5,-5,0), (5,5,0)], start, 10)]
+    profile = SeparationProfile(primary, others)
+    assert profile.minimum_separation() == pytest.approx({"A": 3.0, "B": 0.0})
+    assert profile.flights_in_conflict(4.0) == ["B", "A"]
+    counts, edges = profile.histogram(bins=[0, 1, 5])
+    assert list(counts) == [1, 1] and np.array_equal(edges, [0, 1, 5])
+
+def _amended(flight, k, dx):
+    """Copy of a flight with waypoint k moved dx meters along x."""
+    from copy import deepcopy
+    amended = deepcopy(flight)
+    amended.waypoints[k].x += dx
+    return amended
+
+@pytest.mark.parametrize("k", [0, 3, 5])
+def test_amendment_matches_full_recheck(k):
+    """Amending a waypoint gives the full check's conflicts and the right delta."""
+    from separation import recheck_amendment
+    flights = _flights()
+    old, others, buffer = flights[0], flights[1:], 25.0
+    _, before = check_mission(old, others, buffer, mode="vectorized")
+    new = _amended(old, k, 40.0)
+    profile, added, resolved = recheck_amendment(old, new, others, buffer)
+    status, after = check_mission(new, others, buffer, mode="vectorized")
+    assert profile.check(buffer) == (status, after)
+
+    key = lambda c: (c.flight2_id, round(c.conflict_time, 6), round(c.distance, 6))
+    assert sorted(map(key, added)) == sorted(set(map(key, after)) - set(map(key, before)))
+    assert sorted(map(key, resolved)) == sorted(set(map(key, before)) - set(map(key, after)))
+
+    # Amending back restores the original conflicts
+    restored, added_back, resolved_back = recheck_amendment(new, old, others, buffer, profile)
+    assert restored.check(buffer)[1] == before
+    assert sorted(map(key, added_back)) == sorted(map(key, resolved))
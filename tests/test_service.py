@@ -0,0 +1,98 @@
+# tests/test_service.py
+import asyncio
+import json
+import pytest
+from dataclasses import asdict
+from datetime import datetime
+from airspace import Airspace
+from simulator import generate_handcoded_flight
+from service import DeconflictionService, serve
+
+def _record(flight_id, points, start, duration):
+    record = asdict(generate_handcoded_flight(flight_id, points, start, duration))
+    record["mission_window"] = {k: v.isoformat() for k, v in record["mission_window"].items()}
+    return record
+
+async def _session(requests):
+    """Send all requests at once over one localhost connection and collect the replies by id."""
+    service = DeconflictionService(batch_window=0.02)
+    server = await serve(service, "127.0.0.1", 0)
+    try:
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = {}
+        for request in requests:
+            if request["op"] == "stats":
+                # Stats go last, once everything before them has been answered
+                while len(replies) < len(requests) - 1:
+                    reply = json.loads(await reader.readline())
+                    replies[reply["id"]] = reply
+            writer.write(json.dumps(request).encode() + b"\n")
+            if request["op"] in ("add", "remove"):
+                reply = json.loads(await reader.readline())
+                replies[reply["id"]] = reply
+        await writer.drain()
+        while len(replies) < len(requests):
+            reply = json.loads(await reader.readline())
+            replies[reply["id"]] = reply
+        writer.close()
+        return replies, service
+    finally:
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+
+def test_service_batches_concurrent_checks():
+    """Concurrent checks over localhost are answered in batches and match Airspace.check."""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    crossing = _record("F2", [(10,0,0), (0,10,0)], start, 10)
+    candidates = [_record(f"C{k}", [(0,k,0), (10,10 + k,0)], start, 10) for k in range(20)]
+
+    requests = [{"op": "add", "flight": crossing, "id": "add"}]
+    requests += [{"op": "check", "flight": c, "buffer": 2.0, "id": c["flight_id"]} for c in candidates]
+    requests += [{"op": "stats", "id": "stats"}]
+    replies, service = asyncio.run(_session(requests))
+
+    airspace = Airspace()
+    airspace.add(generate_handcoded_flight("F2", [(10,0,0), (0,10,0)], start, 10))
+    for k in range(20):
+        status, conflicts = airspace.check(generate_handcoded_flight(f"C{k}", [(0,k,0), (10,10 + k,0)], start, 10), 2.0)
+        reply = replies[f"C{k}"]
+        assert reply["status"] == status
+        assert [c["conflict_time"] for c in reply["conflicts"]] == pytest.approx([c.conflict_time for c in conflicts])
+
+    assert replies["add"] == {"ok": True, "id": "add"}
+    assert replies["stats"]["requests"] == 21 and replies["stats"]["batches"] < 21
+    assert replies["stats"]["p99_ms"] >= replies["stats"]["p50_ms"] > 0
+
+def test_service_reports_errors():
+    """Bad requests get an error reply instead of closing the connection."""
+    replies, _ = asyncio.run(_session([{"op": "remove", "flight_id": "missing", "id": 1},
+                                       {"op": "fly", "id": 2}]))
+    assert "error" in replies[1] and "error" in replies[2]
+
+def test_service_answers_malformed_requests():
+    """Requests that are not objects or carry malformed flights still get one error line each."""
+    async def exchange(lines):
+        service = DeconflictionService(batch_window=0.02)
+        server = await serve(service, "127.0.0.1", 0)
+        try:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = []
+            for line in lines:
+                writer.write(line.encode() + b"\n")
+                replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+            writer.close()
+            return replies
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+
+    record = _record("F1", [(0,0,0), (10,0,0)], datetime(2025, 1, 1, 12, 0, 0), 10)
+    record["waypoints"][0] = 7
+    not_object, bad_waypoint = asyncio.run(exchange(["[1, 2]", json.dumps({"op": "check", "flight": record,
+                                                                          "buffer": 2.0, "id": 3})]))
+    assert "error" in not_object
+    assert "error" in bad_waypoint and bad_waypoint["id"] == 3
@@ -0,0 +1,46 @@
+# tests/test_simplification.py
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from data_model import Flight, Waypoint, MissionWindow
+from trajectory import compile_flight
+from simplification import simplify_flight
+from cli_api import check_mission
+
+def _track(flight_id, seed, offset=(0.0, 0.0), points=2000):
+    # GPS-like log: a smooth curve sampled every second with a little noise
+    rng = np.random.default_rng(seed)
+    t = np.arange(points, dtype=float)
+    x = offset[0] + 300 * np.sin(t / 400 + seed) + t * 0.2 + rng.normal(0, 0.1, points)
+    y = offset[1] + 300 * np.cos(t / 300 + seed) + rng.normal(0, 0.1, points)
+    z = 50 + 10 * np.sin(t / 200) + rng.normal(0, 0.1, points)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return Flight(flight_id=flight_id,
+                  waypoints=[Waypoint(x=a, y=b, z=c, time_offset=s) for a, b, c, s in zip(x, y, z, t)],
+                  mission_window=MissionWindow(start=start, end=start + timedelta(seconds=points - 1)))
+
+def test_deviation_is_bounded_between_waypoints():
+    """The simplified track stays within the tolerance at every time and has far fewer segments."""
+    flight = _track("F0", 0)
+    flight.waypoints[700].time_offset = flight.waypoints[699].time_offset  # zero-duration jump
+    simplified, deviation = simplify_flight(flight, 1.0)
+    assert len(simplified.times) * 10 < len(flight.waypoints)
+    assert 0 < deviation <= 1.0
+    assert simplified.mission_window == flight.mission_window
+
+    t = np.linspace(0, 1999, 50_000)
+    t = t[(t < 698.5) | (t > 699.5)]
+    error = np.linalg.norm(compile_flight(flight).positions_at(t) - simplified.positions_at(t), axis=1)
+    assert error.max() <= deviation + 1e-9
+
+@pytest.mark.parametrize("mode", ["analytic", "vectorized"])
+def test_simplified_check_is_conservative(mode):
+    """Every original conflict is still found, and SAFE holds for the original tracks."""
+    flights = [_track(f"F{i}", i, offset=(40.0 * i, 0.0)) for i in range(6)]
+    for buffer in (5.0, 20.0, 60.0):
+        _, exact = check_mission(flights[0], flights[1:], buffer, mode=mode)
+        status, approx = check_mission(flights[0], flights[1:], buffer, mode=mode, tolerance=2.0)
+        assert {c.flight2_id for c in exact} <= {c.flight2_id for c in approx}
+        assert status == "CONFLICT" or not exact
+    with pytest.raises(ValueError):
+        simplify_flight(flights[0], -1.0)
@@ -0,0 +1,78 @@
+# tests/test_trajectory.py
+import pytest
+from datetime import datetime, timedelta
+from data_model import Waypoint
+from simulator import generate_handcoded_flight
+from trajectory import compile_flight, get_position_at
+
+def test_compiled_position_matches_waypoints():
+    """Positions interpolate between waypoints and are None outside the window."""
+    start = datetime.now()
+    flight = generate_handcoded_flight("F1", [(0,0,0), (10,0,0), (10,10,5)], start, 20)
+    assert get_position_at(flight, start + timedelta(seconds=5)) == pytest.approx((5, 0, 0))
+    assert get_position_at(flight, start + timedelta(seconds=10)) == pytest.approx((10, 0, 0))
+    assert get_position_at(flight, start + timedelta(seconds=15)) == pytest.approx((10, 5, 2.5))
+    assert get_position_at(flight, start + timedelta(seconds=21)) is None
+
+def test_compiled_cache_reused_and_invalidated():
+    """The compiled flight is cached until its waypoints change."""
+    start = datetime.now()
+    flight = generate_handcoded_flight("F1", [(0,0,0), (10,0,0)], start, 10)
+    compiled = compile_flight(flight)
+    assert compile_flight(flight) is compiled
+
+    # Modifying a waypoint rebuilds the compiled form
+    flight.waypoints[1].x = 20
+    assert compile_flight(flight) is not compiled
+    assert get_position_at(flight, start + timedelta(seconds=5)) == pytest.approx((10, 0, 0))
+
+    # So does appending a waypoint
+    flight.waypoints.append(Waypoint(x=20, y=10, z=0, time_offset=20))
+    assert get_position_at(flight, start + timedelta(seconds=15)) == pytest.approx((20, 5, 0))
+
+def test_compiled_cache_follows_list_edits():
+    """In-place list edits invalidate only the edited flight's cache."""
+    start = datetime.now()
+    g1 = generate_handcoded_flight("G1", [(0,0,0), (10,0,0)], start, 10)
+    g2 = generate_handcoded_flight("G2", [(0,0,0), (100,100,0)], start, 10)
+    compiled = compile_flight(g1)
+
+    g2.waypoints[1] = g1.waypoints[1]  # an existing waypoint put into the list
+    assert get_position_at(g2, start + timedelta(seconds=10)) == pytest.approx((10, 0, 0))
+    g2.waypoints.reverse()
+    assert compile_flight(g2).times.tolist() == [10, 0]
+    g2.waypoints.sort(key=lambda wp: wp.time_offset)
+    assert compile_flight(g2).times.tolist() == [0, 10]
+
+    # Creating or editing other flights' waypoints leaves this cache alone
+    g2.waypoints[0].x = 5
+    generate_handcoded_flight("G3", [(0,0,0), (1,1,1)], start, 10)
+    assert compile_flight(g1) is compiled
+
+def test_compiled_cache_hit_skips_waypoints(monkeypatch):
+    """A cache hit with no edits since the last check does not read any waypoint."""
+    import trajectory
+    start = datetime.now()
+    flight = generate_handcoded_flight("F1", [(0,0,0), (10,0,0)], start, 10)
+    compiled = compile_flight(flight)
+
+    def read(waypoint):
+        raise AssertionError("waypoint read on a cache hit")
+    monkeypatch.setattr(trajectory, "_waypoint_values", read)
+    assert compile_flight(flight) is compiled
+    assert get_position_at(flight, start + timedelta(seconds=5)) == pytest.approx((5, 0, 0))
+
+def test_positions_batch_uses_absolute_time():
+    """Batched positions line up flights by wall-clock time and are NaN outside their windows."""
+    import numpy as np
+    from trajectory import get_positions_batch
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    flight1 = generate_handcoded_flight("F1", [(0,0,0), (10,0,0)], start, 10)
+    flight2 = generate_handcoded_flight("F2", [(0,5,0), (10,5,0)], start + timedelta(seconds=5), 10)
+    positions = get_positions_batch([flight1, flight2], [0.0, 5.0, 10.0, 15.0], origin=start.timestamp())
+    assert positions.shape == (2, 4, 3)
+    assert positions[0, 1] == pytest.approx([5, 0, 0])
+    assert np.isnan(positions[0, 3]).all()
+    assert np.isnan(positions[1, 0]).all()
+    assert positions[1, 2] == pytest.approx([5, 5, 0])
+    assert positions[1, 3] == pytest.approx([10, 5, 0])
@@ -0,0 +1,30 @@
+# tests/test_visualize.py
+import numpy as np
+from datetime import datetime
+from matplotlib.figure import Figure
+from simulator import generate_handcoded_flight
+from visualize import _animation_axes, _frame_updater, _sample_fleet, export_frames
+
+def _flights():
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [generate_handcoded_flight("F1", [(0,0,0), (100,100,10)], start, 1000),
+            generate_handcoded_flight("F2", [(100,0,0), (0,100,10)], start, 1000)]
+
+def test_trails_are_decimated():
+    """Trails keep at most max_points decimated vertices plus the current position."""
+    flights = _flights()
+    positions = _sample_fleet(flights)
+    for dimension in ("2d", "3d"):
+        lines = _animation_axes(Figure(), flights, dimension)
+        update = _frame_updater(lines, positions, max_points=50)
+        for frame in (0, 7, 500, positions.shape[1] - 1):
+            update(frame)
+            xs, ys = lines[1].get_data()
+            assert len(xs) <= 51
+            assert (xs[-1], ys[-1]) == tuple(positions[1, frame, :2])
+
+def test_export_frames_headless(tmp_path):
+    """Frames are written to files without a display."""
+    paths = export_frames(_flights(), str(tmp_path), frames=range(0, 1000, 400))
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["frame_000000.png", "frame_000400.png", "frame_000800.png"]
+    assert all((tmp_path / p.rsplit("/", 1)[1]).stat().st_size > 0 for p in paths)
@@ -1,8 +1,177 @@
-from typing import List, Optional, Tuple
+import hashlib
+import operator
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
+import instrumentation
+from broad_phase import segment_boxes
+import data_model
 from data_model import Flight, Waypoint
 
+class CompiledFlight:
+    """
+    Array-backed form of a flight, built once and reused by position queries
+    and conflict checkers.
+
+    times are seconds since start, positions is (N, 3) and velocities is
+    (N-1, 3) with zero velocity for segments of zero duration.
+    """
+    __slots__ = ("flight_id", "start", "start_epoch", "times", "positions", "velocities",
+                 "_key", "_checked", "_segments", "_digest")
+
+    def __init__(self, 
+                 flight_id: str, 
+                 start: datetime, 
+                 times: np.ndarray, 
+                 positions: np.ndarray,
+                 start_epoch: Optional[float] = None):
+        self.flight_id = flight_id
+        self.start = start
+        self.start_epoch = start.timestamp() if start_epoch is None else float(start_epoch)
+        self.times = np.asarray(times, dtype=float)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        self._key = None
+        self._checked = None
+        self._segments = None
+        self._digest = None
+
+        # Per-segment velocities, leaving zero-duration segments at rest
+        duration = np.diff(self.times)
+        delta = np.diff(self.positions, axis=0)
+        self.velocities = np.zeros_like(delta)
+        moving = duration > 0
+        self.velocities[moving] = delta[moving] / duration[moving, None]
+
+    def segments(self) -> Tuple[np.ndarray, ...]:
+        """
+        Segment records shared by all conflict checkers, built on first use.
+        Only segments of positive duration are kept. Times are seconds since
+        start; adding start_epoch puts them on the absolute epoch timeline.
+
+        :return: (index, t0, t1, p0, velocity, lo, hi) where index is the segment
+                 number, times are (M,), p0/velocity are (M, 3) and lo/hi are the
+                 (M, 3) corners of each segment's bounding box
+        """
+        if self._segments is None:
+            index = np.nonzero(self.times[1:] > self.times[:-1])[0]
+            t0, t1 = self.times[index], self.times[index + 1]
+            p0, velocity = self.positions[index], self.velocities[index]
+            self._segments = (index, t0, t1, p0, velocity, *segment_boxes(p0, velocity, t0, t1))
+        return self._segments
+
+    def digest(self) -> bytes:
+        """
+        Content hash of the flight ID, start time and waypoints, built on first use.
+        Two compiled flights with equal digests fly the same mission.
+        """
+        if self._digest is None:
+            h = hashlib.blake2b(self.flight_id.encode(), digest_size=16)
+            h.update(np.float64(self.start_epoch).tobytes())
+            h.update(np.ascontiguousarray(self.times, dtype=np.float64).tobytes())
+            h.update(np.ascontiguousarray(self.positions, dtype=np.float64).tobytes())
+            self._digest = h.digest()
+        return self._digest
+
+    def duration(self) -> float:
+        """Returns the seconds covered by the waypoints."""
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.positions[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.positions[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.positions[:, 2]
+
+    def position_at(self, t: float) -> Optional[Tuple[float, float, float]]:
+        """
+        Interpolated position at t seconds since start.
+
+        :param t: seconds since start
+        :return: (x, y, z) position or None if t is outside the waypoint times
+        """
+        times = self.times
+        instrumentation.count("interpolations")
+        if t < times[0] or t > times[-1]:
+            return None
+        if len(times) == 1:
+            return tuple(float(c) for c in self.positions[0])
+
+        # First segment whose end time is not before t, as the linear scan did
+        i = min(max(int(times.searchsorted(t)) - 1, 0), len(times) - 2)
+        # Interpolate in Python floats, cheaper than small array operations per query
+        x, y, z = self.positions[i].tolist()
+        vx, vy, vz = self.velocities[i].tolist()
+        dt = t - float(times[i])
+        return (x + vx * dt, y + vy * dt, z + vz * dt)
+
+    def positions_at(self, t: np.ndarray) -> np.ndarray:
+        """
+        Interpolated positions at many times since start.
+
+        :param t: (T,) seconds since start
+        :return: (T, 3) positions, NaN where t is outside the waypoint times
+        """
+        t = np.asarray(t, dtype=float)
+        out = np.full((len(t), 3), np.nan)
+        times = self.times
+
+        # Small tolerance so window edges survive epoch round-off
+        inside = (t >= times[0] - EDGE_TOLERANCE) & (t <= times[-1] + EDGE_TOLERANCE)
+        instrumentation.count("interpolations", len(t))
+        for k in range(3):
+            out[inside, k] = np.interp(t[inside], times, self.positions[:, k])
+        return out
+
+# Seconds of slack allowed at mission window edges in batched queries
+EDGE_TOLERANCE = 1e-6
+
+# Reads the fields of a waypoint that the compiled form depends on
+_waypoint_values = operator.attrgetter("x", "y", "z", "time_offset")
+
+# Function to build the array-backed form of a flight from its waypoint values
+def _build_compiled(flight: Flight, values: Tuple[tuple, ...]) -> CompiledFlight:
+    times = [t if t is not None else idx for idx, (_, _, _, t) in enumerate(values)]
+    positions = [(x, y, z if z is not None else 0.0) for x, y, z, _ in values]
+    return CompiledFlight(flight.flight_id, flight.mission_window.start, times, positions)
+
+# Function to get the cached compiled form of a flight
+def compile_flight(flight: Union[Flight, CompiledFlight]) -> CompiledFlight:
+    """
+    Return the compiled form of a flight, building it only when the flight is
+    new or its waypoints or start time changed since the last call.
+
+    :param flight: Flight object (or an already compiled flight)
+    :return: CompiledFlight
+    """
+    
+    if isinstance(flight, CompiledFlight):
+        return flight
+
+    # Nothing has been edited since the cache was last checked: O(1) hit
+    compiled = flight._compiled
+    generation = data_model._edit_generation
+    if compiled is not None and compiled._checked == (generation, id(flight.waypoints)):
+        return compiled
+
+    # Something was edited somewhere; compare this flight's own values so edits
+    # to other flights do not force a rebuild
+    values = tuple(map(_waypoint_values, flight.waypoints))
+    key = (flight.flight_id, flight.mission_window.start, values)
+    if compiled is None or compiled._key != key:
+        instrumentation.count("flights_compiled")
+        compiled = _build_compiled(flight, values)
+        compiled._key = key
+        flight._compiled = compiled
+    compiled._checked = (generation, id(flight.waypoints))
+    return compiled
+
 # Function to interpolate position based on time
 def linear_interp(p1: Waypoint, 
                   p2: Waypoint, 
@@ -33,7 +202,7 @@ def linear_interp(p1: Waypoint,
     return (x, y, z)
 
 # Function to compute position at a specific time
-def get_position_at(flight: Flight, 
+def get_position_at(flight: Union[Flight, CompiledFlight], 
                     query_time: datetime) -> Optional[Tuple[float, float, float]]:
     """
     Get the interpolated position of a flight at a specific time.
@@ -44,25 +213,12 @@ def get_position_at(flight: Flight,
     """
     
     # Convert query_time to seconds since mission start
-    t_seconds = (query_time - flight.mission_window.start).total_seconds()
-    
-    # Ensure we have time offsets for waypoints
-    waypoints = flight.waypoints
-    times = [wp.time_offset if wp.time_offset is not None else idx for idx, wp in enumerate(waypoints)]
-    
-    # If outside mission window, return None
-    if t_seconds < times[0] or t_seconds > times[-1]:
-        return None
+    instrumentation.count("get_position_at_calls")
+    compiled = compile_flight(flight)
+    t_seconds = (query_time - compiled.start).total_seconds()
     
-    # Find which waypoint segment contains query_time
-    for i in range(len(waypoints) - 1):
-        t1, t2 = times[i], times[i + 1]
-        if t1 <= t_seconds <= t2:
-            # Perform linear interpolation between these two waypoints
-            return linear_interp(waypoints[i], waypoints[i + 1], t1, t2, t_seconds)
-    
-    # Return last waypoint to ensure we return a valid waypoint
-    return (waypoints[-1].x, waypoints[-1].y, waypoints[-1].z)
+    # Binary search for the segment and interpolate, None outside the mission window
+    return compiled.position_at(t_seconds)
 
 # Function to get a trajectory as a list of positions
 def get_trajectory(flight: Flight, 
@@ -75,18 +231,111 @@ def get_trajectory(flight: Flight,
     :return: list of (datetime, (x, y, z))
     """
     
-    # Empty list to store positions
+    # Sample every position of the flight in one batched query
+    offsets = sample_offsets(flight.mission_window.duration(), time_step)
+    sampled = compile_flight(flight).positions_at(offsets)
+    
+    # Keep only times at which the flight has a position
     positions = []
-    t = 0.0
-    total_duration = flight.mission_window.duration()
+    for t, pos in zip(offsets, sampled):
+        if not np.isnan(pos[0]):
+            query_time = flight.mission_window.start + timedelta(seconds=float(t))
+            positions.append((query_time, (float(pos[0]), float(pos[1]), float(pos[2]))))
+        
+    return positions
+
+# Function to get the duration a flight is checked over
+def mission_duration(flight: Union[Flight, CompiledFlight]) -> float:
+    """
+    Mission window duration of a Flight. Compiled flights report their own:
+    fleet views their mission window, plain ones the time their waypoints cover.
+    """
+    if isinstance(flight, CompiledFlight):
+        return flight.duration()
+    return flight.mission_window.duration()
+
+# Function to get positions of many flights at many times
+def get_positions_batch(flights: Sequence[Union[Flight, CompiledFlight]], 
+                        timestamps: np.ndarray, 
+                        origin: float = 0.0) -> np.ndarray:
+    """
+    Interpolate the positions of all flights at all timestamps in one call.
+    
+    :param flights: flights to query (Flight or CompiledFlight)
+    :param timestamps: (T,) times in seconds since origin
+    :param origin: epoch seconds that timestamps are measured from (default: Unix epoch)
+    :return: (flights, T, 3) array, NaN outside each flight's mission window
+    """
+    
+    timestamps = np.asarray(timestamps, dtype=float)
+    out = np.empty((len(flights), len(timestamps), 3))
+    for k, flight in enumerate(flights):
+        compiled = compile_flight(flight)
+        # Shift the query times into the flight's own time frame
+        out[k] = compiled.positions_at(timestamps + (origin - compiled.start_epoch))
+    return out
+
+# Function to list sample offsets within a duration
+def sample_offsets(total_duration: float, 
+                   time_step: float = 1.0) -> np.ndarray:
+    """
+    Offsets 0, time_step, 2*time_step, ... up to total_duration (inclusive),
+    accumulated the same way as the step-by-step sampling loops.
     
-    # Iterate until time is not out of bounds
+    :param total_duration: duration in seconds
+    :param time_step: time step in seconds
+    :return: (T,) offsets in seconds
+    """
+    
+    offsets = []
+    t = 0.0
     while t <= total_duration:
-        query_time = flight.mission_window.start + timedelta(seconds=t)
-        # Compute position for a flight at a particular time
-        pos = get_position_at(flight, query_time)
-        if pos:
-            positions.append((query_time, pos))
+        offsets.append(t)
         t += time_step
-        
-    return positions
+    return np.array(offsets, dtype=float)
+
+@dataclass
+class PackedFlights:
+    """
+    Flat array form of several flights, cheap to send to worker processes and
+    to store on disk. Waypoints of flight k are rows offsets[k]:offsets[k+1]
+    of times/positions. end_epochs holds the mission window ends, or is None
+    when they are not known (mission ends at the last waypoint).
+    """
+    flight_ids: List[str]
+    start_epochs: np.ndarray
+    offsets: np.ndarray
+    times: np.ndarray
+    positions: np.ndarray
+    end_epochs: Optional[np.ndarray] = None
+
+# Function to pack flights into flat arrays
+def pack_flights(flights: List[Flight]) -> PackedFlights:
+    """
+    :param flights: list of Flight objects (or compiled flights)
+    :return: PackedFlights
+    """
+    compiled = [compile_flight(f) for f in flights]
+    counts = [len(c.times) for c in compiled]
+    return PackedFlights(
+        flight_ids=[c.flight_id for c in compiled],
+        start_epochs=np.array([c.start_epoch for c in compiled]),
+        offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+        times=np.concatenate([c.times for c in compiled]) if compiled else np.empty(0),
+        positions=np.concatenate([c.positions for c in compiled]) if compiled else np.empty((0, 3)),
+        end_epochs=np.array([c.start_epoch + mission_duration(f) for c, f in zip(compiled, flights)]),
+    )
+
+# Function to rebuild compiled flights from flat arrays
+def unpack_flights(packed: PackedFlights) -> List[CompiledFlight]:
+    """
+    :param packed: PackedFlights
+    :return: list of CompiledFlight objects
+    """
+    flights = []
+    for k, flight_id in enumerate(packed.flight_ids):
+        rows = slice(packed.offsets[k], packed.offsets[k + 1])
+        start_epoch = float(packed.start_epochs[k])
+        flights.append(CompiledFlight(flight_id, datetime.fromtimestamp(start_epoch),
+                                      packed.times[rows], packed.positions[rows], start_epoch))
+    return flights
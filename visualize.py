@@ -1,9 +1,126 @@
+import math
+import os
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from mpl_toolkits.mplot3d import Axes3D
-from typing import List
+from typing import Callable, List, Optional
+import numpy as np
 from data_model import Flight
-from trajectory import get_trajectory
+from trajectory import compile_flight, get_positions_batch, mission_duration, sample_offsets
+
+# Legends are only drawn for fleets up to this size
+MAX_LEGEND_FLIGHTS = 20
+
+# Function to sample all flights on a common time grid
+def _sample_fleet(flights: List[Flight], time_step: float = 1.0) -> np.ndarray:
+    """
+    Sample positions of all flights from the earliest start to the latest end.
+    
+    :param flights: list of Flight objects
+    :param time_step: time step in seconds
+    :return: (flights, T, 3) array, NaN where a flight is not airborne
+    """
+    origin = min(compile_flight(f).start_epoch for f in flights)
+    end = max(compile_flight(f).start_epoch + mission_duration(f) for f in flights)
+    return get_positions_batch(flights, sample_offsets(end - origin, time_step), origin=origin)
+
+# Function to set up the axes and one line per flight for an animation
+def _animation_axes(fig, flights: List[Flight], dimension: str) -> list:
+    if dimension == "2d":
+        ax = fig.add_subplot(111)
+        ax.set_xlim(0, 100)
+        ax.set_ylim(0, 100)
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        ax.set_title("Drone Flight Animation")
+        lines = [ax.plot([], [], marker='o', label=f.flight_id)[0] for f in flights]
+    else:
+        ax = fig.add_subplot(111, projection='3d')
+        ax.set_xlim(0, 100)
+        ax.set_ylim(0, 100)
+        ax.set_zlim(0, 20)
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        ax.set_zlabel("Z")
+        ax.set_title("3D Drone Flight Animation")
+        lines = [ax.plot([], [], [], marker='o', label=f.flight_id)[0] for f in flights]
+    if len(flights) <= MAX_LEGEND_FLIGHTS:
+        ax.legend()
+    return lines
+
+# Function to build the per-frame line update of an animation
+def _frame_updater(lines: list, positions: np.ndarray, max_points: int) -> Callable[[int], list]:
+    """
+    Update function drawing each flight's trail up to a frame.
+
+    Trails are decimated to a fixed stride so no line has more than about
+    max_points vertices; the current position is always drawn. Each frame
+    therefore costs O(flights * max_points) however long the missions are.
+
+    :param lines: one Line2D (or Line3D) per flight
+    :param positions: (flights, T, 3) sampled positions
+    :param max_points: largest number of vertices per trail, e.g. the plot width in pixels
+    :return: function of the frame number returning the updated lines
+    """
+    stride = max(1, math.ceil(positions.shape[1] / max_points))
+    decimated = positions[:, ::stride]
+    three_d = hasattr(lines[0], "set_3d_properties") if lines else False
+    # Trail buffer: decimated points so far plus the current position
+    trail = np.empty((positions.shape[0], decimated.shape[1] + 1, 3))
+
+    def update(frame):
+        kept = frame // stride + 1
+        trail[:, :kept] = decimated[:, :kept]
+        trail[:, kept] = positions[:, frame]
+        # Skip the duplicate when the current position is itself a decimated point
+        end = kept + (frame % stride != 0)
+        for line, points in zip(lines, trail):
+            line.set_data(points[:end, 0], points[:end, 1])
+            if three_d:
+                line.set_3d_properties(points[:end, 2])
+        return lines
+
+    return update
+
+# Function to render animation frames to image files without a display
+def export_frames(flights: List[Flight],
+                  directory: str,
+                  dimension: str = "2d",
+                  time_step: float = 1.0,
+                  frames: Optional[range] = None,
+                  max_points: Optional[int] = None,
+                  dpi: int = 100,
+                  fmt: str = "png") -> List[str]:
+    """
+    Render animation frames headlessly, one image file per frame.
+    Uses the Agg canvas directly, so no display or plt.show() is needed.
+
+    :param flights: list of Flight objects
+    :param directory: output directory (created if missing)
+    :param dimension: "2d" or "3d"
+    :param time_step: seconds between frames
+    :param frames: frame numbers to render (default: every frame)
+    :param max_points: largest number of vertices per trail (default: figure width in pixels)
+    :param dpi: output resolution
+    :param fmt: image format understood by matplotlib, e.g. "png"
+    :return: list of written file paths
+    """
+    positions = _sample_fleet(flights, time_step)
+    fig = Figure(figsize=(8, 6) if dimension == "2d" else (10, 8), dpi=dpi)
+    FigureCanvasAgg(fig)
+    lines = _animation_axes(fig, flights, dimension)
+    update = _frame_updater(lines, positions, max_points or int(fig.get_figwidth() * dpi))
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for frame in frames if frames is not None else range(positions.shape[1]):
+        update(frame)
+        path = os.path.join(directory, f"frame_{frame:06d}.{fmt}")
+        fig.savefig(path, format=fmt, dpi=dpi)
+        paths.append(path)
+    return paths
 
 # Function to plot 2D trajectories
 def plot_2d_trajectories(flights: List[Flight]):
@@ -13,12 +130,10 @@ def plot_2d_trajectories(flights: List[Flight]):
     plt.figure(figsize=(8, 6))
     
     # Iterate through all flights
-    for flight in flights:
-        # Extract trajectory of the flight
-        traj = get_trajectory(flight, time_step=1.0)
-        xs = [pos[0] for _, pos in traj]
-        ys = [pos[1] for _, pos in traj]
-        plt.plot(xs, ys, marker='o', label=flight.flight_id)
+    positions = _sample_fleet(flights, time_step=1.0)
+    for flight, traj in zip(flights, positions):
+        # Plot the sampled trajectory of the flight
+        plt.plot(traj[:, 0], traj[:, 1], marker='o', label=flight.flight_id)
     plt.xlabel("X position")
     plt.ylabel("Y position")
     plt.title("2D Drone Trajectories")
@@ -27,39 +142,23 @@ def plot_2d_trajectories(flights: List[Flight]):
     plt.show()
 
 # Function to animate 2D trajectories
-def animate_2d(flights: List[Flight], time_step: float = 1.0, interval: int = 200):
+def animate_2d(flights: List[Flight], time_step: float = 1.0, interval: int = 200,
+               max_points: Optional[int] = None):
     """
     Animate 2D flight positions over time.
+
+    :param max_points: largest number of vertices per trail (default: figure width in pixels)
     """
     
-    # Compute trajectories for each flight
-    traj_data = {f.flight_id: get_trajectory(f, time_step) for f in flights}
-    max_len = max(len(traj) for traj in traj_data.values())
-    
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.set_xlim(0, 100)
-    ax.set_ylim(0, 100)
-    ax.set_xlabel("X")
-    ax.set_ylabel("Y")
-    ax.set_title("Drone Flight Animation")
+    # Compute trajectories for each flight on a common time grid
+    positions = _sample_fleet(flights, time_step)
     
-    # Initialize Line2D objects for each flight
-    lines = {f.flight_id: ax.plot([], [], marker='o', label=f.flight_id)[0] for f in flights}
-    ax.legend()
-
-    # Frame update function
-    def update(frame):
-        for flight_id, traj in traj_data.items():
-            # Extract x, y positions up to the current frame
-            xs = [pos[0] for _, pos in traj[:frame+1]]
-            ys = [pos[1] for _, pos in traj[:frame+1]]
-            
-            # Update the line's x and y data
-            lines[flight_id].set_data(xs, ys)
-        return lines.values()
+    fig = plt.figure(figsize=(8, 6))
+    lines = _animation_axes(fig, flights, "2d")
+    update = _frame_updater(lines, positions, max_points or int(fig.get_figwidth() * fig.dpi))
 
     # Create the animation
-    ani = FuncAnimation(fig, update, frames=max_len, interval=interval, blit=True)
+    ani = FuncAnimation(fig, update, frames=positions.shape[1], interval=interval, blit=True)
     plt.show()
 
 # Function to plot 3D trajectories
@@ -71,13 +170,10 @@ def plot_3d_trajectories(flights: List[Flight]):
     ax = fig.add_subplot(111, projection='3d')
     
     # Iterate through all flights
-    for flight in flights:
-        # Extract trajectory of the flight
-        traj = get_trajectory(flight, time_step=1.0)
-        xs = [pos[0] for _, pos in traj]
-        ys = [pos[1] for _, pos in traj]
-        zs = [pos[2] for _, pos in traj]
-        ax.plot(xs, ys, zs, marker='o', label=flight.flight_id)
+    positions = _sample_fleet(flights, time_step=1.0)
+    for flight, traj in zip(flights, positions):
+        # Plot the sampled trajectory of the flight
+        ax.plot(traj[:, 0], traj[:, 1], traj[:, 2], marker='o', label=flight.flight_id)
         
     ax.set_xlabel("X")
     ax.set_ylabel("Y")
@@ -89,43 +185,21 @@ def plot_3d_trajectories(flights: List[Flight]):
 # Function to animate 3D trajectories
 def animate_3d(flights: List[Flight], 
                time_step: float = 1.0, 
-               interval: int = 200):
+               interval: int = 200,
+               max_points: Optional[int] = None):
     """
     Animate 3D flight positions over time.
+
+    :param max_points: largest number of vertices per trail (default: figure width in pixels)
     """
     
-    # Compute trajectories for each flight
-    traj_data = {f.flight_id: get_trajectory(f, time_step) for f in flights}
-    max_len = max(len(traj) for traj in traj_data.values())
+    # Compute trajectories for each flight on a common time grid
+    positions = _sample_fleet(flights, time_step)
 
     fig = plt.figure(figsize=(10, 8))
-    ax = fig.add_subplot(111, projection='3d')
-    ax.set_xlim(0, 100)
-    ax.set_ylim(0, 100)
-    ax.set_zlim(0, 20)
-    ax.set_xlabel("X")
-    ax.set_ylabel("Y")
-    ax.set_zlabel("Z")
-    ax.set_title("3D Drone Flight Animation")
-
-    # Initialize Line3D objects for each flight
-    lines = {f.flight_id: ax.plot([], [], [], marker='o', label=f.flight_id)[0] for f in flights}
-    ax.legend()
-
-    # Frame update function
-    def update(frame):
-        for flight_id, traj in traj_data.items():
-            # Extract x, y, z positions up to the current frame
-            xs = [pos[0] for _, pos in traj[:frame+1]]
-            ys = [pos[1] for _, pos in traj[:frame+1]]
-            zs = [pos[2] for _, pos in traj[:frame+1]]
-            
-            # Update the line's x, y and z data
-            lines[flight_id].set_data(xs, ys)
-            lines[flight_id].set_3d_properties(zs)
-            
-        return lines.values()
+    lines = _animation_axes(fig, flights, "3d")
+    update = _frame_updater(lines, positions, max_points or int(fig.get_figwidth() * fig.dpi))
 
     # Create the animation
-    ani = FuncAnimation(fig, update, frames=max_len, interval=interval, blit=True)
+    ani = FuncAnimation(fig, update, frames=positions.shape[1], interval=interval, blit=True)
     plt.show()